@@ -15,7 +15,7 @@ from typing import List, Dict
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from departments.intelligence.horror_scraper import scrape_viral_horror_titles
-from departments.intelligence.horror_story_engine import generate_horror_story
+from departments.intelligence.horror_story_engine import generate_horror_story, generate_horror_stories_batch
 
 
 def autonomous_weekly_batch(num_videos: int = 7, publish_times: List[str] = None):
@@ -52,14 +52,22 @@ def autonomous_weekly_batch(num_videos: int = 7, publish_times: List[str] = None
     # Step 2: Generate horror stories (using existing engine)
     print("\n[STEP 2/4] 📖 Generating horror stories...")
     generated_stories = []
+    story_count = min(num_videos, len(viral_titles))
     
-    for i in range(1, min(num_videos, len(viral_titles)) + 1):
+    # All stories in as few LLM calls as possible; slots the batch could not fill fall back below
+    try:
+        batch_stories = generate_horror_stories_batch([{} for _ in range(story_count)])
+    except Exception as e:
+        print(f"   ⚠️ Batch story generation failed: {e}, generating one by one...")
+        batch_stories = [None] * story_count
+    
+    for i in range(1, story_count + 1):
         viral_item = viral_titles[i-1]
         print(f"\n   Story {i}/{num_videos}: Inspired by '{viral_item['title'][:50]}...'")
         
         try:
-            # Generate story using existing engine (no viral_inspiration param)
-            story_data = generate_horror_story()
+            # Batch story, else the single-story engine (no viral_inspiration param)
+            story_data = batch_stories[i-1] or generate_horror_story()
             
             # Add metadata
             story_data['viral_source'] = viral_item
@@ -85,6 +93,10 @@ def autonomous_weekly_batch(num_videos: int = 7, publish_times: List[str] = None
     
     # Import after path setup
     import main
+    from departments.intelligence.story_pool_engine import ensure_story_pool, wait_for_story_pool_refill
+    
+    # Stories are generated: stock the pool for the factory while the videos render
+    ensure_story_pool()
     
     rendered_videos = []
     
@@ -123,6 +135,9 @@ def autonomous_weekly_batch(num_videos: int = 7, publish_times: List[str] = None
             traceback.print_exc()
             continue
     
+    # Keep what the pool refill is still fetching for the next batch
+    wait_for_story_pool_refill()
+    
     if not rendered_videos:
         print("❌ ERROR: No videos rendered. Aborting.")
         return None
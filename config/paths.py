@@ -13,6 +13,7 @@ LOGISTICS_DIR = os.path.join(DEPARTMENTS_DIR, "logistics")
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 MUSIC_DIR = os.path.join(ASSETS_DIR, "music")
 SFX_DIR = os.path.join(ASSETS_DIR, "sfx")
+BROLL_DIR = os.path.join(ASSETS_DIR, "broll")  # Pre-normalized 1080x1920 clips for offline scene footage
 FONTS_DIR = os.path.join(BASE_DIR, "fonts")
 
 # Output
@@ -25,9 +26,17 @@ TEMP_THUMBNAILS_DIR = os.path.join(TEMP_DIR, "thumbnails")
 TEMP_LOGS_DIR = os.path.join(TEMP_DIR, "logs")
 TEMP_IMAGES_DIR = os.path.join(TEMP_DIR, "images")
 
+# Persistent caches (survive temp cleanup between production cycles)
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "images")
+FLUX_CACHE_DIR = os.path.join(CACHE_DIR, "flux")
+HOOK_CACHE_DIR = os.path.join(CACHE_DIR, "hooks")
+LLM_CACHE_DIR = os.path.join(CACHE_DIR, "llm")
+
 # Ensure all directories exist
 for directory in [
-    MUSIC_DIR, SFX_DIR, FONTS_DIR, SHORTS_OUTPUT_DIR,
-    TEMP_DIR, TEMP_THUMBNAILS_DIR, TEMP_LOGS_DIR, TEMP_IMAGES_DIR
+    MUSIC_DIR, SFX_DIR, BROLL_DIR, FONTS_DIR, SHORTS_OUTPUT_DIR,
+    TEMP_DIR, TEMP_THUMBNAILS_DIR, TEMP_LOGS_DIR, TEMP_IMAGES_DIR,
+    CACHE_DIR, IMAGE_CACHE_DIR, FLUX_CACHE_DIR, HOOK_CACHE_DIR, LLM_CACHE_DIR
 ]:
     os.makedirs(directory, exist_ok=True)
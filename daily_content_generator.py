@@ -7,7 +7,6 @@ import os
 import sys
 import json
 import re
-import requests
 from datetime import datetime, timedelta
 import pytz
 from bs4 import BeautifulSoup
@@ -16,7 +15,7 @@ import random
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from departments.intelligence.horror_story_engine import generate_horror_story
+from departments.intelligence.horror_story_engine import generate_horror_story, generate_horror_stories_batch
 from departments.intelligence.time_based_horror import get_4x_daily_schedule, get_time_based_horror_type
 from departments.intelligence.title_optimizer import optimize_title
 from departments.production.audio_engine import generate_audio
@@ -26,7 +25,9 @@ from departments.production.thumbnail_engine import generate_thumbnail
 from departments.production.simple_render_engine import render_horror_video
 from departments.logistics.upload_engine import upload_video
 from departments.logistics.history_engine import log_video, has_topic_been_used, get_recent_topics
-from moviepy import AudioFileClip
+from departments.logistics.image_hash_engine import hash_images
+from departments.production.probe_engine import get_media_duration
+from departments.logistics.http_engine import http_get
 import tempfile
 
 EST = pytz.timezone('US/Eastern')
@@ -51,7 +52,7 @@ def scrape_trending_horror_content() -> List[Dict]:
         try:
             url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit=10"
             headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_get(url, headers=headers, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 for post in data.get('data', {}).get('children', [])[:5]:
@@ -127,8 +128,8 @@ def get_daily_publishing_schedule(start_date: datetime, num_days: int = 7) -> Li
     return get_4x_daily_schedule(start_date, num_days)
 
 
-def generate_video_with_duplicate_check(video_number: int, publish_time: datetime, horror_type: Dict = None) -> Optional[Dict]:
-    """Generate a video, ensuring no duplicates, with time-based horror type."""
+def generate_video_with_duplicate_check(video_number: int, publish_time: datetime, horror_type: Dict = None, story_data: Optional[Dict] = None) -> Optional[Dict]:
+    """Generate a video, ensuring no duplicates, with time-based horror type (story_data: pre-generated story for the first attempt)."""
     max_retries = 10
     
     # Get time-based horror guidance
@@ -141,7 +142,8 @@ def generate_video_with_duplicate_check(video_number: int, publish_time: datetim
             print(f"\n[📖 HORROR STORY] Generating {time_window} horror story (attempt {attempt + 1}/{max_retries})...")
             if horror_guidance:
                 print(f"   🎯 Time-based type: {horror_type.get('horror_type', 'N/A')} ({horror_type.get('intensity', 'moderate')} intensity)")
-            story_data = generate_horror_story(max_retries=5, use_scraper=True, time_window=time_window, horror_type_guidance=horror_guidance)
+            if not (attempt == 0 and story_data):
+                story_data = generate_horror_story(max_retries=5, use_scraper=True, time_window=time_window, horror_type_guidance=horror_guidance)
             title = story_data.get('title', 'Horror Story')
             story_text = story_data.get('story') or story_data.get('script', '')
             
@@ -169,9 +171,7 @@ def generate_video_with_duplicate_check(video_number: int, publish_time: datetim
             audio_output = os.path.join(TEMP_DIR, f"temp_audio_{video_number}.mp3")
             audio_path, subtitles = generate_audio(story_text, audio_output, script_text=story_text)
             
-            audio_clip = AudioFileClip(audio_path)
-            audio_duration = audio_clip.duration
-            audio_clip.close()
+            audio_duration = get_media_duration(audio_path)
             
             print(f"✓ Audio generated: {audio_duration:.2f}s")
             
@@ -198,6 +198,7 @@ def generate_video_with_duplicate_check(video_number: int, publish_time: datetim
                     image_paths = [fallback_image]
             
             print(f"✓ Downloaded {len(image_paths)} images")
+            image_hashes = hash_images(image_paths)
             
             # Thumbnail
             thumbnail_path = os.path.join(TEMP_THUMBNAILS_DIR, f"thumbnail_{video_number}.png")
@@ -246,7 +247,8 @@ def generate_video_with_duplicate_check(video_number: int, publish_time: datetim
                 'description': description,
                 'tags': story_data.get('tags', []),
                 'thumbnail_path': thumbnail_path,
-                'story_text': story_text[:200]
+                'story_text': story_text[:200],
+                'image_hashes': image_hashes
             }
             
         except Exception as e:
@@ -298,6 +300,20 @@ def generate_daily_content(num_days: int = 7, start_date: Optional[datetime] = N
     # Scrape trending content for inspiration
     trending_stories = scrape_trending_horror_content()
     
+    # Generate every slot's story in batched LLM calls (time window and guidance per slot)
+    story_slots = []
+    for schedule_item in schedule:
+        slot_horror_type = schedule_item[2] if len(schedule_item) == 3 else get_time_based_horror_type(schedule_item[0])
+        story_slots.append({
+            "time_window": slot_horror_type.get('time_window', 'evening'),
+            "horror_type_guidance": slot_horror_type.get('prompt_guidance', ''),
+        })
+    try:
+        batch_stories = generate_horror_stories_batch(story_slots)
+    except Exception as e:
+        print(f"⚠️ Batch story generation failed: {e}, generating one by one...")
+        batch_stories = [None] * len(schedule)
+    
     successful = 0
     failed = 0
     scheduled_videos = []
@@ -316,7 +332,7 @@ def generate_daily_content(num_days: int = 7, start_date: Optional[datetime] = N
         print(f"Scheduled for: {publish_time.strftime('%A, %B %d at %I:%M %p %Z')}")
         print(f"Time Window: {horror_type['time_window']} | Type: {horror_type['horror_type']} | Intensity: {horror_type['intensity']}")
         
-        video_data = generate_video_with_duplicate_check(i, publish_time, horror_type)
+        video_data = generate_video_with_duplicate_check(i, publish_time, horror_type, batch_stories[i - 1])
         
         if not video_data:
             print(f"❌ Video {i} generation failed")
@@ -350,7 +366,8 @@ def generate_daily_content(num_days: int = 7, start_date: Optional[datetime] = N
                     topic=video_data['story_text'],
                     title=video_data['title'],
                     video_id=video_id,
-                    filename=video_data['video_path']
+                    filename=video_data['video_path'],
+                    image_hashes=video_data.get('image_hashes')
                 )
                 scheduled_videos.append({
                     'video_id': video_id,
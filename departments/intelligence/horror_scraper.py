@@ -9,9 +9,16 @@ import os
 import re
 from typing import List, Dict
 from dotenv import load_dotenv
+from departments.intelligence.lexicon_engine import compile_lexicon, hits_by_category
 
 load_dotenv()
 
+# Hook-type keywords (checked in priority order after the date/tag patterns)
+HOOK_KEYWORDS = compile_lexicon({
+    "UNSOLVED": ['unsolved', 'mystery', 'never found', 'disappeared', 'missing'],
+    "SHOCKING": ['shocking', 'terrifying', 'disturbing', 'horrifying'],
+})
+
 try:
     from youtubesearchpython import VideosSearch
     YOUTUBE_SEARCH_AVAILABLE = True
@@ -145,12 +152,11 @@ def _identify_hook_type(title: str) -> str:
     if re.search(r'\(real\)|\(true\)|\(shocking\)', title_lower):
         return "REAL_TAG"
     
-    # Check for unsolved mystery
-    if any(word in title_lower for word in ['unsolved', 'mystery', 'never found', 'disappeared', 'missing']):
+    # Check for unsolved mystery, then shocking/disturbing (one scan)
+    hook_hits = hits_by_category(title, HOOK_KEYWORDS)
+    if "UNSOLVED" in hook_hits:
         return "UNSOLVED"
-    
-    # Check for shocking/disturbing
-    if any(word in title_lower for word in ['shocking', 'terrifying', 'disturbing', 'horrifying']):
+    if "SHOCKING" in hook_hits:
         return "SHOCKING"
     
     # Check for location
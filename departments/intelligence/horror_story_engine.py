@@ -7,8 +7,10 @@ Simplified workflow: Story → TTS Narration → Background Music → Subtitles
 
 import os
 import json
+import time
 import random
-from typing import Dict, Optional, List
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Optional, List, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -21,6 +23,17 @@ GEMINI_API_KEY_1 = os.getenv("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY_1")
 GEMINI_API_KEY_2 = os.getenv("GEMINI_API_KEY_2")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# Provider racing: up to STORY_RACE_WIDTH providers in flight; another joins every
+# STORY_HEDGE_DELAY seconds (0 = launch them all at once) or as soon as one fails.
+# STORY_RACE_WIDTH=1 is the plain sequential cascade.
+STORY_RACE_WIDTH = int(os.getenv("STORY_RACE_WIDTH", "2"))
+STORY_HEDGE_DELAY = float(os.getenv("STORY_HEDGE_DELAY", "4"))
+
+# Batch generation: stories requested per LLM call, and the story length accepted locally
+STORY_BATCH_SIZE = int(os.getenv("STORY_BATCH_SIZE", "7"))
+STORY_BATCH_MIN_WORDS = 25
+STORY_BATCH_MAX_WORDS = 80
+
 
 def get_seasonal_context() -> Dict[str, str]:
     """
@@ -167,7 +180,40 @@ def get_seasonal_context() -> Dict[str, str]:
     return seasonal_data
 
 
-def generate_horror_story_cerebras(time_window: str = None, horror_type_guidance: str = None, used_topics: str = None, trend_guidance: str = None, niche: Dict = None) -> Optional[Dict]:
+def parse_story_json(raw_text: str) -> Dict:
+    """
+    Parse a story JSON object out of a raw LLM response.
+    
+    Args:
+        raw_text: Raw response text (may contain markdown fences or chatter)
+        
+    Returns:
+        Story dict with 'script' set (mapped from 'story' if needed)
+        
+    Raises:
+        Exception: If no JSON object can be parsed
+    """
+    import re
+    
+    # Remove markdown
+    raw_text = re.sub(r'```json\s*', '', raw_text)
+    raw_text = re.sub(r'```\s*', '', raw_text)
+    raw_text = re.sub(r'```', '', raw_text)
+    
+    # Find JSON object
+    first_brace = raw_text.find('{')
+    last_brace = raw_text.rfind('}')
+    if first_brace == -1 or last_brace == -1:
+        raise Exception("No JSON object found in response")
+    story_data = json.loads(raw_text[first_brace:last_brace + 1])
+    
+    # Ensure 'script' field exists (map 'story' to 'script' if needed)
+    if 'story' in story_data and 'script' not in story_data:
+        story_data['script'] = story_data['story']
+    return story_data
+
+
+def generate_horror_story_cerebras(time_window: str = None, horror_type_guidance: str = None, used_topics: str = None, trend_guidance: str = None, niche: Dict = None, seed: int = None) -> Optional[Dict]:
     """
     Generate a real horror story using Cerebras API.
     
@@ -176,12 +222,13 @@ def generate_horror_story_cerebras(time_window: str = None, horror_type_guidance
         horror_type_guidance: Specific guidance for horror type
         used_topics: String list of recently used topics to avoid repetition
         trend_guidance: Social media trend guidance (e.g. 'The Mimic Trend', 'Reality Glitches')
+        seed: Sample index (retry attempt), so retries never reuse a cached response
     """
     if not CEREBRAS_API_KEY:
         return None
     
     try:
-        import requests
+        from departments.logistics.llm_engine import llm_complete
         
         # Get seasonal context
         seasonal = get_seasonal_context()
@@ -259,67 +306,22 @@ Return ONLY valid JSON in this format:
 
 Remember: Return ONLY the JSON object. No explanations."""
         
-        api_url = "https://api.cerebras.ai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {CEREBRAS_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "llama-3.3-70b",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a horror story writer specializing in real, documented horror stories. Always return ONLY valid JSON. Never add conversational text."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.9,
-            "max_tokens": 1000
-        }
-        
         print("   🧠 Generating horror story with Cerebras...")
-        response = requests.post(api_url, json=payload, headers=headers, timeout=60)
-        
-        if response.status_code != 200:
-            raise Exception(f"Cerebras API returned status {response.status_code}: {response.text}")
-        
-        result = response.json()
-        raw_text = result['choices'][0]['message']['content'].strip()
-        
-        # Clean and parse JSON
-        import json
-        import re
-        
-        # Remove markdown
-        raw_text = re.sub(r'```json\s*', '', raw_text)
-        raw_text = re.sub(r'```\s*', '', raw_text)
-        raw_text = re.sub(r'```', '', raw_text)
-        
-        # Find JSON object
-        first_brace = raw_text.find('{')
-        last_brace = raw_text.rfind('}')
-        if first_brace != -1 and last_brace != -1:
-            json_str = raw_text[first_brace:last_brace + 1]
-            story_data = json.loads(json_str)
-            
-            # Ensure 'script' field exists (map 'story' to 'script' if needed)
-            if 'story' in story_data and 'script' not in story_data:
-                story_data['script'] = story_data['story']
-            
-            return story_data
-        else:
-            raise Exception("No JSON object found in response")
+        return llm_complete(
+            "cerebras", "llama-3.3-70b", prompt, CEREBRAS_API_KEY,
+            system="You are a horror story writer specializing in real, documented horror stories. Always return ONLY valid JSON. Never add conversational text.",
+            temperature=0.9,
+            max_tokens=1000,
+            seed=seed,
+            parse=parse_story_json
+        )
         
     except Exception as e:
         print(f"⚠️ Cerebras failed: {e}")
         return None
 
 
-def generate_horror_story_gemini(api_key: str = None, time_window: str = None, horror_type_guidance: str = None, used_topics: str = None, trend_guidance: str = None, niche: Dict = None) -> Optional[Dict]:
+def generate_horror_story_gemini(api_key: str = None, time_window: str = None, horror_type_guidance: str = None, used_topics: str = None, trend_guidance: str = None, niche: Dict = None, seed: int = None) -> Optional[Dict]:
     """
     Generate a horror story using Gemini API.
     
@@ -330,6 +332,7 @@ def generate_horror_story_gemini(api_key: str = None, time_window: str = None, h
         used_topics: String list of recently used topics to avoid repetition
         trend_guidance: Social media trend guidance
         niche: The specific business/news niche to target
+        seed: Sample index (retry attempt), so retries never reuse a cached response
     """
     """Generate horror story using Gemini."""
     if not api_key:
@@ -338,13 +341,7 @@ def generate_horror_story_gemini(api_key: str = None, time_window: str = None, h
         return None
     
     try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        
-        try:
-            model = genai.GenerativeModel('gemini-1.5-flash-latest')
-        except:
-            model = genai.GenerativeModel('gemini-pro')
+        from departments.logistics.llm_engine import llm_complete
         
         # Get seasonal context
         seasonal = get_seasonal_context()
@@ -428,39 +425,19 @@ Return ONLY valid JSON in this format:
 
 Remember: Return ONLY the JSON object. No explanations."""
         
-        response = model.generate_content(prompt)
-        raw_text = response.text.strip()
-        
-        # Clean and parse JSON
-        import json
-        import re
-        
-        # Remove markdown
-        raw_text = re.sub(r'```json\s*', '', raw_text)
-        raw_text = re.sub(r'```\s*', '', raw_text)
-        raw_text = re.sub(r'```', '', raw_text)
-        
-        # Find JSON object
-        first_brace = raw_text.find('{')
-        last_brace = raw_text.rfind('}')
-        if first_brace != -1 and last_brace != -1:
-            json_str = raw_text[first_brace:last_brace + 1]
-            story_data = json.loads(json_str)
-            
-            # Ensure 'script' field exists (map 'story' to 'script' if needed)
-            if 'story' in story_data and 'script' not in story_data:
-                story_data['script'] = story_data['story']
-            
-            return story_data
-        else:
-            raise Exception("No JSON object found in response")
+        return llm_complete(
+            "gemini", "gemini-1.5-flash-latest", prompt, api_key,
+            temperature=0.9,
+            seed=seed,
+            parse=parse_story_json
+        )
         
     except Exception as e:
         print(f"⚠️ Gemini failed: {e}")
         return None
 
 
-def generate_horror_story_groq(time_window: str = None, horror_type_guidance: str = None, used_topics: str = None, trend_guidance: str = None, niche: Dict = None) -> Optional[Dict]:
+def generate_horror_story_groq(time_window: str = None, horror_type_guidance: str = None, used_topics: str = None, trend_guidance: str = None, niche: Dict = None, seed: int = None) -> Optional[Dict]:
     """
     Generate a real horror story using Groq API.
     
@@ -470,14 +447,14 @@ def generate_horror_story_groq(time_window: str = None, horror_type_guidance: st
         used_topics: String list of recently used topics to avoid repetition
         trend_guidance: Social media trend guidance
         niche: The specific business/news niche to target
+        seed: Sample index (retry attempt), so retries never reuse a cached response
     """
     """Generate horror story using Groq."""
     if not GROQ_API_KEY:
         return None
     
     try:
-        from groq import Groq
-        client = Groq(api_key=GROQ_API_KEY)
+        from departments.logistics.llm_engine import llm_complete
         
         # Get seasonal context
         seasonal = get_seasonal_context()
@@ -561,42 +538,15 @@ Return ONLY valid JSON in this format:
 
 Remember: Return ONLY the JSON object. No explanations."""
         
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "system", "content": "You are a horror story writer. Always return ONLY valid JSON. Never add conversational text."},
-                {"role": "user", "content": prompt}
-            ],
+        return llm_complete(
+            "groq", "llama-3.1-8b-instant", prompt, GROQ_API_KEY,
+            system="You are a horror story writer. Always return ONLY valid JSON. Never add conversational text.",
             temperature=0.9,
-            max_tokens=500
+            max_tokens=500,
+            seed=seed,
+            parse=parse_story_json
         )
         
-        raw_text = response.choices[0].message.content.strip()
-        
-        # Clean and parse JSON
-        import json
-        import re
-        
-        # Remove markdown
-        raw_text = re.sub(r'```json\s*', '', raw_text)
-        raw_text = re.sub(r'```\s*', '', raw_text)
-        raw_text = re.sub(r'```', '', raw_text)
-        
-        # Find JSON object
-        first_brace = raw_text.find('{')
-        last_brace = raw_text.rfind('}')
-        if first_brace != -1 and last_brace != -1:
-            json_str = raw_text[first_brace:last_brace + 1]
-            story_data = json.loads(json_str)
-            
-            # Ensure 'script' field exists (map 'story' to 'script' if needed)
-            if 'story' in story_data and 'script' not in story_data:
-                story_data['script'] = story_data['story']
-            
-            return story_data
-        else:
-            raise Exception("No JSON object found in response")
-        
     except Exception as e:
         print(f"⚠️ Groq failed: {e}")
         return None
@@ -635,6 +585,375 @@ def has_story_been_used(story_title: str, story_text: str) -> bool:
     return False
 
 
+def _story_providers() -> List[Tuple[str, str, Callable]]:
+    """
+    Story providers in default priority order, with their health registry names.
+    
+    Returns:
+        List of (provider name, label, generator(seed=..., **kwargs)) for configured keys
+    """
+    providers = []
+    if CEREBRAS_API_KEY:
+        providers.append(("llm:Cerebras", "Cerebras", generate_horror_story_cerebras))
+    if GEMINI_API_KEY_1:
+        providers.append(("llm:Gemini", "Gemini",
+                          lambda **kw: generate_horror_story_gemini(GEMINI_API_KEY_1, **kw)))
+    if GEMINI_API_KEY_2:
+        providers.append(("llm:Gemini Key 2", "Gemini Key 2",
+                          lambda **kw: generate_horror_story_gemini(GEMINI_API_KEY_2, **kw)))
+    if GROQ_API_KEY:
+        providers.append(("llm:Groq", "Groq", generate_horror_story_groq))
+    return providers
+
+
+def _race_story_providers(generation_kwargs: Dict, attempt: int, max_retries: int, force: bool) -> Optional[Dict]:
+    """
+    One generation round: hedged race across providers, ranked by observed health.
+    
+    Providers are launched in rank order, up to STORY_RACE_WIDTH at a time, the next one
+    after STORY_HEDGE_DELAY seconds or as soon as a running one fails. The first story that
+    parses and is not a duplicate wins; providers not yet started are cancelled and late
+    results are ignored (but still recorded in provider health).
+    
+    Args:
+        generation_kwargs: Keyword arguments for the generate_horror_story_* functions
+        attempt: Retry round (0-based), used as the sample seed
+        max_retries: Total rounds (for logging)
+        force: If True, skip the duplicate check
+        
+    Returns:
+        Story dict, or None if no provider produced a fresh story this round
+    """
+    from departments.logistics.provider_health_engine import (
+        provider_allowed, rank_providers, record_provider_result
+    )
+    
+    providers = {name: (label, func) for name, label, func in _story_providers()}
+    pending = rank_providers(list(providers))
+    running = {}
+    skipped = []
+    last_launch = 0.0
+    width = max(1, STORY_RACE_WIDTH)
+    
+    def _timed_call(name: str, func: Callable) -> Optional[Dict]:
+        started = time.monotonic()
+        story_data = func(seed=attempt, **generation_kwargs)
+        record_provider_result(name, story_data is not None, time.monotonic() - started,
+                               None if story_data is not None else "no story returned")
+        return story_data
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, len(providers)))
+    try:
+        while pending or running:
+            # Launch: nothing running, or hedge delay elapsed with a free slot
+            while pending and len(running) < width and (
+                    not running or time.monotonic() - last_launch >= STORY_HEDGE_DELAY):
+                name = pending.pop(0)
+                allowed, reason = provider_allowed(name)
+                if not allowed:
+                    skipped.append(f"{providers[name][0]} ({reason})")
+                    continue
+                running[executor.submit(_timed_call, name, providers[name][1])] = name
+                last_launch = time.monotonic()
+            if not running:
+                break
+            
+            timeout = None
+            if pending and len(running) < width:
+                timeout = max(0.0, STORY_HEDGE_DELAY - (time.monotonic() - last_launch))
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                label = providers[running.pop(future)][0]
+                last_launch = 0.0  # A finished loser hands its slot on without waiting for the hedge
+                try:
+                    story_data = future.result()
+                except Exception as e:
+                    print(f"⚠️ {label} failed: {e}")
+                    continue
+                if not story_data:
+                    continue
+                
+                title = story_data.get('title', '')
+                story_text = story_data.get('story') or story_data.get('script', '')
+                if force or not has_story_been_used(title, story_text):
+                    print(f"✓ Horror story generated with {label}{' (Forced)' if force else ''}")
+                    return story_data
+                print(f"   ⚠️ Duplicate story from {label} (attempt {attempt + 1}/{max_retries}), retrying...")
+    finally:
+        if skipped:
+            print(f"   ⏭️ Skipped: {', '.join(skipped)}")
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return None
+
+
+def parse_story_batch_json(raw_text: str) -> List[Dict]:
+    """
+    Parse a batch response ({"stories": [...]}) out of a raw LLM response.
+    
+    Args:
+        raw_text: Raw response text
+        
+    Returns:
+        List of story dicts with 'script' set (mapped from 'story' if needed)
+        
+    Raises:
+        Exception: If the response has no 'stories' list
+    """
+    stories = parse_story_json(raw_text).get('stories')
+    if not isinstance(stories, list):
+        raise Exception("No 'stories' list found in response")
+    
+    parsed = []
+    for story_data in stories:
+        if not isinstance(story_data, dict):
+            continue
+        if 'story' in story_data and 'script' not in story_data:
+            story_data['script'] = story_data['story']
+        parsed.append(story_data)
+    return parsed
+
+
+def _build_batch_prompt(slots: List[Dict], used_topics: List[str]) -> str:
+    """
+    One prompt asking for a distinct story per slot (shared rules sent once).
+    
+    Args:
+        slots: Slot specs with 'niche' and optional 'time_window', 'horror_type_guidance', 'trend_guidance'
+        used_topics: Titles/topics the stories must not repeat
+        
+    Returns:
+        Prompt text
+    """
+    seasonal = get_seasonal_context()
+    
+    slot_sections = []
+    for number, slot in enumerate(slots, 1):
+        niche = slot['niche']
+        section = f"""STORY {number}:
+- TARGET CATEGORY: {niche['category']}
+- FOCUS AREA: {niche['focus']}
+- SMART KEYWORDS TO INCLUDE: {', '.join(niche['keywords'])}
+- TIME WINDOW: {slot.get('time_window') or 'any'}"""
+        if "Winter" not in niche.get('category', ''):
+            section += "\n- ALSO BANNED HERE: Winter, Chill, Frozen, Snow"
+        if slot.get('horror_type_guidance'):
+            section += f"\n- TIME-BASED GUIDANCE (match intensity and type): {slot['horror_type_guidance']}"
+        if slot.get('trend_guidance'):
+            section += f"\n- TRENDING FOCUS (align hook/atmosphere): {slot['trend_guidance']}"
+        slot_sections.append(section)
+    
+    used_topics_str = "\n".join(f"- {topic}" for topic in used_topics) if used_topics else "None."
+    tags = ["horror", "horror stories", "scary stories", "true horror", "urban legends", "creepy", "youtube shorts"]
+    slot_list = "\n\n".join(slot_sections)
+    
+    return f"""You are a professional scriptwriter and researcher. Generate {len(slots)} DIFFERENT SCARY, TRUE-CRIME or MYSTERY stories optimized for YouTube Shorts (13 to 14 seconds read each), one per STORY spec below.
+
+SEASONAL CONTEXT (MERGE WITH EACH STORY):
+- Current Date: {seasonal['date']}
+- Season/Theme: {seasonal['theme']}
+- Special Event: {seasonal.get('special_event', 'None')}
+- If possible, set stories during {seasonal['season']} or on {seasonal.get('special_event', seasonal['month'])}
+
+BANNED WORDS (DO NOT USE THESE): Dyatlov, Ural Mountains, Hiking
+
+ALREADY USED TOPICS (DO NOT REPEAT):
+{used_topics_str}
+
+REQUIREMENTS (EVERY STORY):
+1. Strictly 40-50 words. Exactly 14 seconds at 160 WPM.
+2. Use the story's "Smart Keywords" for business-attractive SEO.
+3. Hook structure: Pattern interrupt → Context → Climax → Infinite Loop.
+4. Every story MUST be a NEW topic, unrelated to the banned words, the used topics and the other stories.
+5. If category is BUSINESS/POLITICS/SPORTS, tell a DARK, MYSTERIOUS fact or scandal.
+
+{slot_list}
+
+Return ONLY valid JSON in this format, with exactly {len(slots)} stories in STORY order:
+{{
+    "stories": [
+        {{
+            "slot": 1,
+            "title": "Intriguing mystery title reflecting the TARGET CATEGORY (max 60 chars)",
+            "story": "The full horror story text, 40-50 words. MUST have looping ending.",
+            "source": "Brief mention of where this story comes from",
+            "tags": {json.dumps(tags + seasonal['keywords'])}
+        }}
+    ]
+}}
+
+Remember: Return ONLY the JSON object. No explanations."""
+
+
+def _request_story_batch(slots: List[Dict], used_topics: List[str], seed: int) -> Optional[List[Dict]]:
+    """
+    One batch request, cascading through providers in health order.
+    
+    Args:
+        slots: Slot specs for this request
+        used_topics: Titles/topics to exclude
+        seed: Sample index (round), so re-requests never reuse a cached response
+        
+    Returns:
+        Parsed stories (unvetted), or None if every provider failed
+    """
+    from departments.logistics.llm_engine import llm_complete
+    from departments.logistics.provider_health_engine import (
+        provider_allowed, rank_providers, record_provider_result
+    )
+    
+    providers = {}
+    if CEREBRAS_API_KEY:
+        providers["llm:Cerebras"] = ("Cerebras", "cerebras", "llama-3.3-70b", CEREBRAS_API_KEY)
+    if GEMINI_API_KEY_1:
+        providers["llm:Gemini"] = ("Gemini", "gemini", "gemini-1.5-flash-latest", GEMINI_API_KEY_1)
+    if GEMINI_API_KEY_2:
+        providers["llm:Gemini Key 2"] = ("Gemini Key 2", "gemini", "gemini-1.5-flash-latest", GEMINI_API_KEY_2)
+    if GROQ_API_KEY:
+        providers["llm:Groq"] = ("Groq", "groq", "llama-3.1-8b-instant", GROQ_API_KEY)
+    
+    prompt = _build_batch_prompt(slots, used_topics)
+    for name in rank_providers(list(providers)):
+        label, provider, model, api_key = providers[name]
+        allowed, reason = provider_allowed(name)
+        if not allowed:
+            print(f"   ⏭️ Skipped {label} ({reason})")
+            continue
+        
+        print(f"   🧠 Generating {len(slots)} horror stories in one call with {label}...")
+        started = time.monotonic()
+        try:
+            stories = llm_complete(
+                provider, model, prompt, api_key,
+                system="You are a horror story writer specializing in real, documented horror stories. Always return ONLY valid JSON. Never add conversational text.",
+                temperature=0.9,
+                max_tokens=200 * len(slots) + 200,
+                seed=seed,
+                parse=parse_story_batch_json
+            )
+            record_provider_result(name, True, time.monotonic() - started)
+            return stories
+        except Exception as e:
+            record_provider_result(name, False, time.monotonic() - started, str(e))
+            print(f"⚠️ {label} batch failed: {e}")
+    return None
+
+
+def generate_horror_stories_batch(slots: List[Dict], max_rounds: int = 3, use_scraper: bool = True) -> List[Optional[Dict]]:
+    """
+    Generate several distinct stories with as few LLM round trips as possible.
+    
+    Like generate_horror_story, slots are filled from the scraper first (0-cost, real
+    stories); only the slots it cannot fill go to the LLM. Each request asks for up to
+    STORY_BATCH_SIZE stories in one JSON response. All returned stories are vetted locally
+    in one pass (shape, length, history, published titles and each other); only the
+    rejected slots are re-requested in the next round.
+    
+    Args:
+        slots: One spec per story: optional 'time_window', 'horror_type_guidance',
+            'trend_guidance' and 'niche' (a rotating niche is picked if missing)
+        max_rounds: Request rounds before giving up on the remaining slots
+        use_scraper: Whether to fill slots from the scraper before batching
+        
+    Returns:
+        List aligned with slots: story dict, or None where no fresh story was produced
+    """
+    from departments.logistics.history_engine import _load_history, get_recent_topics
+    
+    slots = [dict(slot, niche=slot.get('niche') or get_niche_rotation()) for slot in slots]
+    results: List[Optional[Dict]] = [None] * len(slots)
+    
+    # Everything a story must not repeat, loaded once (same keys as has_story_been_used)
+    used_titles = set()
+    used_openings = set()
+    for entry in _load_history():
+        used_titles.add(entry.get('title', '').lower().strip())
+        used_openings.add(entry.get('topic', '').lower().strip()[:100])
+    try:
+        from config.published_titles import PUBLISHED_TITLES
+        used_titles.update(title.lower().strip() for title in PUBLISHED_TITLES)
+    except ImportError:
+        pass
+    excluded = get_recent_topics(limit=10)
+    
+    # Scraper first, one story per slot, until it runs out of fresh stories
+    if use_scraper:
+        try:
+            from departments.intelligence.horror_story_scraper import get_horror_story_scraped
+            for index in range(len(slots)):
+                scraped_story = get_horror_story_scraped(published_titles=list(used_titles))
+                if not scraped_story:
+                    break
+                for title in (scraped_story.get('title', ''), scraped_story.get('original_title', '')):
+                    used_titles.add(title.lower().strip())
+                used_openings.add(scraped_story.get('story', '').lower().strip()[:100])
+                excluded.append(scraped_story.get('original_title') or scraped_story.get('title', ''))
+                results[index] = scraped_story
+        except Exception as e:
+            print(f"   ⚠️ Scraping failed: {e}, batching the remaining slots...")
+        scraped = sum(1 for story in results if story)
+        if scraped:
+            print(f"✓ {scraped}/{len(slots)} horror stories scraped from web (0-cost, real stories)")
+    
+    for round_number in range(max_rounds):
+        open_slots = [index for index, story in enumerate(results) if story is None]
+        if not open_slots:
+            break
+        
+        for chunk_start in range(0, len(open_slots), max(1, STORY_BATCH_SIZE)):
+            chunk = open_slots[chunk_start:chunk_start + max(1, STORY_BATCH_SIZE)]
+            stories = _request_story_batch([slots[index] for index in chunk], excluded, round_number)
+            if stories is None:
+                continue
+            
+            # Match stories to slots by their 'slot' number first, then fill the
+            # remaining positions with unnumbered stories in response order
+            assigned = {}
+            unnumbered = []
+            for story_data in stories:
+                number = story_data.get('slot')
+                if isinstance(number, int) and 1 <= number <= len(chunk) and number - 1 not in assigned:
+                    assigned[number - 1] = story_data
+                else:
+                    unnumbered.append(story_data)
+            free_positions = [position for position in range(len(chunk)) if position not in assigned]
+            assigned.update(zip(free_positions, unnumbered))
+            
+            rejected = []
+            for position, index in enumerate(chunk):
+                story_data = assigned.get(position)
+                if not story_data:
+                    rejected.append("missing")
+                    continue
+                title = str(story_data.get('title', '')).strip()
+                story_text = str(story_data.get('story') or story_data.get('script', '')).strip()
+                word_count = len(story_text.split())
+                opening = story_text.lower()[:100]
+                if not title or not (STORY_BATCH_MIN_WORDS <= word_count <= STORY_BATCH_MAX_WORDS):
+                    rejected.append(f"{word_count} words" if title else "no title")
+                    continue
+                if title.lower() in used_titles or opening in used_openings:
+                    rejected.append("duplicate")
+                    excluded.append(title)
+                    continue
+                
+                story_data.pop('slot', None)
+                used_titles.add(title.lower())
+                used_openings.add(opening)
+                excluded.append(title)
+                results[index] = story_data
+            
+            accepted = len(chunk) - len(rejected)
+            summary = f"   📦 Batch: {accepted}/{len(chunk)} stories accepted"
+            if rejected:
+                summary += f" (rejected: {', '.join(rejected)})"
+            print(summary)
+    
+    print(f"✓ Batch generated {sum(1 for story in results if story)}/{len(slots)} horror stories")
+    return results
+
+
 def generate_horror_story(time_window: str = None, horror_type_guidance: str = None, use_scraper: bool = True, max_retries: int = 5, force: bool = False, **kwargs) -> Optional[Dict]:
     """
     Orchestrates horror story generation with fallbacks and duplicate prevention.
@@ -682,83 +1001,18 @@ def generate_horror_story(time_window: str = None, horror_type_guidance: str = N
         selected_niche = get_niche_rotation()
     print(f"   🎯 Target Niche: {selected_niche['category']} - {selected_niche['focus']}")
 
-    # Fallback to LLM generation
+    # Fallback to LLM generation: race the healthiest providers, first fresh story wins
+    generation_kwargs = {
+        "time_window": time_window,
+        "horror_type_guidance": horror_type_guidance,
+        "used_topics": used_topics_str,
+        "trend_guidance": kwargs.get('trend_guidance'),
+        "niche": selected_niche,
+    }
     for attempt in range(max_retries):
-        # Try Cerebras first
-        story_data = generate_horror_story_cerebras(
-            time_window=time_window, 
-            horror_type_guidance=horror_type_guidance,
-            used_topics=used_topics_str,
-            trend_guidance=kwargs.get('trend_guidance'),
-            niche=selected_niche
-        )
-        if story_data:
-            title = story_data.get('title', '')
-            story_text = story_data.get('story') or story_data.get('script', '')
-            
-            # Check if duplicate (unless forced)
-            if force or not has_story_been_used(title, story_text):
-                print(f"✓ Horror story generated with Cerebras{' (Forced)' if force else ''}")
-                return story_data
-            else:
-                print(f"   ⚠️ Duplicate story detected (attempt {attempt + 1}/{max_retries}), retrying...")
-                continue
-        
-        if GEMINI_API_KEY_1:
-            story_data = generate_horror_story_gemini(
-                GEMINI_API_KEY_1, 
-                time_window=time_window, 
-                horror_type_guidance=horror_type_guidance,
-                used_topics=used_topics_str,
-                trend_guidance=kwargs.get('trend_guidance'),
-                niche=selected_niche
-            )
-            if story_data:
-                title = story_data.get('title', '')
-                story_text = story_data.get('story') or story_data.get('script', '')
-                if force or not has_story_been_used(title, story_text):
-                    print(f"✓ Horror story generated with Gemini{' (Forced)' if force else ''}")
-                    return story_data
-                else:
-                    print(f"   ⚠️ Duplicate story detected (attempt {attempt + 1}/{max_retries}), retrying...")
-                    continue
-        
-        if GEMINI_API_KEY_2:
-            story_data = generate_horror_story_gemini(
-                GEMINI_API_KEY_2, 
-                time_window=time_window, 
-                horror_type_guidance=horror_type_guidance,
-                used_topics=used_topics_str,
-                trend_guidance=kwargs.get('trend_guidance'),
-                niche=selected_niche
-            )
-            if story_data:
-                title = story_data.get('title', '')
-                story_text = story_data.get('story') or story_data.get('script', '')
-                if force or not has_story_been_used(title, story_text):
-                    print(f"✓ Horror story generated with Gemini Key 2{' (Forced)' if force else ''}")
-                    return story_data
-                else:
-                    print(f"   ⚠️ Duplicate story detected (attempt {attempt + 1}/{max_retries}), retrying...")
-                    continue
-        
-        # Fallback to Groq
-        story_data = generate_horror_story_groq(
-            time_window=time_window, 
-            horror_type_guidance=horror_type_guidance,
-            used_topics=used_topics_str,
-            trend_guidance=kwargs.get('trend_guidance'),
-            niche=selected_niche
-        )
+        story_data = _race_story_providers(generation_kwargs, attempt, max_retries, force)
         if story_data:
-            title = story_data.get('title', '')
-            story_text = story_data.get('story') or story_data.get('script', '')
-            if force or not has_story_been_used(title, story_text):
-                print(f"✓ Horror story generated with Groq{' (Forced)' if force else ''}")
-                return story_data
-            else:
-                print(f"   ⚠️ Duplicate story detected (attempt {attempt + 1}/{max_retries}), retrying...")
-                continue
+            return story_data
     
     raise Exception(f"All API keys failed or all generated stories were duplicates after {max_retries} attempts.")
 
@@ -10,14 +10,25 @@ import os
 import re
 import json
 import random
-import requests
 from typing import Dict, Optional, List
 from bs4 import BeautifulSoup
 from datetime import datetime
 from dotenv import load_dotenv
+from departments.logistics.http_engine import http_get
+from departments.intelligence.lexicon_engine import compile_lexicon, find_hits
 
 load_dotenv()
 
+# Story quality lexicon (filter_good_stories)
+STORY_FILTER_KEYWORDS = compile_lexicon({
+    "narrative": ['when', 'then', 'suddenly', 'after', 'before', 'during', 'while'],
+    "tension": [
+        'mystery', 'disappeared', 'vanished', 'strange', 'creepy', 'scary',
+        'unknown', 'unexplained', 'mysterious', 'horror', 'fear'
+    ],
+    "explicit": ['kill', 'killed', 'killing', 'killer', 'murder', 'blood', 'death', 'die', 'died'],
+})
+
 
 def get_seasonal_context() -> Dict[str, str]:
     """
@@ -100,7 +111,7 @@ def scrape_reddit_horror_stories(limit: int = 10) -> List[Dict]:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
             }
             
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http_get(url, headers=headers, timeout=15)
             if response.status_code == 200:
                 data = response.json()
                 
@@ -223,18 +234,20 @@ def get_curated_horror_stories() -> List[Dict]:
     return curated
 
 
-def filter_good_stories(stories: List[Dict]) -> List[Dict]:
+def filter_good_stories(stories: List[Dict], min_words: int = 60, max_words: int = 80) -> List[Dict]:
     """
     Filter stories for quality (good length, structure, engagement potential).
     
     Criteria:
-    - 80-120 words (optimal for 30-60s read)
+    - min_words to max_words (default 60-80 words, optimal for 20-25s videos)
     - Has narrative structure (not just list)
     - Contains tension/mystery elements
     - Not too explicit (YouTube-safe)
     
     Args:
         stories: List of story dicts
+        min_words: Shortest accepted story
+        max_words: Longest accepted story
         
     Returns:
         Filtered list of good stories
@@ -246,28 +259,24 @@ def filter_good_stories(stories: List[Dict]) -> List[Dict]:
         word_count = len(story_text.split())
         
         # Length filter (60-80 words optimal for 20-25s videos - proven best performance)
-        if not (60 <= word_count <= 80):
+        if not (min_words <= word_count <= max_words):
             continue
         
+        # One scan for narrative / tension / explicit keywords
+        hits = find_hits(story_text, STORY_FILTER_KEYWORDS)
+        categories = {hit['category'] for hit in hits}
+        
         # Structure filter (must have narrative elements)
-        has_narrative = any(word in story_text.lower() for word in [
-            'when', 'then', 'suddenly', 'after', 'before', 'during', 'while'
-        ])
-        if not has_narrative:
+        if 'narrative' not in categories:
             continue
         
         # Tension filter (must have mystery/scary elements)
-        has_tension = any(word in story_text.lower() for word in [
-            'mystery', 'disappeared', 'vanished', 'strange', 'creepy', 'scary',
-            'unknown', 'unexplained', 'mysterious', 'horror', 'fear'
-        ])
-        if not has_tension:
+        if 'tension' not in categories:
             continue
         
         # YouTube-safe filter (no explicit content)
-        explicit_words = ['kill', 'murder', 'blood', 'death', 'die']
-        has_explicit = any(word in story_text.lower() for word in explicit_words)
-        if has_explicit and story_text.lower().count('kill') > 2:
+        kill_mentions = sum(1 for hit in hits if hit['term'].startswith('kill'))
+        if kill_mentions > 2:
             continue  # Too explicit
         
         good_stories.append(story)
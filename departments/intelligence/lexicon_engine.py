@@ -0,0 +1,141 @@
+"""
+THE LEXICON ENGINE
+Module: Shared keyword matcher for all keyword-driven story logic.
+
+Each lexicon (category -> terms) is compiled once into a single alternation regex
+with word boundaries, so scanning a story is one pass over the text no matter how
+many terms or categories there are. Matches report category, term and position.
+
+Used by image keyword extraction, subtitle highlighting, SFX placement, the twist
+pause, story filtering and hook classification.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+
+def compile_lexicon(categories: Dict[str, List[str]], match_plurals: bool = False) -> Dict:
+    """
+    Compile category -> terms into one case-insensitive regex.
+
+    A term may appear in several categories. Multi-word terms match any whitespace.
+
+    Args:
+        categories: Dict mapping category name -> list of terms (order = priority)
+        match_plurals: Also match 's'/'es' plurals (reported as the base term)
+
+    Returns:
+        Lexicon dict for find_hits() / hits_by_category() / match_words()
+    """
+    term_categories = {}
+    for category, terms in categories.items():
+        for term in terms:
+            key = " ".join(term.lower().split())
+            term_categories.setdefault(key, [])
+            if category not in term_categories[key]:
+                term_categories[key].append(category)
+
+    # Longest first so "never found" wins over "never"
+    alternatives = [
+        r'\s+'.join(re.escape(part) for part in term.split())
+        for term in sorted(term_categories, key=len, reverse=True)
+    ]
+    suffix = r'(?:e?s)?' if match_plurals else ''
+    pattern = r'\b(?:' + '|'.join(alternatives) + r')' + suffix + r'\b' if alternatives else r'(?!)'
+
+    return {
+        "regex": re.compile(pattern, re.IGNORECASE),
+        "categories": {category: [" ".join(t.lower().split()) for t in terms] for category, terms in categories.items()},
+        "term_categories": term_categories,
+        "match_plurals": match_plurals,
+    }
+
+
+def _base_term(matched: str, lexicon: Dict) -> str:
+    """Map matched text back to the lexicon term (whitespace/plural normalized)."""
+    term = " ".join(matched.lower().split())
+    if term in lexicon["term_categories"] or not lexicon["match_plurals"]:
+        return term
+    for cut in (1, 2):
+        if term[:-cut] in lexicon["term_categories"]:
+            return term[:-cut]
+    return term
+
+
+def find_hits(text: str, lexicon: Dict) -> List[Dict]:
+    """
+    All lexicon matches in a text, in text order (one pass).
+
+    Args:
+        text: Text to scan
+        lexicon: Lexicon from compile_lexicon()
+
+    Returns:
+        List of dicts with 'category', 'term', 'start', 'end' (one per category of the term)
+    """
+    hits = []
+    for match in lexicon["regex"].finditer(text or ""):
+        term = _base_term(match.group(0), lexicon)
+        for category in lexicon["term_categories"].get(term, []):
+            hits.append({"category": category, "term": term, "start": match.start(), "end": match.end()})
+    return hits
+
+
+def hits_by_category(text: str, lexicon: Dict) -> Dict[str, List[str]]:
+    """
+    Distinct matched terms per category, in lexicon (priority) order.
+
+    Args:
+        text: Text to scan
+        lexicon: Lexicon from compile_lexicon()
+
+    Returns:
+        Dict mapping category -> matched terms (categories without hits are omitted)
+    """
+    found = {}
+    for hit in find_hits(text, lexicon):
+        found.setdefault(hit["category"], set()).add(hit["term"])
+    return {
+        category: [term for term in terms if term in found[category]]
+        for category, terms in lexicon["categories"].items()
+        if category in found
+    }
+
+
+def match_words(words: List[str], lexicon: Dict) -> List[Tuple[int, str, str]]:
+    """
+    Lexicon matches over a word sequence (e.g. subtitle words), mapped to word indices.
+
+    Args:
+        words: Words in order (punctuation allowed)
+        lexicon: Lexicon from compile_lexicon()
+
+    Returns:
+        List of (word_index, category, term) in order (multi-word terms report their first word)
+    """
+    offsets = []
+    position = 0
+    for word in words:
+        offsets.append(position)
+        position += len(word) + 1
+    text = " ".join(words)
+
+    return [
+        (bisect_right(offsets, hit["start"]) - 1, hit["category"], hit["term"])
+        for hit in find_hits(text, lexicon)
+    ]
+
+
+if __name__ == "__main__":
+    # Test the lexicon engine
+    print("=" * 60)
+    print("🧪 TESTING LEXICON ENGINE")
+    print("=" * 60)
+
+    test_lexicon = compile_lexicon({
+        "unsolved": ["unsolved", "mystery", "never found"],
+        "shocking": ["shocking", "terrifying"],
+    })
+    print(find_hits("The terrifying mystery that was never   found", test_lexicon))
+    print(hits_by_category("A Shocking, UNSOLVED case", test_lexicon))
@@ -215,7 +215,7 @@ def generate_script_cerebras(topic: str, niche: str, viral_titles: List[str] = N
         return None
     
     try:
-        import requests
+        from departments.logistics.llm_engine import llm_complete
         
         # Build viral analysis section if titles provided
         viral_analysis = ""
@@ -304,42 +304,14 @@ CRITICAL SCENE REQUIREMENTS:
 
 REMEMBER: Return ONLY the JSON object. Frame Dark Psychology as a survival story, not a Wikipedia entry. Think threat-led storytelling, not informational lists."""
 
-        # Cerebras API endpoint
-        api_url = "https://api.cerebras.ai/v1/chat/completions"
-        
-        headers = {
-            "Authorization": f"Bearer {CEREBRAS_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "llama-3.3-70b",  # Updated to correct model name
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a Survival Historian and Dark Psychology Expert. Your mission is threat-led storytelling with Hominid History aesthetic. Frame psychological manipulation as survival stories, not Wikipedia entries. Always return ONLY valid JSON. Never add conversational text. Use Time Anchors or Survival Hooks. NO listicles."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.9,
-            "max_tokens": 2000
-        }
-        
         print("   🧠 The Strategist (Cerebras): Generating storyboard...")
-        response = requests.post(api_url, json=payload, headers=headers, timeout=60)
-        
-        if response.status_code != 200:
-            raise Exception(f"Cerebras API returned status {response.status_code}: {response.text}")
-        
-        result = response.json()
-        raw_text = result['choices'][0]['message']['content'].strip()
-        
-        # Clean and parse
-        script_data = clean_script(raw_text)
-        return script_data
+        return llm_complete(
+            "cerebras", "llama-3.3-70b", prompt, CEREBRAS_API_KEY,
+            system="You are a Survival Historian and Dark Psychology Expert. Your mission is threat-led storytelling with Hominid History aesthetic. Frame psychological manipulation as survival stories, not Wikipedia entries. Always return ONLY valid JSON. Never add conversational text. Use Time Anchors or Survival Hooks. NO listicles.",
+            temperature=0.9,
+            max_tokens=2000,
+            parse=clean_script
+        )
         
     except Exception as e:
         print(f"⚠️ Cerebras failed: {e}")
@@ -363,17 +335,7 @@ def generate_script_gemini(topic: str, niche: str, viral_titles: List[str] = Non
         return None
     
     try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=api_key)
-        # Try gemini-1.5-flash first (most reliable), fallback to gemini-pro
-        try:
-            model = genai.GenerativeModel('gemini-1.5-flash-latest')
-        except:
-            try:
-                model = genai.GenerativeModel('gemini-pro')
-            except:
-                model = genai.GenerativeModel('gemini-1.5-flash-latest')
+        from departments.logistics.llm_engine import llm_complete
         
         # Build viral analysis section if titles provided
         viral_analysis = ""
@@ -455,12 +417,8 @@ CRITICAL SCENE REQUIREMENTS:
 
 REMEMBER: Return ONLY the JSON object. Frame Dark Psychology as a survival story, not a Wikipedia entry. Think threat-led storytelling, not informational lists."""
 
-        response = model.generate_content(prompt)
-        raw_text = response.text.strip()
-        
-        # Clean and parse
-        script_data = clean_script(raw_text)
-        return script_data
+        # gemini-1.5-flash first (most reliable), gemini-pro as fallback
+        return llm_complete("gemini", "gemini-1.5-flash-latest", prompt, api_key, temperature=0.9, parse=clean_script)
         
     except Exception as e:
         print(f"⚠️ Gemini failed: {e}")
@@ -482,9 +440,7 @@ def generate_script_groq(topic: str, niche: str, viral_titles: List[str] = None)
         return None
     
     try:
-        from groq import Groq
-        
-        client = Groq(api_key=GROQ_API_KEY)
+        from departments.logistics.llm_engine import llm_complete
         
         # Build viral analysis section if titles provided
         viral_analysis = ""
@@ -573,22 +529,14 @@ CRITICAL SCENE REQUIREMENTS:
 
 REMEMBER: Return ONLY the JSON object. Frame Dark Psychology as a survival story, not a Wikipedia entry. Think threat-led storytelling, not informational lists."""
 
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "system", "content": "You are a Survival Historian and Dark Psychology Expert. Your mission is threat-led storytelling with Hominid History aesthetic. Frame psychological manipulation as survival stories, not Wikipedia entries. Always return ONLY valid JSON. Never add conversational text. Use Time Anchors or Survival Hooks. NO listicles."},
-                {"role": "user", "content": prompt}
-            ],
+        return llm_complete(
+            "groq", "llama-3.1-8b-instant", prompt, GROQ_API_KEY,
+            system="You are a Survival Historian and Dark Psychology Expert. Your mission is threat-led storytelling with Hominid History aesthetic. Frame psychological manipulation as survival stories, not Wikipedia entries. Always return ONLY valid JSON. Never add conversational text. Use Time Anchors or Survival Hooks. NO listicles.",
             temperature=0.9,
-            max_tokens=500
+            max_tokens=500,
+            parse=clean_script
         )
         
-        raw_text = response.choices[0].message.content.strip()
-        
-        # Clean and parse
-        script_data = clean_script(raw_text)
-        return script_data
-        
     except Exception as e:
         print(f"⚠️ Groq failed: {e}")
         return None
@@ -682,17 +630,7 @@ def polish_script_gemini(draft_data: Dict, tone: str) -> Optional[Dict]:
         return None
     
     try:
-        import google.generativeai as genai
-        
-        genai.configure(api_key=api_key)
-        # Try gemini-1.5-flash first (most reliable), fallback to gemini-pro
-        try:
-            model = genai.GenerativeModel('gemini-1.5-flash-latest')
-        except:
-            try:
-                model = genai.GenerativeModel('gemini-pro')
-            except:
-                model = genai.GenerativeModel('gemini-1.5-flash-latest')
+        from departments.logistics.llm_engine import llm_complete
         
         # Check if draft is scene-based or old format
         if 'scenes' in draft_data:
@@ -752,12 +690,8 @@ IMPORTANT: Include a "pacing" field with value "Fast" or "Slow" based on the scr
 
 REMEMBER: Return ONLY the JSON object. Frame as survival story, not Wikipedia entry. NO listicles."""
 
-        response = model.generate_content(prompt)
-        raw_text = response.text.strip()
-        
-        # Clean and parse
-        script_data = clean_script(raw_text)
-        return script_data
+        # gemini-1.5-flash first (most reliable), gemini-pro as fallback
+        return llm_complete("gemini", "gemini-1.5-flash-latest", prompt, api_key, temperature=0.9, parse=clean_script)
         
     except Exception as e:
         print(f"⚠️ Gemini polish failed: {e}")
@@ -779,9 +713,7 @@ def polish_script_groq(draft_data: Dict, tone: str) -> Optional[Dict]:
         return None
     
     try:
-        from groq import Groq
-        
-        client = Groq(api_key=GROQ_API_KEY)
+        from departments.logistics.llm_engine import llm_complete
         
         # Check if draft is scene-based or old format
         if 'scenes' in draft_data:
@@ -841,22 +773,14 @@ IMPORTANT: Include a "pacing" field with value "Fast" or "Slow" based on the scr
 
 REMEMBER: Return ONLY the JSON object. Frame as survival story, not Wikipedia entry. NO listicles."""
 
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "system", "content": "You are a Survival Historian and Dark Psychology Expert. Your mission is threat-led storytelling with Hominid History aesthetic. Frame psychological manipulation as survival stories. Always return ONLY valid JSON. Never add conversational text. Use Time Anchors or Survival Hooks. NO listicles."},
-                {"role": "user", "content": prompt}
-            ],
+        return llm_complete(
+            "groq", "llama-3.1-8b-instant", prompt, GROQ_API_KEY,
+            system="You are a Survival Historian and Dark Psychology Expert. Your mission is threat-led storytelling with Hominid History aesthetic. Frame psychological manipulation as survival stories. Always return ONLY valid JSON. Never add conversational text. Use Time Anchors or Survival Hooks. NO listicles.",
             temperature=0.9,
-            max_tokens=500
+            max_tokens=500,
+            parse=clean_script
         )
         
-        raw_text = response.choices[0].message.content.strip()
-        
-        # Clean and parse
-        script_data = clean_script(raw_text)
-        return script_data
-        
     except Exception as e:
         print(f"⚠️ Groq polish failed: {e}")
         return None
@@ -0,0 +1,294 @@
+"""
+THE STORY POOL ENGINE
+Module: Buffer of vetted, ready-to-produce horror stories.
+
+Story generation (scraping, duplicate checks, LLM cascades) is the slowest part of
+a video that nothing else depends on, so it runs ahead of production:
+- A background thread fills the pool up to STORY_POOL_TARGET stories: scraper
+  first (0-cost, real stories), one generate_horror_stories_batch call for the rest
+- Every story is vetted before it is queued: not in history or already pooled,
+  passes the filter_good_stories criteria, title optimized
+- The queue is persisted to story_pool.json after every change, so stories survive
+  between runs and an interrupted refill loses nothing (the thread never blocks exit)
+
+Production pops the next story in O(1) and hands it back with return_story if the
+video fails. Once a video has its story, ensure_story_pool starts a background refill
+whenever the pool is below STORY_POOL_LOW_WATER (empty included), so the refill runs
+while the video renders instead of competing with story generation. Short-lived
+entry points call wait_for_story_pool_refill before exiting.
+"""
+
+import os
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+STORY_POOL_FILE = "story_pool.json"
+STORY_POOL_TARGET = int(os.getenv("STORY_POOL_TARGET", "6"))
+STORY_POOL_LOW_WATER = int(os.getenv("STORY_POOL_LOW_WATER", "3"))
+# LLM stories are 40-50 words, scraped ones run longer
+STORY_POOL_MIN_WORDS = int(os.getenv("STORY_POOL_MIN_WORDS", "30"))
+STORY_POOL_MAX_WORDS = int(os.getenv("STORY_POOL_MAX_WORDS", "90"))
+
+_pool: deque = deque()
+_loaded = False
+_lock = threading.Lock()
+_refill_thread: Optional[threading.Thread] = None
+
+
+def _load_pool() -> None:
+    """Load the persisted queue once per process (caller holds the lock)."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    if not os.path.exists(STORY_POOL_FILE):
+        return
+    try:
+        with open(STORY_POOL_FILE, 'r') as f:
+            data = json.load(f)
+            if isinstance(data, list):
+                _pool.extend(story for story in data if isinstance(story, dict))
+    except Exception as e:
+        print(f"   ⚠️ Failed to load story pool: {e}")
+
+
+def _save_pool() -> None:
+    """Persist the queue (atomic replace, caller holds the lock)."""
+    try:
+        temp_path = STORY_POOL_FILE + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(list(_pool), f, indent=2)
+        os.replace(temp_path, STORY_POOL_FILE)
+    except Exception as e:
+        print(f"   ⚠️ Could not save story pool: {e}")
+
+
+def _vet_story(story_data: Dict) -> Optional[Dict]:
+    """
+    Check a candidate story and prepare it for production.
+
+    Args:
+        story_data: Story dict from the scraper or an LLM
+
+    Returns:
+        Story dict with an optimized 'title' (original kept in 'original_title'),
+        or None if the story is rejected
+    """
+    from departments.intelligence.horror_story_engine import has_story_been_used
+    from departments.intelligence.horror_story_scraper import filter_good_stories
+    from departments.intelligence.title_optimizer import optimize_title
+
+    title = str(story_data.get('title', '')).strip()
+    story_text = str(story_data.get('story') or story_data.get('script', '')).strip()
+    if not title or not story_text:
+        return None
+
+    if has_story_been_used(title, story_text):
+        return None
+    with _lock:
+        _load_pool()
+        pooled_titles = {story.get('original_title', '').lower() for story in _pool}
+    if title.lower() in pooled_titles:
+        return None
+
+    story_data = dict(story_data, story=story_text)
+    if not filter_good_stories([story_data], min_words=STORY_POOL_MIN_WORDS, max_words=STORY_POOL_MAX_WORDS):
+        return None
+
+    story_data['original_title'] = title
+    story_data['title'] = optimize_title(title, story_type="horror")
+    story_data['pooled_at'] = datetime.now().isoformat()
+    return story_data
+
+
+def _add_stories(candidates: List[Optional[Dict]]) -> int:
+    """Vet candidates and queue the accepted ones; returns how many were queued."""
+    added = 0
+    for story_data in candidates:
+        if not story_data:
+            continue
+        vetted = _vet_story(story_data)
+        if not vetted:
+            print(f"   🗑️ Story pool rejected: {story_data.get('title', 'Untitled')}")
+            continue
+        with _lock:
+            _pool.append(vetted)
+            _save_pool()
+        added += 1
+    return added
+
+
+def refill_story_pool(target: Optional[int] = None) -> int:
+    """
+    Fill the pool up to the target size (blocking).
+
+    The scraper is tried first, one story per missing slot until it runs out of fresh
+    stories; the remaining shortfall is requested in one batched LLM generation.
+
+    Args:
+        target: Desired pool size (defaults to STORY_POOL_TARGET)
+
+    Returns:
+        Number of stories added
+    """
+    from departments.intelligence.horror_story_engine import generate_horror_stories_batch
+    from departments.intelligence.horror_story_scraper import get_horror_story_scraped
+
+    target = STORY_POOL_TARGET if target is None else target
+    with _lock:
+        _load_pool()
+        deficit = target - len(_pool)
+    if deficit <= 0:
+        return 0
+
+    print(f"   🧺 Refilling story pool: {deficit} stories needed")
+    published_titles = []
+    try:
+        from config.published_titles import PUBLISHED_TITLES
+        published_titles = list(PUBLISHED_TITLES)
+    except ImportError:
+        pass
+
+    added = 0
+    for _ in range(deficit):
+        with _lock:
+            pooled_titles = [story.get(key, '') for story in _pool for key in ('title', 'original_title')]
+        try:
+            scraped_story = get_horror_story_scraped(published_titles=published_titles + pooled_titles)
+        except Exception as e:
+            print(f"   ⚠️ Story pool scraping failed: {e}")
+            break
+        if not scraped_story:
+            break
+        added += _add_stories([scraped_story])
+
+    shortfall = deficit - added
+    if shortfall > 0:
+        try:
+            batch = generate_horror_stories_batch([{} for _ in range(shortfall)], max_rounds=2, use_scraper=False)
+            added += _add_stories(batch)
+        except Exception as e:
+            print(f"   ⚠️ Story pool batch failed: {e}")
+
+    print(f"   🧺 Story pool: +{added} stories ({story_pool_size()} ready)")
+    return added
+
+
+def _run_refill() -> None:
+    """Refill thread body (errors are logged, never raised)."""
+    try:
+        refill_story_pool()
+    except Exception as e:
+        print(f"   ⚠️ Story pool refill failed: {e}")
+
+
+def start_story_pool_refill() -> threading.Thread:
+    """
+    Refill the pool in the background (a running refill is reused, not duplicated).
+
+    The thread is a daemon: exiting mid-refill keeps every story already queued.
+
+    Returns:
+        The refill thread
+    """
+    global _refill_thread
+    with _lock:
+        if _refill_thread is None or not _refill_thread.is_alive():
+            _refill_thread = threading.Thread(target=_run_refill, name="story_pool", daemon=True)
+            _refill_thread.start()
+        return _refill_thread
+
+
+def ensure_story_pool() -> Optional[threading.Thread]:
+    """
+    Start a background refill if the pool is below STORY_POOL_LOW_WATER (empty included).
+
+    Returns:
+        The refill thread, or None if the pool is stocked
+    """
+    if story_pool_size() >= STORY_POOL_LOW_WATER:
+        return None
+    return start_story_pool_refill()
+
+
+def wait_for_story_pool_refill(timeout: Optional[float] = None) -> None:
+    """
+    Block until a running refill finishes (one-shot runs call this before exiting).
+
+    Args:
+        timeout: Maximum seconds to wait (None waits for the refill to finish)
+    """
+    with _lock:
+        thread = _refill_thread
+    if thread is None or not thread.is_alive():
+        return
+    print("   🧺 Waiting for the story pool refill to finish...")
+    thread.join(timeout)
+    if thread.is_alive():
+        print("   ⚠️ Story pool refill still running, stories queued so far are kept")
+
+
+def pop_story() -> Optional[Dict]:
+    """
+    Take the next vetted story.
+
+    Hand the story back with return_story if its video is not produced, and call
+    ensure_story_pool once the video has a story to keep the pool stocked.
+
+    Returns:
+        Story dict, or None if the pool is empty
+    """
+    from departments.intelligence.horror_story_engine import has_story_been_used
+
+    while True:
+        with _lock:
+            _load_pool()
+            story_data = _pool.popleft() if _pool else None
+            if story_data is not None:
+                _save_pool()
+        # A story used since it was vetted (e.g. generated directly on a pool miss) is dropped
+        if story_data is None or not has_story_been_used(story_data['original_title'], story_data['story']):
+            break
+        print(f"   🗑️ Story pool dropped already used: {story_data['original_title']}")
+    return story_data
+
+
+def return_story(story_data: Dict) -> None:
+    """
+    Put a popped story back at the front of the pool (e.g. its video failed).
+
+    Args:
+        story_data: Story dict as returned by pop_story
+    """
+    with _lock:
+        _load_pool()
+        _pool.appendleft(story_data)
+        _save_pool()
+    print(f"   🧺 Story returned to the pool: {story_data.get('title', 'Untitled')}")
+
+
+def story_pool_size() -> int:
+    """Number of stories ready in the pool."""
+    with _lock:
+        _load_pool()
+        return len(_pool)
+
+
+if __name__ == "__main__":
+    # Test the story pool engine
+    print("=" * 60)
+    print("🧪 TESTING STORY POOL ENGINE")
+    print("=" * 60)
+
+    print(f"Pool before: {story_pool_size()} stories")
+    refill_story_pool()
+    with _lock:
+        for test_story in _pool:
+            print(f"   - {test_story['title']} ({len(test_story['story'].split())} words)")
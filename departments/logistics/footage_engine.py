@@ -0,0 +1,211 @@
+"""
+THE FOOTAGE ENGINE
+Module: Memory of every source-video range already cut into a background.
+
+Stored as an append-only log (one JSON line per used range), so recording a cut
+appends one line instead of rewriting the whole file. The legacy
+visual_engine_timestamps.json is imported on first load.
+
+In memory each source video keeps a sorted list of merged, non-overlapping
+intervals (parallel start/end lists), so overlap checks are a bisect and the
+free gaps of a video can be listed directly - an unused window is picked in one
+draw instead of by rejection sampling.
+"""
+
+import os
+import json
+import random
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+FOOTAGE_FILE = "used_footage.jsonl"
+LEGACY_TIMESTAMP_FILE = "visual_engine_timestamps.json"
+FOOTAGE_TOLERANCE = 2.0  # Seconds kept clear around every used range
+
+_intervals: Dict[str, Tuple[List[float], List[float]]] = {}
+_loaded = False
+_lock = threading.Lock()
+
+
+def _insert(video_id: str, start: float, end: float) -> None:
+    """Add a range to a video's merged interval list (caller holds the lock)."""
+    starts, ends = _intervals.setdefault(video_id, ([], []))
+    # First interval ending at/after start and last interval starting at/before end
+    low = bisect_left(ends, start)
+    high = bisect_right(starts, end)
+    if low < high:
+        start = min(start, starts[low])
+        end = max(end, ends[high - 1])
+    starts[low:high] = [start]
+    ends[low:high] = [end]
+
+
+def _load_index() -> None:
+    """Load the footage log (and the legacy JSON) once per process (caller holds the lock)."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+
+    if os.path.exists(LEGACY_TIMESTAMP_FILE):
+        try:
+            with open(LEGACY_TIMESTAMP_FILE, 'r') as f:
+                for video_id, ranges in json.load(f).items():
+                    for start, end in ranges:
+                        _insert(video_id, float(start), float(end))
+        except Exception as e:
+            print(f"   ⚠️ Failed to import legacy timestamps: {e}")
+
+    if not os.path.exists(FOOTAGE_FILE):
+        return
+    try:
+        with open(FOOTAGE_FILE, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    _insert(record["video_id"], float(record["start"]), float(record["end"]))
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except Exception as e:
+        print(f"   ⚠️ Failed to load footage index: {e}")
+
+
+def is_range_used(video_id: str, start: float, end: float, tolerance: float = FOOTAGE_TOLERANCE) -> bool:
+    """
+    Whether a range overlaps (or comes within tolerance of) an already used range.
+
+    Args:
+        video_id: Source video ID
+        start: Start time in seconds
+        end: End time in seconds
+        tolerance: Time tolerance in seconds
+
+    Returns:
+        True if the range is too close to a used one
+    """
+    with _lock:
+        _load_index()
+        if video_id not in _intervals:
+            return False
+        starts, ends = _intervals[video_id]
+        # Only the first interval ending after (start - tolerance) can overlap
+        index = bisect_right(ends, start - tolerance)
+        return index < len(starts) and starts[index] < end + tolerance
+
+
+def used_seconds(video_id: str) -> float:
+    """
+    Total seconds of a source video already used.
+
+    Args:
+        video_id: Source video ID
+
+    Returns:
+        Seconds covered by used ranges
+    """
+    with _lock:
+        _load_index()
+        starts, ends = _intervals.get(video_id, ([], []))
+        return sum(end - start for start, end in zip(starts, ends))
+
+
+def free_gaps(video_id: str, duration: float, tolerance: float = FOOTAGE_TOLERANCE) -> List[Tuple[float, float]]:
+    """
+    Unused stretches of a source video (used ranges padded by tolerance).
+
+    Args:
+        video_id: Source video ID
+        duration: Full video duration in seconds
+        tolerance: Time tolerance in seconds
+
+    Returns:
+        List of (start, end) gaps in time order
+    """
+    with _lock:
+        _load_index()
+        starts, ends = _intervals.get(video_id, ([], []))
+        gaps = []
+        cursor = 0.0
+        for used_start, used_end in zip(starts, ends):
+            if used_start - tolerance > cursor:
+                gaps.append((cursor, min(used_start - tolerance, duration)))
+            cursor = max(cursor, used_end + tolerance)
+            if cursor >= duration:
+                break
+        if cursor < duration:
+            gaps.append((cursor, duration))
+        return [(gap_start, gap_end) for gap_start, gap_end in gaps if gap_end > gap_start]
+
+
+def pick_free_window(video_id: str, duration: float, length: float,
+                     tolerance: float = FOOTAGE_TOLERANCE) -> Optional[float]:
+    """
+    Start of an unused window of a given length.
+
+    Every valid start position across all fitting gaps is equally likely, and a
+    single draw always lands in free footage.
+
+    Args:
+        video_id: Source video ID
+        duration: Full video duration in seconds
+        length: Window length in seconds
+        tolerance: Time tolerance in seconds
+
+    Returns:
+        Window start in seconds, or None if no gap is long enough
+    """
+    slack = [(gap_start, gap_end - gap_start - length)
+             for gap_start, gap_end in free_gaps(video_id, duration, tolerance)
+             if gap_end - gap_start >= length]
+    if not slack:
+        return None
+
+    point = random.uniform(0, sum(room for _, room in slack))
+    for gap_start, room in slack:
+        if point <= room:
+            return gap_start + point
+        point -= room
+    gap_start, room = slack[-1]
+    return gap_start + room
+
+
+def record_used(video_id: str, start: float, end: float) -> None:
+    """
+    Append a used range to the log and the in-memory index.
+
+    Args:
+        video_id: Source video ID
+        start: Start time in seconds
+        end: End time in seconds
+    """
+    start, end = round(start, 2), round(end, 2)
+    with _lock:
+        _load_index()
+        try:
+            with open(FOOTAGE_FILE, 'a') as f:
+                f.write(json.dumps({
+                    "video_id": video_id, "start": start, "end": end, "date": datetime.now().isoformat()
+                }) + "\n")
+        except Exception as e:
+            print(f"   ⚠️ Could not save used footage: {e}")
+        _insert(video_id, start, end)
+
+
+if __name__ == "__main__":
+    # Test the footage engine
+    print("=" * 60)
+    print("🧪 TESTING FOOTAGE ENGINE")
+    print("=" * 60)
+
+    with _lock:
+        _load_index()
+        test_videos = list(_intervals)[:5]
+    for test_video in test_videos:
+        print(f"{test_video}: used {used_seconds(test_video):.1f}s, gaps {free_gaps(test_video, 600)}")
+        print(f"   next 20s window: {pick_free_window(test_video, 600, 20)}")
@@ -72,7 +72,8 @@ def has_topic_been_used(topic: str) -> bool:
     return False
 
 
-def log_video(topic: str, title: str, video_id: Optional[str] = None, filename: str = None) -> None:
+def log_video(topic: str, title: str, video_id: Optional[str] = None, filename: str = None,
+              image_hashes: Optional[List[str]] = None) -> None:
     """
     Log a video to history.
     
@@ -81,6 +82,7 @@ def log_video(topic: str, title: str, video_id: Optional[str] = None, filename:
         title: Video title
         video_id: YouTube video ID (if uploaded)
         filename: Local filename (optional)
+        image_hashes: Perceptual hashes of the stock photos used (optional, see image_hash_engine)
     """
     history = _load_history()
     
@@ -95,6 +97,10 @@ def log_video(topic: str, title: str, video_id: Optional[str] = None, filename:
     history.append(entry)
     _save_history(history)
     
+    if image_hashes:
+        from departments.logistics.image_hash_engine import record_image_hashes
+        record_image_hashes(image_hashes, title=title, video_id=video_id)
+    
     print(f"   ✓ Video logged to history: {title}")
 
 
@@ -0,0 +1,245 @@
+"""
+THE HTTP ENGINE
+Module: Shared HTTP client for every outbound API call.
+
+One keep-alive session per host (so Unsplash, Pexels, Pollinations, Reddit and the
+LLM APIs each reuse their own warm TLS connections), plus:
+- Configurable connection pool size per host
+- Retry on 429/5xx and connection failures with jittered exponential backoff
+- Retry-After honoured (seconds or HTTP date), capped so a run never stalls
+- Per-host latency / error metrics
+"""
+
+import os
+import time
+import random
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Connection pools: default per-host size, plus "host=size,host=size" overrides
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "8"))
+HTTP_POOL_OVERRIDES = os.getenv("HTTP_POOL_OVERRIDES", "")
+
+# Retry policy
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "20"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_host_stats = {}
+_host_stats_lock = threading.Lock()
+
+
+def _pool_size(host: str) -> int:
+    """
+    Connection pool size for a host (HTTP_POOL_OVERRIDES wins over the default).
+
+    Args:
+        host: Hostname (netloc)
+
+    Returns:
+        Max pooled connections for the host
+    """
+    for entry in HTTP_POOL_OVERRIDES.split(','):
+        name, _, size = entry.strip().partition('=')
+        if name and size and name == host:
+            try:
+                return max(1, int(size))
+            except ValueError:
+                break
+    return HTTP_POOL_MAXSIZE
+
+
+def get_session(host: str) -> requests.Session:
+    """
+    Keep-alive session dedicated to one host (created on first use).
+
+    Args:
+        host: Hostname (netloc)
+
+    Returns:
+        requests.Session with a pooled adapter (retries are handled by request())
+    """
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            size = _pool_size(host)
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=size, pool_block=False, max_retries=0)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date).
+
+    Args:
+        response: HTTP response
+
+    Returns:
+        Seconds to wait, or None if the header is missing/invalid
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry number (0-based)."""
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _record(host: str, latency: float, status: Optional[int], retried: bool) -> None:
+    """Record one attempt against a host."""
+    with _host_stats_lock:
+        stats = _host_stats.setdefault(host, {
+            "requests": 0, "errors": 0, "retries": 0, "latencies": deque(maxlen=200)
+        })
+        stats["requests"] += 1
+        if status is None or status in RETRY_STATUSES:
+            stats["errors"] += 1
+        if retried:
+            stats["retries"] += 1
+        stats["latencies"].append(latency)
+
+
+def request(method: str, url: str, retries: Optional[int] = None, **kwargs) -> requests.Response:
+    """
+    Send an HTTP request through the host's pooled session, retrying transient failures.
+
+    Retries on 429/500/502/503/504 and on connection errors. Read timeouts are only
+    retried for GET (an LLM POST that timed out may still have been billed).
+    The final response is returned as-is, so callers keep their status checks.
+
+    Args:
+        method: HTTP method ('GET', 'POST', ...)
+        url: Request URL
+        retries: Max retries (default HTTP_MAX_RETRIES, 0 disables)
+        **kwargs: Passed to requests (headers, params, json, timeout, ...)
+
+    Returns:
+        requests.Response
+
+    Raises:
+        requests.RequestException: If the last attempt fails without a response
+    """
+    host = urlparse(url).netloc
+    session = get_session(host)
+    retries = HTTP_MAX_RETRIES if retries is None else retries
+    retry_timeouts = method.upper() == "GET"
+
+    for attempt in range(retries + 1):
+        started = time.monotonic()
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            _record(host, time.monotonic() - started, None, attempt > 0)
+            read_timeout = isinstance(e, requests.Timeout) and not isinstance(e, requests.ConnectTimeout)
+            if attempt == retries or (read_timeout and not retry_timeouts):
+                raise
+            delay = _backoff(attempt)
+        else:
+            _record(host, time.monotonic() - started, response.status_code, attempt > 0)
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+            delay = _retry_after(response)
+            if delay is None:
+                delay = _backoff(attempt)
+            elif delay > HTTP_BACKOFF_MAX:
+                # Quota window longer than we are willing to wait - let the caller fall back
+                return response
+            response.close()
+
+        time.sleep(delay)
+
+    raise requests.RequestException(f"Retries exhausted for {url}")
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """
+    GET through the shared client (see request()).
+
+    Args:
+        url: Request URL
+        **kwargs: Passed to request()
+
+    Returns:
+        requests.Response
+    """
+    return request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """
+    POST through the shared client (see request()).
+
+    Args:
+        url: Request URL
+        **kwargs: Passed to request()
+
+    Returns:
+        requests.Response
+    """
+    return request("POST", url, **kwargs)
+
+
+def get_http_metrics() -> Dict[str, Dict]:
+    """
+    Snapshot of per-host request statistics.
+
+    Returns:
+        Dict mapping host -> {'requests', 'errors', 'retries', 'p50', 'p90'} (latency in seconds)
+    """
+    import numpy as np
+
+    snapshot = {}
+    with _host_stats_lock:
+        for host, stats in _host_stats.items():
+            latencies = list(stats["latencies"])
+            snapshot[host] = {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "retries": stats["retries"],
+                "p50": float(np.percentile(latencies, 50)) if latencies else None,
+                "p90": float(np.percentile(latencies, 90)) if latencies else None,
+            }
+    return snapshot
+
+
+if __name__ == "__main__":
+    # Test the HTTP engine
+    print("=" * 60)
+    print("🧪 TESTING HTTP ENGINE")
+    print("=" * 60)
+
+    for test_url in ["https://httpbin.org/status/200", "https://httpbin.org/status/503"]:
+        try:
+            test_response = http_get(test_url, timeout=10, retries=2)
+            print(f"{test_url}: {test_response.status_code}")
+        except Exception as e:
+            print(f"{test_url}: ❌ {e}")
+
+    for test_host, host_metrics in get_http_metrics().items():
+        print(f"{test_host}: {host_metrics}")
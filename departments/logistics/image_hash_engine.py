@@ -0,0 +1,229 @@
+"""
+THE IMAGE HASH ENGINE
+Module: Perceptual-hash memory of every stock photo already used in a video.
+
+Stored next to history.json as an append-only log (one JSON line per image), so
+logging a video appends a few lines instead of rewriting the index.
+
+Images are fingerprinted with a 64-bit dHash. Near-duplicate lookup uses
+multi-index hashing: the hash is split into four 16-bit chunks, each with its
+own table. Two hashes within distance d share at least one chunk within
+distance d // 4, so a lookup probes a handful of buckets instead of scanning
+every image ever used.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from itertools import combinations
+from typing import Dict, List, Optional
+
+
+IMAGE_HASH_FILE = "image_hashes.jsonl"
+IMAGE_HASH_DISTANCE = int(os.getenv("IMAGE_HASH_DISTANCE", "6"))  # Max Hamming distance for "same photo"
+IMAGE_REUSE_COOLDOWN_DAYS = float(os.getenv("IMAGE_REUSE_COOLDOWN_DAYS", "30"))
+
+_CHUNKS = 4
+_CHUNK_BITS = 16
+_CHUNK_MASK = (1 << _CHUNK_BITS) - 1
+
+_entries: List[Dict] = []
+_tables: List[Dict[int, List[int]]] = [{} for _ in range(_CHUNKS)]
+_loaded = False
+_lock = threading.Lock()
+
+
+def hamming_distance(hash_a: int, hash_b: int) -> int:
+    """Number of differing bits between two 64-bit hashes."""
+    return bin(hash_a ^ hash_b).count('1')
+
+
+def compute_dhash(image_path: str) -> Optional[int]:
+    """
+    64-bit difference hash of an image.
+
+    JPEGs are decoded at 1/8 scale; flat images (dark placeholders) return None,
+    since every placeholder would look like every other one.
+
+    Args:
+        image_path: Path to an image file
+
+    Returns:
+        Hash as an int, or None if the image is flat or unreadable
+    """
+    try:
+        from PIL import Image, ImageStat
+
+        img = Image.open(image_path)
+        img.draft('L', (64, 64))
+        img = img.convert('L')
+        if ImageStat.Stat(img).stddev[0] < 8:
+            return None
+
+        pixels = list(img.resize((9, 8), Image.Resampling.BOX).getdata())
+        value = 0
+        for row in range(8):
+            for col in range(8):
+                left = pixels[row * 9 + col]
+                right = pixels[row * 9 + col + 1]
+                value = (value << 1) | (1 if left > right else 0)
+        return value
+    except Exception:
+        return None
+
+
+def hash_images(image_paths: List[str]) -> List[str]:
+    """
+    Fingerprint the images placed in a video (for log_video()).
+
+    Args:
+        image_paths: Image file paths
+
+    Returns:
+        List of 16-char hex hashes (flat/unreadable images are skipped)
+    """
+    hashes = []
+    for path in image_paths or []:
+        value = compute_dhash(path)
+        if value is not None:
+            hashes.append(f"{value:016x}")
+    return hashes
+
+
+def _add_to_memory(value: int, date: str) -> None:
+    """Insert one hash into the chunk tables (caller holds the lock)."""
+    index = len(_entries)
+    _entries.append({"hash": value, "date": date})
+    for chunk in range(_CHUNKS):
+        key = (value >> (chunk * _CHUNK_BITS)) & _CHUNK_MASK
+        _tables[chunk].setdefault(key, []).append(index)
+
+
+def _load_index() -> None:
+    """Load the hash log once per process (caller holds the lock)."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    if not os.path.exists(IMAGE_HASH_FILE):
+        return
+    try:
+        with open(IMAGE_HASH_FILE, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    _add_to_memory(int(record["hash"], 16), record.get("date", ""))
+                except (ValueError, KeyError):
+                    continue
+    except Exception as e:
+        print(f"   ⚠️ Failed to load image hash index: {e}")
+
+
+def _chunk_probes(key: int, radius: int):
+    """All 16-bit keys within `radius` bit flips of a chunk key."""
+    yield key
+    for flips in range(1, radius + 1):
+        for bits in combinations(range(_CHUNK_BITS), flips):
+            probe = key
+            for bit in bits:
+                probe ^= 1 << bit
+            yield probe
+
+
+def find_similar(value: int, max_distance: int = IMAGE_HASH_DISTANCE, since: Optional[datetime] = None) -> Optional[Dict]:
+    """
+    Closest previously used image within a Hamming distance.
+
+    Args:
+        value: dHash of the candidate image
+        max_distance: Max Hamming distance to count as the same photo
+        since: Only consider images logged at or after this time
+
+    Returns:
+        Dict with 'hash', 'date', 'distance', or None if no match
+    """
+    since_iso = since.isoformat() if since else ""
+    radius = max_distance // _CHUNKS
+
+    with _lock:
+        _load_index()
+        best = None
+        checked = set()
+        for chunk in range(_CHUNKS):
+            key = (value >> (chunk * _CHUNK_BITS)) & _CHUNK_MASK
+            table = _tables[chunk]
+            for probe in _chunk_probes(key, radius):
+                for index in table.get(probe, ()):
+                    if index in checked:
+                        continue
+                    checked.add(index)
+                    entry = _entries[index]
+                    if entry["date"] < since_iso:
+                        continue
+                    distance = hamming_distance(value, entry["hash"])
+                    if distance <= max_distance and (best is None or distance < best["distance"]):
+                        best = {"hash": f"{entry['hash']:016x}", "date": entry["date"], "distance": distance}
+        return best
+
+
+def is_recently_used(value: int) -> bool:
+    """
+    Whether a near-identical photo appeared in a video within the reuse cooldown.
+
+    Args:
+        value: dHash of the candidate image
+
+    Returns:
+        True if the photo should not be used again yet
+    """
+    since = datetime.now() - timedelta(days=IMAGE_REUSE_COOLDOWN_DAYS)
+    return find_similar(value, since=since) is not None
+
+
+def record_image_hashes(hashes: List[str], title: str = None, video_id: Optional[str] = None) -> None:
+    """
+    Append a video's image hashes to the index (file and memory).
+
+    Args:
+        hashes: Hex hashes from hash_images()
+        title: Video title
+        video_id: YouTube video ID (if uploaded)
+    """
+    if not hashes:
+        return
+
+    date = datetime.now().isoformat()
+    with _lock:
+        _load_index()
+        try:
+            with open(IMAGE_HASH_FILE, 'a') as f:
+                for hex_hash in hashes:
+                    f.write(json.dumps({"hash": hex_hash, "title": title, "video_id": video_id, "date": date}) + "\n")
+        except Exception as e:
+            print(f"   ⚠️ Failed to save image hashes: {e}")
+            return
+        for hex_hash in hashes:
+            _add_to_memory(int(hex_hash, 16), date)
+
+
+if __name__ == "__main__":
+    # Test the image hash engine
+    import sys
+    import time
+
+    print("=" * 60)
+    print("🧪 TESTING IMAGE HASH ENGINE")
+    print("=" * 60)
+
+    for test_path in sys.argv[1:]:
+        test_hash = compute_dhash(test_path)
+        if test_hash is None:
+            print(f"{test_path}: flat or unreadable")
+            continue
+        started = time.perf_counter()
+        match = find_similar(test_hash)
+        print(f"{test_path}: {test_hash:016x} match={match} ({(time.perf_counter() - started) * 1000:.3f}ms)")
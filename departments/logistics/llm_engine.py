@@ -0,0 +1,327 @@
+"""
+THE LLM ENGINE
+Module: Shared call layer for every LLM request (Cerebras, Gemini, Groq).
+
+For development, responses can be cached on disk (LLM_CACHE_ENABLED=true, off by
+default), content-addressed by a hash of (provider, model, messages, temperature,
+max_tokens, seed):
+- A rerun with an identical prompt reuses the response instead of paying for it again
+- Retry loops pass their attempt number as the seed, so a retry still gets a fresh sample
+- Only responses the caller could parse are stored
+- Entries expire after LLM_CACHE_TTL_HOURS; the oldest-used go once LLM_CACHE_MAX_MB is exceeded
+- bypass_cache=True forces a fresh call even with the cache enabled
+
+Production leaves the cache off: identical prompts from separate runs (same history,
+same niche) must still get new samples, not a story that was just rejected.
+
+Every call (cached or not) appends token counts and latency to llm_calls.jsonl.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from config.paths import LLM_CACHE_DIR
+
+load_dotenv()
+
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "24"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "20"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"  # Development only
+LLM_CALL_LOG = "llm_calls.jsonl"
+
+CEREBRAS_API_URL = "https://api.cerebras.ai/v1/chat/completions"
+GEMINI_FALLBACK_MODEL = "gemini-pro"
+
+_cache_lock = threading.Lock()
+_log_lock = threading.Lock()
+# genai.configure() is process-global: each Gemini call binds its key's client under this
+# lock, then generates outside it so calls with different keys still run in parallel
+_gemini_lock = threading.Lock()
+_stats: Dict[str, Dict] = {}
+
+
+def _cache_key(provider: str, model: str, system: Optional[str], prompt: str,
+               temperature: float, max_tokens: int, seed: Optional[int]) -> str:
+    """Content address of a request."""
+    material = json.dumps([provider, model, system, prompt, temperature, max_tokens, seed])
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    """Cache file for a request key."""
+    return os.path.join(LLM_CACHE_DIR, f"{key}.json")
+
+
+def _cache_get(key: str) -> Optional[Dict]:
+    """Cached entry for a key if present and fresh (marks it recently used)."""
+    path = _cache_path(key)
+    try:
+        with open(path, 'r') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - entry.get("created", 0) > LLM_CACHE_TTL_HOURS * 3600:
+        _cache_drop(key)
+        return None
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+    return entry
+
+
+def _cache_drop(key: str) -> None:
+    """Remove a cache entry."""
+    try:
+        os.remove(_cache_path(key))
+    except OSError:
+        pass
+
+
+def _cache_put(key: str, entry: Dict) -> None:
+    """Store an entry (atomic replace), then evict expired and least recently used entries."""
+    path = _cache_path(key)
+    try:
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(temp_path, path)
+    except Exception as e:
+        print(f"   ⚠️ Could not cache LLM response: {e}")
+        return
+
+    with _cache_lock:
+        now = time.time()
+        files = []
+        for item in os.scandir(LLM_CACHE_DIR):
+            if not item.name.endswith(".json"):
+                continue
+            stat = item.stat()
+            # Last use is the mtime; creation is never later, so an idle expired entry shows here too
+            if now - stat.st_mtime > LLM_CACHE_TTL_HOURS * 3600:
+                try:
+                    os.remove(item.path)
+                except OSError:
+                    pass
+                continue
+            files.append((stat.st_mtime, stat.st_size, item.path))
+
+        total = sum(size for _, size, _ in files)
+        limit = LLM_CACHE_MAX_MB * 1024 * 1024
+        for _, size, file_path in sorted(files):
+            if total <= limit:
+                break
+            try:
+                os.remove(file_path)
+                total -= size
+            except OSError:
+                pass
+
+
+def _call_cerebras(model: str, system: Optional[str], prompt: str, temperature: float,
+                   max_tokens: int, api_key: str, timeout: float) -> Tuple[str, Dict]:
+    """One Cerebras chat completion -> (text, usage)."""
+    from departments.logistics.http_engine import http_post
+
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+    response = http_post(
+        CEREBRAS_API_URL,
+        json={"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+        headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+        timeout=timeout
+    )
+    if response.status_code != 200:
+        raise Exception(f"Cerebras API returned status {response.status_code}: {response.text}")
+
+    result = response.json()
+    usage = result.get('usage') or {}
+    return result['choices'][0]['message']['content'], {
+        "prompt_tokens": usage.get('prompt_tokens'),
+        "completion_tokens": usage.get('completion_tokens'),
+    }
+
+
+def _call_groq(model: str, system: Optional[str], prompt: str, temperature: float,
+               max_tokens: int, api_key: str, timeout: float) -> Tuple[str, Dict]:
+    """One Groq chat completion -> (text, usage)."""
+    from groq import Groq
+
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+    response = Groq(api_key=api_key, timeout=timeout).chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+    usage = getattr(response, 'usage', None)
+    return response.choices[0].message.content, {
+        "prompt_tokens": getattr(usage, 'prompt_tokens', None),
+        "completion_tokens": getattr(usage, 'completion_tokens', None),
+    }
+
+
+def _call_gemini(model: str, system: Optional[str], prompt: str, temperature: float,
+                 api_key: str, timeout: float) -> Tuple[str, Dict]:
+    """One Gemini generation -> (text, usage)."""
+    import google.generativeai as genai
+    from google.generativeai.client import get_default_generative_client
+
+    with _gemini_lock:
+        genai.configure(api_key=api_key)
+        try:
+            client = genai.GenerativeModel(model)
+        except Exception:
+            client = genai.GenerativeModel(GEMINI_FALLBACK_MODEL)
+        # The service client is otherwise created on first use from whatever key is configured then
+        client._client = get_default_generative_client()
+    response = client.generate_content(
+        f"{system}\n\n{prompt}" if system else prompt,
+        generation_config={"temperature": temperature},
+        request_options={"timeout": timeout}
+    )
+    usage = getattr(response, 'usage_metadata', None)
+    return response.text, {
+        "prompt_tokens": getattr(usage, 'prompt_token_count', None),
+        "completion_tokens": getattr(usage, 'candidates_token_count', None),
+    }
+
+
+def _record_call(provider: str, model: str, cached: bool, latency: float,
+                 usage: Optional[Dict], error: Optional[str]) -> None:
+    """Append one call to the call log and the in-process stats."""
+    usage = usage or {}
+    record = {
+        "date": datetime.now().isoformat(),
+        "provider": provider,
+        "model": model,
+        "cached": cached,
+        "latency": round(latency, 3),
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "error": (error or "")[:200] or None,
+    }
+    with _log_lock:
+        stats = _stats.setdefault(f"{provider}:{model}", {
+            "calls": 0, "cache_hits": 0, "errors": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "api_seconds": 0.0,
+        })
+        stats["calls"] += 1
+        if cached:
+            stats["cache_hits"] += 1
+        elif error:
+            stats["errors"] += 1
+        else:
+            stats["prompt_tokens"] += record["prompt_tokens"] or 0
+            stats["completion_tokens"] += record["completion_tokens"] or 0
+            stats["api_seconds"] += latency
+        try:
+            with open(LLM_CALL_LOG, 'a') as f:
+                f.write(json.dumps(record) + "\n")
+        except Exception as e:
+            print(f"   ⚠️ Could not log LLM call: {e}")
+
+
+def llm_complete(provider: str, model: str, prompt: str, api_key: str, system: Optional[str] = None,
+                 temperature: float = 0.9, max_tokens: int = 1000, seed: Optional[int] = None,
+                 parse: Optional[Callable[[str], Any]] = None, bypass_cache: bool = False,
+                 timeout: float = 60) -> Any:
+    """
+    Run one LLM request (through the response cache when LLM_CACHE_ENABLED).
+
+    Args:
+        provider: "cerebras", "gemini" or "groq"
+        model: Model name
+        prompt: User prompt
+        api_key: API key for the provider (not part of the cache key)
+        system: Optional system prompt
+        temperature: Sampling temperature
+        max_tokens: Response token limit (Cerebras, Groq)
+        seed: Sample index (e.g. retry attempt); different seeds never share a cached response
+        parse: Optional parser for the raw text; only responses it accepts are cached
+        bypass_cache: Skip the cache for this call even if LLM_CACHE_ENABLED
+        timeout: Request timeout in seconds
+
+    Returns:
+        Parsed response if parse is given, else the stripped response text
+
+    Raises:
+        Exception: If the API call or the parser fails
+    """
+    use_cache = LLM_CACHE_ENABLED and not bypass_cache
+    key = _cache_key(provider, model, system, prompt, temperature, max_tokens, seed)
+
+    if use_cache:
+        started = time.time()
+        entry = _cache_get(key)
+        if entry is not None:
+            try:
+                result = parse(entry["text"]) if parse else entry["text"]
+                _record_call(provider, model, True, time.time() - started, entry.get("usage"), None)
+                print(f"   💾 LLM cache hit ({provider}/{model})")
+                return result
+            except Exception:
+                _cache_drop(key)
+
+    started = time.time()
+    try:
+        if provider == "cerebras":
+            text, usage = _call_cerebras(model, system, prompt, temperature, max_tokens, api_key, timeout)
+        elif provider == "groq":
+            text, usage = _call_groq(model, system, prompt, temperature, max_tokens, api_key, timeout)
+        elif provider == "gemini":
+            text, usage = _call_gemini(model, system, prompt, temperature, api_key, timeout)
+        else:
+            raise Exception(f"Unknown LLM provider: {provider}")
+    except Exception as e:
+        _record_call(provider, model, False, time.time() - started, None, str(e))
+        raise
+    _record_call(provider, model, False, time.time() - started, usage, None)
+
+    text = (text or "").strip()
+    result = parse(text) if parse else text
+    if use_cache:
+        _cache_put(key, {
+            "provider": provider,
+            "model": model,
+            "text": text,
+            "usage": usage,
+            "created": time.time(),
+        })
+    return result
+
+
+def get_llm_metrics() -> Dict[str, Dict]:
+    """
+    Snapshot of per provider/model call statistics for this process.
+
+    Returns:
+        Dict mapping "provider:model" -> {'calls', 'cache_hits', 'errors', 'prompt_tokens',
+        'completion_tokens', 'api_seconds'}
+    """
+    with _log_lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
+
+
+if __name__ == "__main__":
+    # Test the LLM engine
+    print("=" * 60)
+    print("🧪 TESTING LLM ENGINE")
+    print("=" * 60)
+
+    test_key = os.getenv("GROQ_API_KEY")
+    if test_key:
+        for _ in range(2):
+            print(llm_complete("groq", "llama-3.1-8b-instant", "Say 'ok'.", test_key, max_tokens=5))
+        print(get_llm_metrics())
+    else:
+        print("GROQ_API_KEY not set, skipping live test")
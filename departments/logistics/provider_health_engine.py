@@ -0,0 +1,223 @@
+"""
+THE PROVIDER HEALTH ENGINE
+Module: Shared health registry and circuit breaker for external providers.
+
+Each provider (e.g. "video:Pollinations") records:
+- Capability (implemented or not) and which env key it needs
+- Success / failure counts, current failure streak and a latency average
+- Circuit state: closed (normal), open (skipped until a cooldown ends),
+  half-open (one probe call allowed; success closes, failure re-opens longer)
+
+State is persisted to provider_health.json, so a provider that failed in the
+last run is not rediscovered on every scene of the next one. Cascades use
+rank_providers() to try the most reliable, fastest providers first.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+PROVIDER_HEALTH_FILE = "provider_health.json"
+PROVIDER_FAILURE_THRESHOLD = int(os.getenv("PROVIDER_FAILURE_THRESHOLD", "3"))  # Streak that opens the circuit
+PROVIDER_COOLDOWN_SECONDS = float(os.getenv("PROVIDER_COOLDOWN_SECONDS", "900"))
+PROVIDER_COOLDOWN_MAX = float(os.getenv("PROVIDER_COOLDOWN_MAX", "21600"))
+PROVIDER_PROBE_TIMEOUT = 600  # A half-open probe older than this is considered lost
+LATENCY_SMOOTHING = 0.3  # Weight of the newest sample in the latency average
+
+_registry: Dict[str, Dict] = {}
+_loaded = False
+_lock = threading.Lock()
+
+
+def _load_registry() -> None:
+    """Load persisted provider health once per process (caller holds the lock)."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    if not os.path.exists(PROVIDER_HEALTH_FILE):
+        return
+    try:
+        with open(PROVIDER_HEALTH_FILE, 'r') as f:
+            data = json.load(f)
+            if isinstance(data, dict):
+                _registry.update(data)
+    except Exception as e:
+        print(f"   ⚠️ Failed to load provider health: {e}")
+
+
+def _save_registry() -> None:
+    """Persist provider health (atomic replace, caller holds the lock)."""
+    try:
+        temp_path = PROVIDER_HEALTH_FILE + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(_registry, f, indent=2)
+        os.replace(temp_path, PROVIDER_HEALTH_FILE)
+    except Exception as e:
+        print(f"   ⚠️ Could not save provider health: {e}")
+
+
+def _entry(name: str) -> Dict:
+    """Health record for a provider, created on first use (caller holds the lock)."""
+    return _registry.setdefault(name, {
+        "implemented": True,
+        "key_env": None,
+        "successes": 0,
+        "failures": 0,
+        "streak": 0,
+        "latency": None,
+        "state": "closed",
+        "open_until": 0,
+        "cooldown": PROVIDER_COOLDOWN_SECONDS,
+        "probe_started": 0,
+        "last_error": None,
+    })
+
+
+def register_provider(name: str, implemented: bool = True, key_env: Optional[str] = None) -> None:
+    """
+    Declare a provider's capability and the env key it needs.
+
+    Args:
+        name: Provider name (e.g. "video:Vidu")
+        implemented: Whether the integration exists
+        key_env: Name of the required API key env var (None if keyless)
+    """
+    with _lock:
+        _load_registry()
+        entry = _entry(name)
+        entry["implemented"] = implemented
+        entry["key_env"] = key_env
+
+
+def provider_allowed(name: str) -> Tuple[bool, Optional[str]]:
+    """
+    Whether a provider should be called now (claims the half-open probe if due).
+
+    Args:
+        name: Provider name
+
+    Returns:
+        Tuple (allowed, reason skipped)
+    """
+    now = time.time()
+    with _lock:
+        _load_registry()
+        entry = _entry(name)
+
+        if not entry["implemented"]:
+            return False, "not implemented"
+        if entry["key_env"] and not os.getenv(entry["key_env"]):
+            return False, "key missing"
+
+        if entry["state"] == "open":
+            if now < entry["open_until"]:
+                return False, f"circuit open {int((entry['open_until'] - now) / 60) + 1}m"
+            entry["state"] = "half_open"
+            entry["probe_started"] = 0
+
+        if entry["state"] == "half_open":
+            if entry["probe_started"] and now - entry["probe_started"] < PROVIDER_PROBE_TIMEOUT:
+                return False, "probe in flight"
+            entry["probe_started"] = now
+            _save_registry()
+
+        return True, None
+
+
+def record_provider_result(name: str, success: bool, latency: Optional[float] = None,
+                           error: Optional[str] = None) -> None:
+    """
+    Record the outcome of a provider call and update its circuit.
+
+    Args:
+        name: Provider name
+        success: Whether the call produced a usable result
+        latency: Call duration in seconds
+        error: Error message on failure
+    """
+    with _lock:
+        _load_registry()
+        entry = _entry(name)
+
+        if latency is not None:
+            if entry["latency"] is None:
+                entry["latency"] = latency
+            else:
+                entry["latency"] = (1 - LATENCY_SMOOTHING) * entry["latency"] + LATENCY_SMOOTHING * latency
+
+        if success:
+            entry["successes"] += 1
+            entry["streak"] = 0
+            entry["state"] = "closed"
+            entry["cooldown"] = PROVIDER_COOLDOWN_SECONDS
+            entry["last_error"] = None
+        else:
+            entry["failures"] += 1
+            entry["streak"] += 1
+            entry["last_error"] = (error or "")[:200]
+            if entry["state"] == "half_open":
+                # Probe failed: stay away twice as long
+                entry["cooldown"] = min(PROVIDER_COOLDOWN_MAX, entry["cooldown"] * 2)
+                entry["state"] = "open"
+            elif entry["streak"] >= PROVIDER_FAILURE_THRESHOLD:
+                entry["state"] = "open"
+            if entry["state"] == "open":
+                entry["open_until"] = time.time() + entry["cooldown"]
+
+        entry["probe_started"] = 0
+        _save_registry()
+
+
+def rank_providers(names: List[str]) -> List[str]:
+    """
+    Order providers by observed success rate, then latency (ties keep the given order).
+
+    Untried providers start at a neutral 50% success rate.
+
+    Args:
+        names: Provider names in default priority order
+
+    Returns:
+        Provider names, most reliable and fastest first
+    """
+    with _lock:
+        _load_registry()
+        scores = {}
+        for position, name in enumerate(names):
+            entry = _registry.get(name)
+            if entry is None:
+                scores[name] = (-0.5, 0.0, position)
+                continue
+            rate = (entry["successes"] + 1) / (entry["successes"] + entry["failures"] + 2)
+            scores[name] = (-round(rate, 1), entry["latency"] or 0.0, position)
+    return sorted(names, key=lambda name: scores[name])
+
+
+def get_provider_health(prefix: str = "") -> Dict[str, Dict]:
+    """
+    Snapshot of provider health records.
+
+    Args:
+        prefix: Only include providers whose name starts with this (e.g. "video:")
+
+    Returns:
+        Dict mapping provider name -> health record
+    """
+    with _lock:
+        _load_registry()
+        return {name: dict(entry) for name, entry in _registry.items() if name.startswith(prefix)}
+
+
+if __name__ == "__main__":
+    # Test the provider health engine
+    print("=" * 60)
+    print("🧪 TESTING PROVIDER HEALTH ENGINE")
+    print("=" * 60)
+
+    for test_name, test_entry in get_provider_health().items():
+        print(f"{test_name}: {test_entry['state']} "
+              f"ok={test_entry['successes']} fail={test_entry['failures']} latency={test_entry['latency']}")
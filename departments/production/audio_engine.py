@@ -16,10 +16,32 @@ import math
 from typing import List, Dict, Tuple
 from pydub import AudioSegment
 from dotenv import load_dotenv
+from departments.production.timeline_engine import (
+    insert_silence, compile_edl, apply_edl_to_samples, apply_edl_to_subtitles
+)
+from departments.quality_control.qc_engine import (
+    audio_to_array, array_to_audio, silence_cut_edits, stage_segments,
+    VOICE_TARGET_LUFS, MUSIC_TARGET_LUFS, AMBIENCE_TARGET_LUFS
+)
+from departments.intelligence.lexicon_engine import compile_lexicon, match_words
 
 # Load environment variables
 load_dotenv()
 
+# Keyword-to-SFX mapping for horror content (rule-based SFX)
+SFX_KEYWORDS = compile_lexicon({
+    'footstep': ['footstep', 'step', 'walked', 'walking', 'stomped'],
+    'door': ['door', 'knocked', 'knocking', 'opened', 'slammed'],
+    'scream': ['scream', 'shrieked', 'yelled', 'cried'],
+    'impact': ['suddenly', 'crash', 'bang', 'loud', 'exploded'],
+    'tension': ['silence', 'quiet', 'nothing', 'heard']
+})
+
+# Words that usually open the twist (silence-before-twist pause)
+TWIST_KEYWORDS = compile_lexicon({
+    'twist': ['but', 'then', 'revealed', 'discovered', 'found', 'realized', 'was', 'were']
+})
+
 
 def _generate_smart_subtitles(text: str, audio_duration: float) -> List[Dict]:
     """
@@ -498,7 +520,38 @@ def generate_scene_audio(scenes: list, output_dir: str = ".") -> Tuple[list, lis
     return audio_paths, all_subtitles
 
 
-def generate_audio(text: str, output_path: str, voice: str = None, script_text: str = None) -> Tuple[str, List[Dict]]:
+def _finalize_audio(audio_path: str, subtitles: List[Dict], text: str, script_text: str = None,
+                    trim_silence: bool = False) -> Tuple[str, List[Dict]]:
+    """
+    Shared post-processing for every TTS engine: silence trim, subtitle JSON, SFX mix.
+    
+    Args:
+        audio_path: Path to the raw voiceover (.mp3)
+        subtitles: Word timestamps produced by the engine
+        text: Text that was spoken
+        script_text: Original script text (for SFX sentence detection)
+        trim_silence: Remove long pauses and shift word timestamps to match
+        
+    Returns:
+        Tuple of (final_audio_path, subtitles_list)
+    """
+    # Mix with background music (SFX Brain); timing edits come back applied to the subtitles
+    final_audio_path, subtitles = mix_background_music(
+        audio_path, audio_path, subtitles, script_text if script_text else text, trim_silence=trim_silence
+    )
+    
+    # Save subtitles to JSON
+    json_path = audio_path.replace('.mp3', '.json')
+    with open(json_path, 'w') as f:
+        json.dump(subtitles, f, indent=2)
+    
+    print(f"✓ Subtitles: {len(subtitles)} words with timing")
+    
+    return final_audio_path, subtitles
+
+
+def generate_audio(text: str, output_path: str, voice: str = None, script_text: str = None,
+                   trim_silence: bool = False) -> Tuple[str, List[Dict]]:
     """
     Generate audio from clean script text using LEAN CASCADE architecture.
     
@@ -512,6 +565,8 @@ def generate_audio(text: str, output_path: str, voice: str = None, script_text:
         text: Clean script text (no metadata, no stage directions)
         output_path: Path to save audio file (.mp3)
         voice: Voice parameter (optional, used by ElevenLabs)
+        trim_silence: Remove pauses > 500ms; word timestamps are remapped, so this
+            is safe for every engine including Edge-TTS
         
     Returns:
         Tuple of (output_path, subtitles_list)
@@ -534,16 +589,7 @@ def generate_audio(text: str, output_path: str, voice: str = None, script_text:
     # PRIORITY 1: Try ElevenLabs
     try:
         audio_path, subtitles = _generate_audio_elevenlabs(text, output_path)
-        
-        # Save subtitles to JSON
-        json_path = output_path.replace('.mp3', '.json')
-        with open(json_path, 'w') as f:
-            json.dump(subtitles, f, indent=2)
-        
-        # Mix with background music (SFX Brain)
-        final_audio_path = mix_background_music(audio_path, audio_path, subtitles, script_text if script_text else text)
-        
-        return final_audio_path, subtitles
+        return _finalize_audio(audio_path, subtitles, text, script_text, trim_silence)
         
     except Exception as e:
         print(f"   ⚠️ ElevenLabs failed: {e}")
@@ -553,18 +599,7 @@ def generate_audio(text: str, output_path: str, voice: str = None, script_text:
     try:
         # Run async function
         audio_path, subtitles = asyncio.run(_generate_audio_edge_tts_async(text, output_path))
-        
-        # Save subtitles to JSON
-        json_path = output_path.replace('.mp3', '.json')
-        with open(json_path, 'w') as f:
-            json.dump(subtitles, f, indent=2)
-        
-        print(f"✓ Subtitles: {len(subtitles)} words with timing")
-        
-        # Mix with background music (SFX Brain)
-        final_audio_path = mix_background_music(audio_path, audio_path, subtitles, script_text if script_text else text)
-        
-        return final_audio_path, subtitles
+        return _finalize_audio(audio_path, subtitles, text, script_text, trim_silence)
         
     except Exception as e:
         print(f"   ⚠️ Edge-TTS failed: {e}")
@@ -573,18 +608,7 @@ def generate_audio(text: str, output_path: str, voice: str = None, script_text:
     # PRIORITY 3: Use Piper TTS (local, truly unstoppable)
     try:
         audio_path, subtitles = _generate_audio_piper(text, output_path)
-        
-        # Save subtitles to JSON
-        json_path = output_path.replace('.mp3', '.json')
-        with open(json_path, 'w') as f:
-            json.dump(subtitles, f, indent=2)
-        
-        print(f"✓ Subtitles: {len(subtitles)} words with timing")
-        
-        # Mix with background music (SFX Brain)
-        final_audio_path = mix_background_music(audio_path, audio_path, subtitles, script_text if script_text else text)
-        
-        return final_audio_path, subtitles
+        return _finalize_audio(audio_path, subtitles, text, script_text, trim_silence)
         
     except Exception as e:
         raise Exception(f"All audio engines failed (ElevenLabs, Edge-TTS, Piper). Last error: {e}")
@@ -620,7 +644,63 @@ def apply_binaural_panning(audio: AudioSegment, cycle_ms: int = 4000) -> AudioSe
     return sum(chunks)
 
 
-def mix_background_music(voice_file: str, output_file: str, subtitles: List[Dict] = None, script_text: str = None) -> str:
+def _plan_voice_edits(voice_audio: AudioSegment, subtitles: List[Dict], script_text: str,
+                      sfx_dir: str, trim_silence: bool) -> List[Dict]:
+    """
+    Build the timeline EDL for the voiceover (silence cuts + twist pause).
+    
+    Args:
+        voice_audio: Raw voiceover
+        subtitles: Word timestamps in source time
+        script_text: Original script text
+        sfx_dir: SFX directory (twist pause is part of SFX Brain)
+        trim_silence: Cut pauses > 500ms
+        
+    Returns:
+        List of edit dicts in source time
+    """
+    edl = []
+    
+    if trim_silence:
+        edl += silence_cut_edits(audio_to_array(voice_audio), voice_audio.frame_rate, voice_audio.sample_width)
+    
+    # SILENCE BEFORE TWIST (Expert Recommendation: +retention spike)
+    # Find potential "twist" moments (last 5 seconds, words like "but", "then", "revealed")
+    if os.path.exists(sfx_dir) and subtitles and script_text:
+        for index, _, _ in match_words([sub['word'] for sub in subtitles], TWIST_KEYWORDS):
+            sub = subtitles[index]
+            if sub['start'] >= voice_audio.duration_seconds - 5:
+                # 0.5s pause right before the twist word
+                if 0 < sub['start'] < voice_audio.duration_seconds:
+                    edl.append(insert_silence(sub['start'], 0.5))
+                    print(f"   ✓ Added 0.5s silence before twist at {sub['start']:.2f}s")
+                    break  # Only add once
+    
+    return edl
+
+
+def _mute_windows(audio: AudioSegment, windows: List[Tuple[float, float]]) -> AudioSegment:
+    """
+    Zero an AudioSegment inside the given (start, end) windows in seconds.
+    
+    Args:
+        audio: Layer to mute (music, ambience)
+        windows: Output-time windows of inserted silence
+        
+    Returns:
+        AudioSegment with the windows silenced
+    """
+    if not windows:
+        return audio
+    
+    samples = audio_to_array(audio).copy()
+    for start, end in windows:
+        samples[int(start * audio.frame_rate):int(end * audio.frame_rate)] = 0
+    return array_to_audio(samples, audio)
+
+
+def mix_background_music(voice_file: str, output_file: str, subtitles: List[Dict] = None, script_text: str = None,
+                         trim_silence: bool = False) -> Tuple[str, List[Dict]]:
     """
     Mix background music with voiceover audio and sound effects (SFX Brain).
     
@@ -629,25 +709,53 @@ def mix_background_music(voice_file: str, output_file: str, subtitles: List[Dict
     2. Pacing: Pop/click at start of each new sentence (-30dB)
     3. Vibe: Background music as usual
     
+    Timing edits (silence cuts, twist pause) go through one EDL that is applied
+    once to the voice buffer and once to the subtitles, so words stay in sync.
+    
     Args:
         voice_file: Path to voiceover audio file
         output_file: Path to save mixed audio file
         subtitles: List of subtitle dicts (for sentence detection)
         script_text: Original script text (for sentence boundary detection)
+        trim_silence: Cut pauses > 500ms from the voiceover
         
     Returns:
-        Path to the mixed audio file (or original voice_file if no music available)
+        Tuple of (path to the mixed audio file, subtitles in the mixed audio's timing)
+        Falls back to (voice_file, original subtitles) on failure.
     """
     music_dir = "assets/music"
     sfx_dir = "assets/sfx"
+    source_subtitles = subtitles
     
     # Load voiceover
     try:
         voice_audio = AudioSegment.from_mp3(voice_file)
-        voice_duration = len(voice_audio)
     except Exception as e:
         print(f"   ⚠️ Failed to load voiceover: {e}")
-        return voice_file
+        return voice_file, source_subtitles
+    
+    # TIMELINE: apply all timing edits in one pass before layering
+    insert_windows = []
+    try:
+        edl = _plan_voice_edits(voice_audio, subtitles, script_text, sfx_dir, trim_silence)
+        if edl:
+            source_duration = voice_audio.duration_seconds
+            _, insert_windows = compile_edl(edl, source_duration)
+            voice_audio = array_to_audio(
+                apply_edl_to_samples(audio_to_array(voice_audio), voice_audio.frame_rate, edl),
+                voice_audio
+            )
+            if subtitles:
+                subtitles = apply_edl_to_subtitles(subtitles, edl, source_duration)
+            print(f"   ✓ Timeline: {len(edl)} edits ({source_duration:.2f}s → {voice_audio.duration_seconds:.2f}s)")
+    except Exception as e:
+        print(f"   ⚠️ Failed to apply timeline edits: {e}")
+        insert_windows = []
+    
+    voice_duration = len(voice_audio)
+    
+    # Beds are gain-staged to LUFS targets and summed once at export
+    bed_layers = []
     
     # Mix background music if available
     if os.path.exists(music_dir):
@@ -670,16 +778,9 @@ def mix_background_music(voice_file: str, output_file: str, subtitles: List[Dict
                     music_audio = music_audio * num_loops
                 
                 music_audio = music_audio[:voice_duration]
-                # OPTIMIZED VOLUME MIX (expert recommendation):
-                # Music: -22 to -26dB (was -18dB) - lower for better voice clarity
-                # Voice: -3dB boost for prominence
-                music_volume = random.randint(-26, -22)  # Randomize between -22 and -26dB
-                music_audio = music_audio + music_volume
-                
-                # Boost voice slightly for prominence
-                voice_audio = voice_audio + 3  # +3dB boost
-                
-                voice_audio = music_audio.overlay(voice_audio)
+                music_audio = _mute_windows(music_audio, insert_windows)
+                # LOUDNESS MIX: music sits 22 LU under the voice (was a random -22..-26dB gain)
+                bed_layers.append((music_audio, MUSIC_TARGET_LUFS))
             except Exception as e:
                 print(f"   ⚠️ Failed to mix music: {e}")
     
@@ -724,15 +825,6 @@ def mix_background_music(voice_file: str, output_file: str, subtitles: List[Dict
         
         # 2. RULE-BASED SFX (Expert Recommendation): Keyword-triggered sound effects
         if subtitles and script_text:
-            # Define keyword-to-SFX mapping for horror content
-            keyword_sfx_map = {
-                'footstep': ['footstep', 'step', 'walked', 'walking', 'stomped'],
-                'door': ['door', 'knocked', 'knocking', 'opened', 'slammed'],
-                'scream': ['scream', 'shrieked', 'yelled', 'cried'],
-                'impact': ['suddenly', 'crash', 'bang', 'loud', 'exploded'],
-                'tension': ['silence', 'quiet', 'nothing', 'heard']
-            }
-            
             # SFX directories
             sfx_mapping = {
                 'footstep': os.path.join(sfx_dir, "footsteps"),
@@ -742,47 +834,29 @@ def mix_background_music(voice_file: str, output_file: str, subtitles: List[Dict
                 'tension': os.path.join(sfx_dir, "tension")
             }
             
-            script_lower = script_text.lower()
-            
-            # Add keyword-triggered SFX
-            for sfx_type, keywords in keyword_sfx_map.items():
-                for keyword in keywords:
-                    if keyword in script_lower:
-                        # Find word position in subtitles
-                        for sub in subtitles:
-                            if sub['word'].lower() == keyword:
-                                sfx_dir_path = sfx_mapping.get(sfx_type)
-                                if sfx_dir_path and os.path.exists(sfx_dir_path):
-                                    sfx_files = [f for f in os.listdir(sfx_dir_path) if f.endswith(('.mp3', '.wav'))]
-                                    if sfx_files:
-                                        try:
-                                            sfx_path = os.path.join(sfx_dir_path, random.choice(sfx_files))
-                                            sfx_audio = AudioSegment.from_file(sfx_path)
-                                            sfx_audio = sfx_audio - 16  # -16dB (audible but not overwhelming)
-                                            sfx_position_ms = int(sub['start'] * 1000)
-                                            if sfx_position_ms < voice_duration:
-                                                voice_audio = voice_audio.overlay(sfx_audio, position=sfx_position_ms)
-                                                print(f"   ✓ SFX: {sfx_type} at {sub['start']:.2f}s (keyword: '{keyword}')")
-                                                break  # Only add once per keyword type
-                                        except Exception as e:
-                                            pass  # Silent fail for missing SFX
+            # Add keyword-triggered SFX (first spoken occurrence of each keyword, one scan)
+            placed_keywords = set()
+            for index, sfx_type, keyword in match_words([sub['word'] for sub in subtitles], SFX_KEYWORDS):
+                if keyword in placed_keywords:
+                    continue
+                placed_keywords.add(keyword)
+                sub = subtitles[index]
+                sfx_dir_path = sfx_mapping.get(sfx_type)
+                if sfx_dir_path and os.path.exists(sfx_dir_path):
+                    sfx_files = [f for f in os.listdir(sfx_dir_path) if f.endswith(('.mp3', '.wav'))]
+                    if sfx_files:
+                        try:
+                            sfx_path = os.path.join(sfx_dir_path, random.choice(sfx_files))
+                            sfx_audio = AudioSegment.from_file(sfx_path)
+                            sfx_audio = sfx_audio - 16  # -16dB (audible but not overwhelming)
+                            sfx_position_ms = int(sub['start'] * 1000)
+                            if sfx_position_ms < voice_duration:
+                                voice_audio = voice_audio.overlay(sfx_audio, position=sfx_position_ms)
+                                print(f"   ✓ SFX: {sfx_type} at {sub['start']:.2f}s (keyword: '{keyword}')")
+                        except Exception as e:
+                            pass  # Silent fail for missing SFX
             
-            # 3. SILENCE BEFORE TWIST (Expert Recommendation: +retention spike)
-            # Find potential "twist" moments (last 5 seconds, words like "but", "then", "revealed")
-            twist_keywords = ['but', 'then', 'revealed', 'discovered', 'found', 'realized', 'was', 'were']
-            for sub in subtitles:
-                word = sub['word'].lower().strip('.,!?')
-                if word in twist_keywords and sub['start'] >= voice_duration / 1000 - 5:
-                    # Add 0.5s silence before twist word
-                    silence_ms = int((sub['start'] - 0.5) * 1000)
-                    if silence_ms > 0 and silence_ms < voice_duration:
-                        silence = AudioSegment.silent(duration=500)  # 0.5s silence
-                        # Insert silence by splitting audio and inserting
-                        before = voice_audio[:silence_ms]
-                        after = voice_audio[silence_ms:]
-                        voice_audio = before + silence + after
-                        print(f"   ✓ Added 0.5s silence before twist at {sub['start']:.2f}s")
-                        break  # Only add once
+            # 3. SILENCE BEFORE TWIST: planned up front as a timeline insert (see _plan_voice_edits)
         
         # 4. THE PACING: Pop/click at start of each new sentence (keep existing logic)
         if subtitles and script_text:
@@ -850,25 +924,36 @@ def mix_background_music(voice_file: str, output_file: str, subtitles: List[Dict
                     if len(amb_audio) < voice_duration:
                         amb_audio = amb_audio * (voice_duration // len(amb_audio) + 1)
                     amb_audio = amb_audio[:voice_duration]
+                    amb_audio = _mute_windows(amb_audio, insert_windows)
                     
                     # Apply creepy 3D panning oscillation
                     amb_audio = apply_binaural_panning(amb_audio, cycle_ms=5000)
                     
-                    # Very quiet background layer: -28dB
-                    amb_audio = amb_audio - 28
-                    voice_audio = voice_audio.overlay(amb_audio)
+                    # Very quiet background layer (was -28dB gain)
+                    bed_layers.append((amb_audio, AMBIENCE_TARGET_LUFS))
                     print(f"   ✓ 3D Ambience added (Binaural panning cycle: 5s)")
                 except Exception as e:
                     print(f"   ⚠️ Failed to add Binaural Ambience: {e}")
     
+    # GAIN STAGING: voice bus (with SFX), music and ambience in one multiply-accumulate
+    try:
+        voice_audio = stage_segments(
+            [voice_audio] + [layer for layer, _ in bed_layers],
+            [VOICE_TARGET_LUFS] + [target for _, target in bed_layers]
+        )
+    except Exception as e:
+        print(f"   ⚠️ Failed to gain-stage mix: {e}")
+        for layer, _ in bed_layers:
+            voice_audio = voice_audio.overlay(layer - 24)
+    
     # Export final mixed audio
     try:
         voice_audio.export(output_file, format="mp3", bitrate="192k")
         print(f"✓ Mixed audio with SFX Brain saved: {output_file}")
-        return output_file
+        return output_file, subtitles
     except Exception as e:
         print(f"   ⚠️ Failed to export mixed audio: {e}")
-        return voice_file
+        return voice_file, source_subtitles
 
 
 if __name__ == "__main__":
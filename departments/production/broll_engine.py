@@ -0,0 +1,300 @@
+"""
+THE B-ROLL ENGINE
+Module: Local, indexed B-roll library for offline scene footage.
+
+assets/broll holds pre-normalized 1080x1920 clips. Each clip is indexed once
+(index.json next to the clips) with:
+- Tags (from a "<clip>.txt" sidecar, else the words of the file name)
+- Duration, size and keyframe offsets (read from packet headers, no decoding)
+
+A scene lookup matches visual_prompt words against every tag in one regex pass
+(lexicon_engine), picks an unused window from the footage log, snaps it to the
+keyframe before it and cuts it with stream copy - no network, no re-encode.
+"""
+
+import os
+import json
+import threading
+import subprocess
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+from config.paths import BROLL_DIR
+from departments.intelligence.lexicon_engine import compile_lexicon, hits_by_category
+from departments.logistics.footage_engine import is_range_used, pick_free_window, record_used, used_seconds
+
+
+BROLL_INDEX = os.path.join(BROLL_DIR, "index.json")
+BROLL_ENABLED = os.getenv("BROLL_ENABLED", "true").lower() == "true"
+BROLL_MIN_MATCHES = int(os.getenv("BROLL_MIN_MATCHES", "1"))  # Tags a clip must share with the prompt
+BROLL_EXTENSIONS = ('.mp4', '.mov', '.mkv')
+BROLL_SIZE = (1080, 1920)
+BROLL_WINDOW_DRAWS = 3  # Free windows tried per clip before moving to the next match
+
+# Words that never make useful tags
+TAG_STOPWORDS = {
+    "a", "an", "and", "the", "of", "in", "on", "at", "with", "to", "for", "from", "by",
+    "vertical", "clip", "broll", "footage", "hd", "4k", "1080p", "no", "copyright",
+}
+
+_index: Dict[str, Dict] = {}
+_lexicon: Optional[Dict] = None
+_loaded = False
+_scanned = False
+_lock = threading.Lock()
+
+
+def _tags_from_text(text: str) -> List[str]:
+    """Lowercase tag words from a file name or sidecar (digits and stopwords dropped)."""
+    words = "".join(c if c.isalnum() else " " for c in text.lower()).split()
+    return list(dict.fromkeys(w for w in words if w not in TAG_STOPWORDS and not w.isdigit()))
+
+
+def _probe_keyframes(path: str) -> List[float]:
+    """
+    Keyframe timestamps of a clip's video stream, from packet headers only.
+
+    Args:
+        path: Path to a video file
+
+    Returns:
+        Sorted keyframe times in seconds
+
+    Raises:
+        Exception: If ffprobe fails
+    """
+    cmd = [
+        'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0',
+        path
+    ]
+    result = subprocess.run(cmd, capture_output=True, timeout=120)
+    if result.returncode != 0:
+        raise Exception(f"ffprobe failed: {result.stderr.decode(errors='ignore')[:200]}")
+
+    keyframes = []
+    for line in result.stdout.decode(errors='ignore').splitlines():
+        pts_time, _, flags = line.partition(',')
+        if 'K' in flags:
+            try:
+                keyframes.append(float(pts_time))
+            except ValueError:
+                continue
+    return sorted(keyframes)
+
+
+def _index_clip(path: str) -> Optional[Dict]:
+    """
+    Index entry for one clip (None if it is not a normalized 1080x1920 clip).
+
+    Args:
+        path: Path to the clip
+
+    Returns:
+        Dict with 'tags', 'duration', 'keyframes', 'size', 'mtime'
+    """
+    from departments.production.probe_engine import probe_media
+
+    info = probe_media(path)
+    if (info.get('width'), info.get('height')) != BROLL_SIZE or not info.get('duration'):
+        print(f"   ⚠️ B-roll {os.path.basename(path)} is not a {BROLL_SIZE[0]}x{BROLL_SIZE[1]} clip, skipping")
+        return None
+
+    stem = os.path.splitext(path)[0]
+    sidecar = stem + ".txt"
+    if os.path.exists(sidecar):
+        with open(sidecar, 'r') as f:
+            tags = _tags_from_text(f.read())
+    else:
+        tags = _tags_from_text(os.path.basename(stem))
+
+    stat = os.stat(path)
+    return {
+        "tags": tags,
+        "duration": info["duration"],
+        "keyframes": _probe_keyframes(path) or [0.0],
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+    }
+
+
+def build_broll_index() -> Dict[str, Dict]:
+    """
+    Scan the B-roll directory and (re)index new or changed clips.
+
+    Unchanged clips keep their entries, so a rescan only probes what changed.
+
+    Returns:
+        Dict mapping clip file name -> index entry
+    """
+    global _lexicon, _scanned
+    with _lock:
+        _load_index()
+        _scanned = True
+        present = set()
+        changed = False
+        for name in sorted(os.listdir(BROLL_DIR)):
+            if not name.lower().endswith(BROLL_EXTENSIONS):
+                continue
+            path = os.path.join(BROLL_DIR, name)
+            present.add(name)
+            stat = os.stat(path)
+            entry = _index.get(name)
+            if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+                continue
+            try:
+                entry = _index_clip(path)
+            except Exception as e:
+                print(f"   ⚠️ Could not index B-roll {name}: {e}")
+                entry = None
+            if entry:
+                _index[name] = entry
+            else:
+                _index.pop(name, None)
+            changed = True
+
+        for name in list(_index):
+            if name not in present:
+                del _index[name]
+                changed = True
+
+        if changed:
+            _save_index()
+            _lexicon = None
+        return dict(_index)
+
+
+def _load_index() -> None:
+    """Load the on-disk index once per process (caller holds the lock)."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    if not os.path.exists(BROLL_INDEX):
+        return
+    try:
+        with open(BROLL_INDEX, 'r') as f:
+            data = json.load(f)
+            if isinstance(data, dict):
+                _index.update(data)
+    except Exception as e:
+        print(f"   ⚠️ Failed to load B-roll index: {e}")
+
+
+def _save_index() -> None:
+    """Persist the index (atomic replace, caller holds the lock)."""
+    try:
+        temp_path = BROLL_INDEX + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(_index, f)
+        os.replace(temp_path, BROLL_INDEX)
+    except Exception as e:
+        print(f"   ⚠️ Could not save B-roll index: {e}")
+
+
+def _get_lexicon() -> Dict:
+    """Tag lexicon over all indexed clips (one category per clip), compiled once per index change."""
+    global _lexicon
+    with _lock:
+        _load_index()
+        if _lexicon is None:
+            _lexicon = compile_lexicon({name: entry["tags"] for name, entry in _index.items()}, match_plurals=True)
+        return _lexicon
+
+
+def find_broll(prompt: str, duration: float) -> Optional[Dict]:
+    """
+    Best local clip for a visual prompt with an unused, keyframe-aligned window.
+
+    Clips are ranked by matched tags, then by how little of them has been used.
+
+    Args:
+        prompt: Visual prompt of the scene
+        duration: Needed footage length in seconds
+
+    Returns:
+        Dict with 'name', 'path', 'start', 'end', 'tags', or None if nothing fits
+    """
+    if not _scanned:
+        # First lookup in this process: pick up clips added since the last run (stat-only when unchanged)
+        build_broll_index()
+
+    matches = hits_by_category(prompt, _get_lexicon())
+    if not matches:
+        return None
+
+    with _lock:
+        candidates = [
+            (name, _index[name], tags) for name, tags in matches.items()
+            if name in _index and len(tags) >= BROLL_MIN_MATCHES and _index[name]["duration"] >= duration
+        ]
+    candidates.sort(key=lambda c: (-len(c[2]), used_seconds(f"broll:{c[0]}") / c[1]["duration"]))
+
+    for name, entry, tags in candidates:
+        video_id = f"broll:{name}"
+        keyframes = entry["keyframes"]
+        for _ in range(BROLL_WINDOW_DRAWS):
+            start = pick_free_window(video_id, entry["duration"], duration)
+            if start is None:
+                break
+            # Stream copy cuts on keyframes: the one at/before the window, else the next one,
+            # as long as the snapped window still stays clear of used footage
+            index = bisect_right(keyframes, start)
+            for snapped in keyframes[max(0, index - 1):index + 1]:
+                if snapped + duration <= entry["duration"] and not is_range_used(video_id, snapped, snapped + duration):
+                    return {
+                        "name": name,
+                        "path": os.path.join(BROLL_DIR, name),
+                        "start": snapped,
+                        "end": snapped + duration,
+                        "tags": tags,
+                    }
+    return None
+
+
+def get_broll_clip(prompt: str, duration: float, output_path: str) -> Optional[str]:
+    """
+    Cut scene footage from the local B-roll library (stream copy, no audio).
+
+    Args:
+        prompt: Visual prompt of the scene
+        duration: Desired clip duration in seconds
+        output_path: Path to save the clip (.mp4)
+
+    Returns:
+        Path to the clip, or None if the library has nothing suitable
+    """
+    if not BROLL_ENABLED:
+        return None
+
+    match = find_broll(prompt, duration)
+    if not match:
+        return None
+
+    print(f"   🎞️ Local B-roll: {match['name']} [{match['start']:.1f}s] (tags: {', '.join(match['tags'])})")
+    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+    result = subprocess.run([
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-ss', f"{match['start']:.3f}", '-i', match['path'],
+        '-t', f"{match['end'] - match['start']:.3f}",
+        '-map', '0:v:0', '-an', '-c', 'copy', '-avoid_negative_ts', 'make_zero',
+        output_path,
+    ], capture_output=True, timeout=120)
+    if result.returncode != 0 or not os.path.exists(output_path):
+        print(f"   ⚠️ B-roll cut failed: {result.stderr.decode(errors='ignore')[-200:]}")
+        return None
+
+    record_used(f"broll:{match['name']}", match['start'], match['end'])
+    return output_path
+
+
+if __name__ == "__main__":
+    # Test the B-roll engine
+    print("=" * 60)
+    print("🧪 TESTING B-ROLL ENGINE")
+    print("=" * 60)
+
+    test_index = build_broll_index()
+    print(f"Indexed {len(test_index)} clips in {BROLL_DIR}")
+    test_prompt = "Dark abandoned hallway, flickering lights, fog"
+    print(f"Best match for '{test_prompt}': {find_broll(test_prompt, 5.0)}")
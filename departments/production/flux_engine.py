@@ -6,9 +6,17 @@ Uses Cloudflare's @cf/black-forest-labs/flux-1-schnell model for fast, high-res
 """
 
 import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import threading
 import requests
-from typing import Optional
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
+from config.paths import FLUX_CACHE_DIR
+from departments.logistics.http_engine import http_get, http_post
 
 # Load environment variables
 load_dotenv()
@@ -17,6 +25,230 @@ load_dotenv()
 CLOUDFLARE_ACCOUNT_ID = os.getenv("CLOUDFLARE_ACCOUNT_ID")
 CLOUDFLARE_API_TOKEN = os.getenv("CLOUDFLARE_API_TOKEN")
 
+# Generation parameters (part of the cache key)
+FLUX_NUM_STEPS = 4  # Fast generation (schnell model)
+FLUX_GUIDANCE = 7.5  # Guidance scale
+
+# Prompt-keyed image cache (re-runs of a storyboard reuse their images)
+FLUX_CACHE_INDEX = os.path.join(FLUX_CACHE_DIR, "index.json")
+FLUX_CACHE_MAX_MB = float(os.getenv("FLUX_CACHE_MAX_MB", "200"))
+
+# Scene batches: parallel requests, but never faster than the account's rate limit
+FLUX_MAX_CONCURRENCY = int(os.getenv("FLUX_MAX_CONCURRENCY", "3"))
+FLUX_REQUESTS_PER_MINUTE = float(os.getenv("FLUX_REQUESTS_PER_MINUTE", "30"))
+
+# PROMPT INJECTION: Inject cinematic keywords into every prompt
+INJECTION_KEYWORDS = "Cinematic film still, 35mm photography, golden hour lighting, depth of field, hyper-realistic, 8k, dark mood, slight grain"
+
+# STRONG SANITIZATION: Remove potentially problematic words while keeping it edgy
+# Aggressive replacements for safety (but keep edgy terms that are acceptable)
+SANITIZE_REPLACEMENTS = {
+    # Violence/aggression terms
+    'kill': 'neutralize', 'murder': 'eliminate', 'death': 'end', 'die': 'cease',
+    'blood': 'crimson', 'violence': 'intensity', 'weapon': 'tool', 'gun': 'device',
+    'knife': 'blade', 'attack': 'confront', 'fight': 'struggle', 'war': 'conflict',
+    
+    # Explicit sexual terms
+    'nude': 'unclothed', 'naked': 'bare', 'sex': 'intimacy', 'sexual': 'intimate',
+    'porn': 'explicit', 'erotic': 'sensual', 'orgasm': 'climax',
+    
+    # Extreme manipulation terms (keep edgy but safe)
+    'evil': 'mysterious', 'sly': 'clever', 'manipulate': 'influence',
+    'trap': 'capture', 'control': 'guide', 'dominate': 'lead',
+    'haunt': 'linger', 'shadow': 'silhouette', 'lurking': 'present',
+    'creeping': 'subtle', 'hack': 'analyze', 'exploit': 'utilize',
+    'trick': 'technique', 'scam': 'strategy', 'fool': 'influence',
+    'deceive': 'persuade', 'betray': 'mislead', 'destroy': 'disrupt',
+    
+    # Keep "dark" but make it safer context
+    'dark': 'moody',  # Keep moody for edgy aesthetic
+    
+    # Disturbing imagery
+    'distorted': 'abstract', 'twisted': 'curved', 'broken': 'fragmented',
+    'torture': 'pressure', 'pain': 'discomfort', 'suffering': 'struggle',
+    
+    # Drug references
+    'drug': 'substance', 'cocaine': 'stimulant', 'heroin': 'opiate',
+    'weed': 'cannabis', 'marijuana': 'cannabis',
+    
+    # Hate speech / discrimination
+    'hate': 'dislike', 'racist': 'biased', 'sexist': 'prejudiced',
+}
+
+
+def _trie_pattern(terms) -> str:
+    """
+    Regex matching any of the terms, factored into a prefix trie.
+    
+    Shared prefixes are tested once ("d(?:ark|eath|rug)"), and optional tails are
+    greedy, so the longest term wins where terms overlap ("sexual" over "sex").
+    
+    Args:
+        terms: Literal terms
+        
+    Returns:
+        Regex pattern string
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def _build(node):
+        branches = [re.escape(char) + _build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+    
+    return _build(trie)
+
+
+# One pass over the prompt instead of one str.replace per term
+_SANITIZE_REGEX = re.compile(_trie_pattern(SANITIZE_REPLACEMENTS))
+# Remove excessive punctuation that might trigger filters
+_REPEATED_PUNCTUATION = re.compile(r'([!?])\1+')
+
+_cache_index: Dict[str, Dict] = {}
+_cache_loaded = False
+_cache_lock = threading.Lock()
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+def build_flux_prompt(prompt: str) -> str:
+    """
+    Full Flux prompt for a scene: cinematic injection, sanitization, composition suffix.
+    
+    Args:
+        prompt: Visual prompt of the scene
+        
+    Returns:
+        Enhanced, sanitized prompt
+    """
+    # Combine original prompt with injection keywords
+    combined_prompt = f"{prompt}, {INJECTION_KEYWORDS}".lower()
+    
+    sanitized_prompt = _SANITIZE_REGEX.sub(lambda match: SANITIZE_REPLACEMENTS[match.group(0)], combined_prompt)
+    sanitized_prompt = _REPEATED_PUNCTUATION.sub(r'\1', sanitized_prompt)
+    
+    # Capitalize first letter
+    sanitized_prompt = sanitized_prompt.capitalize()
+    
+    # Prepare enhanced prompt with vertical composition requirement
+    return f"{sanitized_prompt}, Vertical composition, 1080x1920 aspect ratio, high quality, detailed, professional, psychological thriller aesthetic, abstract art, conceptual visualization"
+
+
+def _wait_for_rate_limit() -> None:
+    """Block until the next Flux request may start (spaced by FLUX_REQUESTS_PER_MINUTE)."""
+    global _next_request_at
+    if FLUX_REQUESTS_PER_MINUTE <= 0:
+        return
+    with _rate_lock:
+        now = time.monotonic()
+        start_at = max(now, _next_request_at)
+        _next_request_at = start_at + 60.0 / FLUX_REQUESTS_PER_MINUTE
+    if start_at > now:
+        time.sleep(start_at - now)
+
+
+def _cache_key(enhanced_prompt: str, width: int, height: int, steps: int, guidance: float) -> str:
+    """Cache key for one generation request."""
+    return hashlib.sha1(json.dumps([enhanced_prompt, width, height, steps, guidance]).encode()).hexdigest()[:24]
+
+
+def _cache_path(key: str) -> str:
+    """Path of a cached image."""
+    return os.path.join(FLUX_CACHE_DIR, f"{key}.jpg")
+
+
+def _load_cache_index() -> None:
+    """Load the on-disk cache index once per process (caller holds the lock)."""
+    global _cache_loaded
+    if _cache_loaded:
+        return
+    _cache_loaded = True
+    if not os.path.exists(FLUX_CACHE_INDEX):
+        return
+    try:
+        with open(FLUX_CACHE_INDEX, 'r') as f:
+            data = json.load(f)
+            if isinstance(data, dict):
+                _cache_index.update(data)
+    except Exception as e:
+        print(f"   ⚠️ Failed to load Flux cache index: {e}")
+
+
+def _save_cache_index() -> None:
+    """Persist the cache index (atomic replace, caller holds the lock)."""
+    try:
+        temp_path = FLUX_CACHE_INDEX + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(_cache_index, f)
+        os.replace(temp_path, FLUX_CACHE_INDEX)
+    except Exception as e:
+        print(f"   ⚠️ Could not save Flux cache index: {e}")
+
+
+def _cache_get(key: str, output_path: str) -> bool:
+    """
+    Copy a cached image to output_path (and mark it recently used).
+    
+    Args:
+        key: Cache key from _cache_key()
+        output_path: Where the scene image is expected
+        
+    Returns:
+        True on a cache hit
+    """
+    with _cache_lock:
+        _load_cache_index()
+        entry = _cache_index.get(key)
+        if entry is None or not os.path.exists(_cache_path(key)):
+            return False
+        entry["last_used"] = time.time()
+        _save_cache_index()
+    
+    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+    shutil.copyfile(_cache_path(key), output_path)
+    return True
+
+
+def _cache_put(key: str, image_path: str) -> None:
+    """
+    Store a generated image and evict least-recently-used entries over FLUX_CACHE_MAX_MB.
+    
+    Args:
+        key: Cache key from _cache_key()
+        image_path: Generated image file
+    """
+    try:
+        temp_path = f"{_cache_path(key)}.{threading.get_ident()}.tmp"
+        shutil.copyfile(image_path, temp_path)
+        os.replace(temp_path, _cache_path(key))
+    except Exception as e:
+        print(f"      ⚠️ Could not cache Flux image: {e}")
+        return
+    
+    with _cache_lock:
+        _load_cache_index()
+        _cache_index[key] = {"bytes": os.path.getsize(_cache_path(key)), "last_used": time.time()}
+        
+        limit = FLUX_CACHE_MAX_MB * 1024 * 1024
+        total = sum(entry["bytes"] for entry in _cache_index.values())
+        for old_key, entry in sorted(_cache_index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= limit or old_key == key:
+                break
+            try:
+                os.remove(_cache_path(old_key))
+            except OSError:
+                pass
+            total -= entry["bytes"]
+            del _cache_index[old_key]
+        _save_cache_index()
+
 
 def generate_scene_image(prompt: str, output_path: str, width: int = 1080, height: int = 1920) -> str:
     """
@@ -24,6 +256,7 @@ def generate_scene_image(prompt: str, output_path: str, width: int = 1080, heigh
     
     Uses Cloudflare Workers AI API with @cf/black-forest-labs/flux-1-schnell model.
     Generates images optimized for YouTube Shorts (1080x1920 vertical format).
+    Served from the prompt-keyed cache when the same request was generated before.
     
     Args:
         prompt: Visual prompt for image generation (should include "hyper-realistic, 8k")
@@ -37,6 +270,14 @@ def generate_scene_image(prompt: str, output_path: str, width: int = 1080, heigh
     Raises:
         Exception: If Cloudflare API fails or credentials are missing
     """
+    enhanced_prompt = build_flux_prompt(prompt)
+    
+    # Check the prompt-keyed cache before paying for a generation
+    cache_key = _cache_key(enhanced_prompt, width, height, FLUX_NUM_STEPS, FLUX_GUIDANCE)
+    if _cache_get(cache_key, output_path):
+        print(f"   ✓ Image from cache: {output_path}")
+        return output_path
+    
     if not CLOUDFLARE_ACCOUNT_ID or not CLOUDFLARE_API_TOKEN:
         raise Exception("CLOUDFLARE_ACCOUNT_ID and CLOUDFLARE_API_TOKEN must be set in .env")
     
@@ -52,76 +293,17 @@ def generate_scene_image(prompt: str, output_path: str, width: int = 1080, heigh
             "Content-Type": "application/json"
         }
         
-        # PROMPT INJECTION: Inject cinematic keywords into every prompt
-        injection_keywords = "Cinematic film still, 35mm photography, golden hour lighting, depth of field, hyper-realistic, 8k, dark mood, slight grain"
-        
-        # Combine original prompt with injection keywords
-        combined_prompt = f"{prompt}, {injection_keywords}"
-        
-        # STRONG SANITIZATION: Remove potentially problematic words while keeping it edgy
-        # More comprehensive replacement list to avoid Cloudflare bans
-        sanitized_prompt = combined_prompt.lower()
-        
-        # Aggressive replacements for safety (but keep edgy terms that are acceptable)
-        replacements = {
-            # Violence/aggression terms
-            'kill': 'neutralize', 'murder': 'eliminate', 'death': 'end', 'die': 'cease',
-            'blood': 'crimson', 'violence': 'intensity', 'weapon': 'tool', 'gun': 'device',
-            'knife': 'blade', 'attack': 'confront', 'fight': 'struggle', 'war': 'conflict',
-            
-            # Explicit sexual terms
-            'nude': 'unclothed', 'naked': 'bare', 'sex': 'intimacy', 'sexual': 'intimate',
-            'porn': 'explicit', 'erotic': 'sensual', 'orgasm': 'climax',
-            
-            # Extreme manipulation terms (keep edgy but safe)
-            'evil': 'mysterious', 'sly': 'clever', 'manipulate': 'influence',
-            'trap': 'capture', 'control': 'guide', 'dominate': 'lead',
-            'haunt': 'linger', 'shadow': 'silhouette', 'lurking': 'present',
-            'creeping': 'subtle', 'hack': 'analyze', 'exploit': 'utilize',
-            'trick': 'technique', 'scam': 'strategy', 'fool': 'influence',
-            'deceive': 'persuade', 'betray': 'mislead', 'destroy': 'disrupt',
-            
-            # Keep "dark" but make it safer context
-            'dark': 'moody',  # Keep moody for edgy aesthetic
-            
-            # Disturbing imagery
-            'distorted': 'abstract', 'twisted': 'curved', 'broken': 'fragmented',
-            'torture': 'pressure', 'pain': 'discomfort', 'suffering': 'struggle',
-            
-            # Drug references
-            'drug': 'substance', 'cocaine': 'stimulant', 'heroin': 'opiate',
-            'weed': 'cannabis', 'marijuana': 'cannabis',
-            
-            # Hate speech / discrimination
-            'hate': 'dislike', 'racist': 'biased', 'sexist': 'prejudiced',
-        }
-        
-        # Apply replacements
-        for old, new in replacements.items():
-            sanitized_prompt = sanitized_prompt.replace(old, new)
-        
-        # Remove any remaining problematic patterns
-        import re
-        # Remove excessive punctuation that might trigger filters
-        sanitized_prompt = re.sub(r'[!]{2,}', '!', sanitized_prompt)
-        sanitized_prompt = re.sub(r'[?]{2,}', '?', sanitized_prompt)
-        
-        # Capitalize first letter
-        sanitized_prompt = sanitized_prompt.capitalize()
-        
-        # Prepare enhanced prompt with vertical composition requirement
-        enhanced_prompt = f"{sanitized_prompt}, Vertical composition, 1080x1920 aspect ratio, high quality, detailed, professional, psychological thriller aesthetic, abstract art, conceptual visualization"
-        
         payload = {
             "prompt": enhanced_prompt,
-            "num_steps": 4,  # Fast generation (schnell model)
-            "guidance": 7.5,  # Guidance scale
+            "num_steps": FLUX_NUM_STEPS,
+            "guidance": FLUX_GUIDANCE,
             "width": width,
             "height": height
         }
         
         # Make API request
-        response = requests.post(api_url, json=payload, headers=headers, timeout=120)
+        _wait_for_rate_limit()
+        response = http_post(api_url, json=payload, headers=headers, timeout=120)
         
         if response.status_code != 200:
             error_text = response.text
@@ -137,18 +319,19 @@ def generate_scene_image(prompt: str, output_path: str, width: int = 1080, heigh
                 ]
                 safe_prompt = random.choice(safe_prompts)
                 payload["prompt"] = safe_prompt
-                response = requests.post(api_url, json=payload, headers=headers, timeout=120)
+                cache_key = None  # Generic fallback image - do not cache it under the scene prompt
+                _wait_for_rate_limit()
+                response = http_post(api_url, json=payload, headers=headers, timeout=120)
                 if response.status_code != 200:
                     # If still fails, use Pollinations.ai as final fallback
                     print(f"      ⚠️ Cloudflare fallback failed, using Pollinations.ai...")
                     from departments.production.visual_engine import _get_pollinations_video
                     # Generate image using Pollinations and convert to video
                     temp_image = output_path.replace('.jpg', '_pollinations.jpg')
-                    import requests as req
                     import random
                     clean_prompt = prompt.replace(" ", "%20").replace(",", "%2C")
                     image_url = f"https://image.pollinations.ai/prompt/{clean_prompt}?width=1080&height=1920&seed={random.randint(1000, 9999)}"
-                    img_response = req.get(image_url, timeout=30)
+                    img_response = http_get(image_url, timeout=30)
                     if img_response.status_code == 200:
                         with open(temp_image, 'wb') as f:
                             f.write(img_response.content)
@@ -226,6 +409,9 @@ def generate_scene_image(prompt: str, output_path: str, width: int = 1080, heigh
         if file_size == 0:
             raise Exception(f"Image file is empty at {output_path}")
         
+        if cache_key:
+            _cache_put(cache_key, output_path)
+        
         print(f"   ✓ Image generated: {output_path} ({file_size} bytes)")
         return output_path
         
@@ -235,6 +421,57 @@ def generate_scene_image(prompt: str, output_path: str, width: int = 1080, heigh
         raise Exception(f"Flux image generation failed: {e}")
 
 
+
+def generate_scene_images(scenes: List[Dict], output_dir: str, width: int = 1080, height: int = 1920) -> List[str]:
+    """
+    Generate one image per scene, concurrently (The Artist, batch mode).
+    
+    Uncached scenes run FLUX_MAX_CONCURRENCY at a time, with request starts
+    spaced by FLUX_REQUESTS_PER_MINUTE. Scenes with the same visual_prompt are
+    generated once and copied.
+    
+    Args:
+        scenes: List of scene dicts with 'id' and 'visual_prompt'
+        output_dir: Directory for scene_<id>.jpg files
+        width: Image width
+        height: Image height
+        
+    Returns:
+        Image paths in scene order
+        
+    Raises:
+        Exception: If any scene fails (after the others finished)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    jobs = {}
+    scene_paths = []
+    for i, scene in enumerate(scenes):
+        scene_id = scene.get('id', i + 1)
+        visual_prompt = scene.get('visual_prompt', 'Cinematic dark noir, moody lighting, hyper-realistic, 8k')
+        image_path = os.path.join(output_dir, f"scene_{scene_id}.jpg")
+        scene_paths.append(image_path)
+        jobs.setdefault(visual_prompt, []).append(i)
+    
+    def _generate(visual_prompt, indices):
+        first_path = generate_scene_image(visual_prompt, scene_paths[indices[0]], width, height)
+        scene_paths[indices[0]] = first_path
+        for index in indices[1:]:
+            shutil.copyfile(first_path, scene_paths[index])
+    
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, min(FLUX_MAX_CONCURRENCY, len(jobs)))) as pool:
+        futures = [pool.submit(_generate, visual_prompt, indices) for visual_prompt, indices in jobs.items()]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(str(e))
+    
+    if errors:
+        raise Exception(f"{len(errors)} scene image(s) failed: {errors[0]}")
+    return scene_paths
+
 if __name__ == "__main__":
     # Test the Flux engine
     print("=" * 60)
@@ -0,0 +1,280 @@
+"""
+THE IMAGE CACHE ENGINE
+Module: Persistent query -> image cache for story images.
+
+Story keywords repeat across videos ("abandoned house dark mysterious"), so every
+downloaded photo is kept on disk:
+- Raw download (re-graded for a new size without hitting the API again)
+- Graded result per output size (a cache hit is a file copy)
+
+Entries are keyed by (provider, query, photo), carry a reuse counter so the same
+photo is not shown in too many videos, and are evicted least-recently-used once
+the cache exceeds its size cap.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Dict, Optional, Set
+
+from config.paths import IMAGE_CACHE_DIR
+
+
+IMAGE_CACHE_INDEX = os.path.join(IMAGE_CACHE_DIR, "index.json")
+IMAGE_CACHE_MAX_MB = float(os.getenv("IMAGE_CACHE_MAX_MB", "500"))
+IMAGE_CACHE_MAX_REUSE = int(os.getenv("IMAGE_CACHE_MAX_REUSE", "3"))  # Videos per photo before a fresh fetch
+IMAGE_CACHE_PROTECT_SECONDS = 600  # Never evict entries handed out this recently (batch still copying them)
+
+_index: Dict[str, Dict] = {}
+_index_loaded = False
+_index_lock = threading.Lock()
+
+
+def _normalize_query(query: str) -> str:
+    """Case/whitespace-insensitive form of a search query."""
+    return " ".join(query.lower().split())
+
+
+def _load_index() -> None:
+    """Load the on-disk index once per process (caller holds the lock)."""
+    global _index_loaded
+    if _index_loaded:
+        return
+    _index_loaded = True
+    if not os.path.exists(IMAGE_CACHE_INDEX):
+        return
+    try:
+        with open(IMAGE_CACHE_INDEX, 'r') as f:
+            data = json.load(f)
+            if isinstance(data, dict):
+                _index.update(data)
+    except Exception as e:
+        print(f"   ⚠️ Failed to load image cache index: {e}")
+
+
+def _save_index() -> None:
+    """Persist the index (atomic replace, caller holds the lock)."""
+    try:
+        temp_path = IMAGE_CACHE_INDEX + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(_index, f)
+        os.replace(temp_path, IMAGE_CACHE_INDEX)
+    except Exception as e:
+        print(f"   ⚠️ Could not save image cache index: {e}")
+
+
+def _raw_path(entry_id: str) -> str:
+    """Path of an entry's raw download."""
+    return os.path.join(IMAGE_CACHE_DIR, f"{entry_id}.raw")
+
+
+def graded_path(entry_id: str, width: int, height: int) -> str:
+    """
+    Path of an entry's graded JPEG for an output size.
+
+    Args:
+        entry_id: Cache entry id
+        width: Output width
+        height: Output height
+
+    Returns:
+        File path (may not exist yet)
+    """
+    return os.path.join(IMAGE_CACHE_DIR, f"{entry_id}_{width}x{height}.jpg")
+
+
+def _public(entry_id: str, entry: Dict) -> Dict:
+    """Copy of an entry with its id and raw path filled in."""
+    result = dict(entry)
+    result["id"] = entry_id
+    result["raw_path"] = _raw_path(entry_id)
+    return result
+
+
+def claim(query: str, allow_overused: bool = False, exclude: Optional[Set[str]] = None) -> Optional[Dict]:
+    """
+    Take a cached photo for a search query (any provider) and count the reuse.
+
+    Picks the least-reused photo, then the least recently used. Lookup and
+    reuse count happen under one lock, so concurrent slots never race for the
+    same photo.
+
+    Args:
+        query: Image search query
+        allow_overused: Also consider photos at the reuse limit (fallback when every provider failed)
+        exclude: Entry ids already placed in the current video (the claimed id is added)
+
+    Returns:
+        Entry dict ('id', 'provider', 'query', 'reuse_count', 'raw_path', ...) or None
+    """
+    normalized = _normalize_query(query)
+
+    with _index_lock:
+        _load_index()
+        candidates = [
+            (entry_id, entry) for entry_id, entry in _index.items()
+            if entry["query"] == normalized
+            and (exclude is None or entry_id not in exclude)
+            and (allow_overused or entry["reuse_count"] < IMAGE_CACHE_MAX_REUSE)
+            and os.path.exists(_raw_path(entry_id))
+        ]
+        if not candidates:
+            return None
+        entry_id, entry = min(candidates, key=lambda c: (c[1]["reuse_count"], c[1]["last_used"]))
+        entry["reuse_count"] += 1
+        entry["last_used"] = time.time()
+        if exclude is not None:
+            exclude.add(entry_id)
+        _save_index()
+        return _public(entry_id, entry)
+
+
+def release(entry_id: str) -> None:
+    """
+    Undo the reuse count of a claimed photo that was not used after all.
+
+    The entry stays in the caller's exclude set, so the same video does not claim it again.
+
+    Args:
+        entry_id: Id of an entry returned by claim()
+    """
+    with _index_lock:
+        _load_index()
+        entry = _index.get(entry_id)
+        if entry is None or entry["reuse_count"] <= 0:
+            return
+        entry["reuse_count"] -= 1
+        _save_index()
+
+
+def store(provider: str, query: str, content: bytes, exclude: Optional[Set[str]] = None) -> Dict:
+    """
+    Add a freshly downloaded photo to the cache (counts as its first use).
+
+    Args:
+        provider: Provider that served the photo (e.g. 'unsplash')
+        query: Search query used
+        content: Raw image bytes
+        exclude: Entry ids already placed in the current video (the new id is added)
+
+    Returns:
+        Entry dict (see claim())
+    """
+    normalized = _normalize_query(query)
+    photo_hash = hashlib.sha1(content).hexdigest()
+    entry_id = hashlib.sha1(f"{provider}|{normalized}|{photo_hash}".encode()).hexdigest()[:20]
+
+    raw_path = _raw_path(entry_id)
+    temp_path = f"{raw_path}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, raw_path)
+
+    with _index_lock:
+        _load_index()
+        now = time.time()
+        entry = _index.setdefault(entry_id, {
+            "provider": provider,
+            "query": normalized,
+            "reuse_count": 0,
+            "created": now,
+            "sizes": [],
+        })
+        entry["reuse_count"] += 1
+        entry["last_used"] = now
+        if exclude is not None:
+            exclude.add(entry_id)
+        entry["bytes"] = len(content) + sum(_file_size(graded_path(entry_id, *size)) for size in entry["sizes"])
+        _evict()
+        _save_index()
+        return _public(entry_id, entry)
+
+
+def add_graded(entry_id: str, img, width: int, height: int) -> str:
+    """
+    Save the graded version of a cached photo for an output size.
+
+    Args:
+        entry_id: Cache entry id
+        img: Graded PIL Image
+        width: Output width
+        height: Output height
+
+    Returns:
+        Path to the graded JPEG
+    """
+    path = graded_path(entry_id, width, height)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    img.save(temp_path, 'JPEG', quality=95)
+    os.replace(temp_path, path)
+
+    with _index_lock:
+        _load_index()
+        entry = _index.get(entry_id)
+        if entry is not None:
+            if [width, height] not in entry["sizes"]:
+                entry["sizes"].append([width, height])
+            entry["bytes"] = _file_size(_raw_path(entry_id)) + sum(
+                _file_size(graded_path(entry_id, *size)) for size in entry["sizes"]
+            )
+            _evict()
+            _save_index()
+    return path
+
+
+def _file_size(path: str) -> int:
+    """Size of a file in bytes (0 if missing)."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _evict() -> None:
+    """Drop least-recently-used entries until the cache fits its size cap (caller holds the lock)."""
+    limit = IMAGE_CACHE_MAX_MB * 1024 * 1024
+    total = sum(entry.get("bytes", 0) for entry in _index.values())
+    if total <= limit:
+        return
+
+    protect_after = time.time() - IMAGE_CACHE_PROTECT_SECONDS
+    for entry_id, entry in sorted(_index.items(), key=lambda item: item[1]["last_used"]):
+        if total <= limit:
+            break
+        if entry["last_used"] > protect_after:
+            continue
+        for path in [_raw_path(entry_id)] + [graded_path(entry_id, *size) for size in entry["sizes"]]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= entry.get("bytes", 0)
+        del _index[entry_id]
+
+
+def get_cache_stats() -> Dict:
+    """
+    Summary of the image cache.
+
+    Returns:
+        Dict with 'entries', 'queries', 'megabytes', 'reuses'
+    """
+    with _index_lock:
+        _load_index()
+        return {
+            "entries": len(_index),
+            "queries": len({entry["query"] for entry in _index.values()}),
+            "megabytes": sum(entry.get("bytes", 0) for entry in _index.values()) / (1024 * 1024),
+            "reuses": sum(entry["reuse_count"] for entry in _index.values()),
+        }
+
+
+if __name__ == "__main__":
+    # Test the image cache engine
+    print("=" * 60)
+    print("🧪 TESTING IMAGE CACHE ENGINE")
+    print("=" * 60)
+
+    print(get_cache_stats())
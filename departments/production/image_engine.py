@@ -3,12 +3,61 @@ THE IMAGE ENGINE
 Module: Generates AI image hooks using Pollinations.ai (No API Key needed).
 
 Creates stunning visual hooks for the first 3 seconds of videos.
+
+Hooks are cached on disk by prompt and can be prefetched in the background as soon
+as the topic is known; production only waits up to a short deadline and otherwise
+falls back to a cached generic hook.
 """
 
 import os
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
 import urllib.parse
-import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
+from config.paths import HOOK_CACHE_DIR
+from departments.logistics.http_engine import http_get
+
+
+IMAGE_HOOK_WAIT_SECONDS = float(os.getenv("IMAGE_HOOK_WAIT_SECONDS", "5"))  # Max wait at assembly time
+IMAGE_HOOK_CACHE_MAX = int(os.getenv("IMAGE_HOOK_CACHE_MAX", "200"))  # Cached hooks kept (oldest evicted)
+GENERIC_HOOK_TOPIC = "Dark Psychology, mind control, cinematic"
+
+_hook_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image_hook")
+_generic_warming = threading.Lock()
+
+
+def _hook_prompt(topic: str) -> str:
+    """Pollinations prompt for a hook topic (cinematic keywords for high quality)."""
+    return f"{topic}, cinematic lighting, hyper-realistic, 8k, dramatic, professional photography"
+
+
+def _hook_cache_path(prompt: str) -> str:
+    """Cache file of a hook prompt."""
+    return os.path.join(HOOK_CACHE_DIR, hashlib.sha1(prompt.encode()).hexdigest()[:20] + ".jpg")
+
+
+def _store_hook(prompt: str, image_path: str) -> None:
+    """Copy a downloaded hook into the cache and drop the oldest hooks over IMAGE_HOOK_CACHE_MAX."""
+    try:
+        cache_path = _hook_cache_path(prompt)
+        temp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        shutil.copyfile(image_path, temp_path)
+        os.replace(temp_path, cache_path)
+        
+        cached = sorted(
+            (os.path.join(HOOK_CACHE_DIR, name) for name in os.listdir(HOOK_CACHE_DIR) if name.endswith('.jpg')),
+            key=os.path.getmtime
+        )
+        generic_path = _hook_cache_path(_hook_prompt(GENERIC_HOOK_TOPIC))
+        for old_path in cached[:max(0, len(cached) - IMAGE_HOOK_CACHE_MAX)]:
+            if old_path != generic_path:
+                os.remove(old_path)
+    except Exception as e:
+        print(f"   ⚠️ Could not cache image hook: {e}")
 
 
 def generate_image_hook(topic: str, output_path: str = "hook_image.jpg") -> str:
@@ -29,7 +78,15 @@ def generate_image_hook(topic: str, output_path: str = "hook_image.jpg") -> str:
     
     # Create prompt based on topic
     # Enhance with cinematic keywords for high quality
-    prompt = f"{topic}, cinematic lighting, hyper-realistic, 8k, dramatic, professional photography"
+    prompt = _hook_prompt(topic)
+    
+    cache_path = _hook_cache_path(prompt)
+    if os.path.exists(cache_path):
+        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+        shutil.copyfile(cache_path, output_path)
+        os.utime(cache_path)  # Recently used hooks are evicted last
+        print(f"   ✓ AI image hook from cache: {output_path}")
+        return output_path
     
     # Construct Pollinations.ai URL
     # Format: https://pollinations.ai/p/{encoded_prompt}?width=1080&height=1920
@@ -43,8 +100,12 @@ def generate_image_hook(topic: str, output_path: str = "hook_image.jpg") -> str:
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
         
-        # Download image
-        urllib.request.urlretrieve(image_url, output_path)
+        # Download image (pooled session, retries on 429/5xx)
+        response = http_get(image_url, timeout=60)
+        if response.status_code != 200:
+            raise Exception(f"Pollinations.ai returned status {response.status_code}")
+        with open(output_path, 'wb') as f:
+            f.write(response.content)
         
         # Verify file was created
         if not os.path.exists(output_path):
@@ -54,6 +115,8 @@ def generate_image_hook(topic: str, output_path: str = "hook_image.jpg") -> str:
         if file_size == 0:
             raise Exception(f"Image file is empty at {output_path}")
         
+        _store_hook(prompt, output_path)
+        
         print(f"   ✓ AI image hook generated: {output_path} ({file_size} bytes)")
         return output_path
         
@@ -61,6 +124,93 @@ def generate_image_hook(topic: str, output_path: str = "hook_image.jpg") -> str:
         raise Exception(f"Failed to generate image hook: {e}")
 
 
+def _warm_generic_hook() -> None:
+    """Make sure the generic fallback hook is cached (downloaded at most once at a time)."""
+    if os.path.exists(_hook_cache_path(_hook_prompt(GENERIC_HOOK_TOPIC))):
+        return
+    if not _generic_warming.acquire(blocking=False):
+        return
+    try:
+        generic_temp = os.path.join(tempfile.gettempdir(), f"generic_hook_{threading.get_ident()}.jpg")
+        generate_image_hook(GENERIC_HOOK_TOPIC, generic_temp)
+        os.remove(generic_temp)
+    except Exception as e:
+        print(f"   ⚠️ Could not cache generic image hook: {e}")
+    finally:
+        _generic_warming.release()
+
+
+def _download_hook_staged(topic: str) -> str:
+    """Generate a hook into a private temp file (moved into place only when collected)."""
+    fd, staging_path = tempfile.mkstemp(prefix="image_hook_", suffix=".jpg")
+    os.close(fd)
+    try:
+        return generate_image_hook(topic, staging_path)
+    except Exception:
+        os.remove(staging_path)
+        raise
+
+
+def _discard_late_hook(future: Future) -> None:
+    """Delete the staged file of a hook that finished after its deadline."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    try:
+        os.remove(future.result())
+    except OSError:
+        pass
+
+
+def prefetch_image_hook(topic: str) -> Future:
+    """
+    Start generating an image hook in the background.
+    
+    Call as soon as the topic is known; collect with wait_for_image_hook() right
+    before assembly so the download overlaps TTS and visuals. The download goes to
+    a temp file, so a hook that is never collected leaves nothing in the work dir.
+    
+    Args:
+        topic: Topic/keywords for image generation
+        
+    Returns:
+        Future resolving to the staged image path
+    """
+    _hook_pool.submit(_warm_generic_hook)
+    return _hook_pool.submit(_download_hook_staged, topic)
+
+
+def wait_for_image_hook(future: Future, output_path: str, deadline: float = IMAGE_HOOK_WAIT_SECONDS) -> Optional[str]:
+    """
+    Collect a prefetched hook, falling back to the cached generic hook.
+    
+    Args:
+        future: Future from prefetch_image_hook()
+        output_path: Path to place the hook at
+        deadline: Max seconds to wait for the fetch to finish
+        
+    Returns:
+        Path to the hook image, or None if neither the hook nor a fallback is available
+    """
+    try:
+        staged_path = future.result(timeout=deadline)
+        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+        shutil.move(staged_path, output_path)
+        return output_path
+    except Exception as e:
+        reason = "not ready in time" if not future.done() else str(e)
+        print(f"   ⚠️ Image hook {reason[:80]}, using cached generic hook...")
+        if not future.cancel():
+            # Already running: its staged file is removed whenever it finishes
+            future.add_done_callback(_discard_late_hook)
+    
+    generic_path = _hook_cache_path(_hook_prompt(GENERIC_HOOK_TOPIC))
+    if not os.path.exists(generic_path):
+        return None
+    fallback_path = f"{os.path.splitext(output_path)[0]}_generic.jpg"
+    shutil.copyfile(generic_path, fallback_path)
+    return fallback_path
+
+
 if __name__ == "__main__":
     # Test the image engine
     print("=" * 60)
@@ -68,8 +218,10 @@ if __name__ == "__main__":
     print("=" * 60)
     
     try:
-        image_path = generate_image_hook("Dark Psychology, mind control, cinematic", "test_hook.jpg")
-        print(f"\n✓ Image created at: {image_path}")
+        started = time.monotonic()
+        hook_future = prefetch_image_hook("Dark Psychology, mind control, cinematic")
+        image_path = wait_for_image_hook(hook_future, "test_hook.jpg", deadline=60)
+        print(f"\n✓ Image created at: {image_path} ({time.monotonic() - started:.2f}s)")
         
     except Exception as e:
         print(f"\n❌ Error: {e}")
@@ -6,10 +6,20 @@ Finds and downloads appropriate images based on horror story content.
 """
 
 import os
-import requests
 import random
+import shutil
+import threading
+import queue
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Optional, List
 from dotenv import load_dotenv
+from departments.logistics.http_engine import http_get
+from departments.production import image_cache_engine
+from departments.logistics import image_hash_engine
+from departments.intelligence.lexicon_engine import compile_lexicon, hits_by_category
+from config.paths import IMAGE_CACHE_DIR
 
 load_dotenv()
 
@@ -17,6 +27,48 @@ load_dotenv()
 UNSPLASH_ACCESS_KEY = os.getenv("UNSPLASH_ACCESS_KEY")  # Optional, will work without but with limits
 PEXELS_API_KEY = os.getenv("PEXELS_API_KEY")  # Optional, free tier available
 
+# Concurrent acquisition: batch workers, overall deadline, per-provider in-flight limits
+IMAGE_BATCH_WORKERS = int(os.getenv("IMAGE_BATCH_WORKERS", "6"))
+IMAGE_BATCH_DEADLINE = float(os.getenv("IMAGE_BATCH_DEADLINE", "45"))
+_PROVIDER_LIMITS = {
+    "unsplash": threading.BoundedSemaphore(int(os.getenv("UNSPLASH_CONCURRENCY", "3"))),
+    "pexels": threading.BoundedSemaphore(int(os.getenv("PEXELS_CONCURRENCY", "3"))),
+    "unsplash_source": threading.BoundedSemaphore(int(os.getenv("UNSPLASH_SOURCE_CONCURRENCY", "2"))),
+}
+
+# Hedged requests: start the next provider if the current one is slower than the hedge delay
+IMAGE_HEDGING = os.getenv("IMAGE_HEDGING", "1") == "1"
+IMAGE_HEDGE_DELAY = float(os.getenv("IMAGE_HEDGE_DELAY", "2.0"))  # Until enough latency samples exist
+IMAGE_HEDGE_DELAY_MIN = 0.3
+IMAGE_HEDGE_DELAY_MAX = 5.0
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=12)
+_provider_stats = {}
+_provider_stats_lock = threading.Lock()
+
+# Query -> image cache (IMAGE_CACHE=0 always fetches fresh; downloads are still cached)
+IMAGE_CACHE_ENABLED = os.getenv("IMAGE_CACHE", "1") == "1"
+
+# Perceptual-hash check against photos used in recent videos (image_hash_engine)
+IMAGE_HASH_CHECK = os.getenv("IMAGE_HASH_CHECK", "1") == "1"
+IMAGE_CANDIDATE_ATTEMPTS = 3  # Cached / fresh candidates tried per slot before settling
+
+# Horror grade: brightness 0.80, contrast 1.3, saturation 0.6, then a 5% lift after the vignette
+GRADE_BRIGHTNESS = 0.80
+GRADE_CONTRAST = 1.3
+GRADE_SATURATION = 0.6
+GRADE_LIFT = 1.05
+GRAIN_TILE = 512
+GRAIN_BANK_SIZE = 4
+_LUMA = (0.299, 0.587, 0.114)
+_vignette_cache = {}
+_grain_cache = {}
+_grading_lock = threading.Lock()
+_seen_hashes_lock = threading.Lock()  # Batch threads share one seen_hashes list per video
+
+# Placeholders: a few pre-graded variants per resolution, memoized in the image cache dir
+PLACEHOLDER_VARIANTS = 6
+_placeholder_counter = random.randrange(PLACEHOLDER_VARIANTS)
+
 # Horror-related search keywords (for when story doesn't provide good keywords)
 HORROR_KEYWORDS = [
     "dark forest", "abandoned house", "ghost", "haunted", "nightmare", 
@@ -25,50 +77,78 @@ HORROR_KEYWORDS = [
 ]
 
 
-def _apply_horror_color_grading(img):
+# Story lexicon for image keyword extraction (priority order within each category)
+STORY_SUBJECT_TERMS = [
+    # Historical events/places (often in titles)
+    "colony", "murder", "disappearance", "mystery", "case", "incident",
+    "event", "tragedy", "disaster", "vanishing", "missing"
+]
+STORY_LOCATION_TERMS = [
+    "hotel", "house", "room", "building", "cottage", "cabin", "mansion", "castle",
+    "forest", "woods", "road", "street", "alley", "path", "trail",
+    "cemetery", "graveyard", "church", "hospital", "school", "library",
+    "basement", "attic", "hallway", "corridor", "staircase", "stairs",
+    "beach", "island", "mountain", "valley", "field", "meadow",
+    "bridge", "tunnel", "cave", "warehouse", "factory", "farm",
+    "colony", "settlement", "village", "town", "city"
+]
+STORY_ACTION_PATTERNS = {
+    "disappearance": ["disappeared", "vanished", "missing", "gone", "lost"],
+    "murder": ["killed", "murdered", "death", "died", "slain"],
+    "mystery": ["mysterious", "unknown", "unexplained", "strange", "puzzling"],
+    "encounter": ["saw", "met", "found", "encountered", "discovered", "witnessed"],
+    "haunting": ["haunted", "ghost", "spirit", "apparition", "phantom"],
+    "isolation": ["alone", "isolated", "abandoned", "deserted", "empty"],
+    "danger": ["dangerous", "threat", "fear", "terrified", "scared"]
+}
+STORY_OBJECT_TERMS = [
+    "door", "window", "mirror", "picture", "photo", "frame",
+    "bed", "chair", "table", "desk", "dresser", "wardrobe",
+    "car", "vehicle", "truck", "boat", "ship", "plane",
+    "tree", "fence", "gate", "wall", "roof", "chimney",
+    "cross", "statue", "monument", "grave", "tombstone",
+    "letter", "note", "message", "diary", "journal"
+]
+STORY_ATMOSPHERE_TERMS = [
+    "night", "dark", "foggy", "misty", "stormy", "rainy", "snowy",
+    "cold", "winter", "autumn", "fall", "evening", "dawn", "dusk",
+    "abandoned", "empty", "deserted", "isolated", "remote", "lonely"
+]
+STORY_LEXICON = compile_lexicon({
+    "subject": STORY_SUBJECT_TERMS,
+    "location": STORY_LOCATION_TERMS,
+    **{f"action:{action_type}": patterns for action_type, patterns in STORY_ACTION_PATTERNS.items()},
+    "object": STORY_OBJECT_TERMS,
+    "atmosphere": STORY_ATMOSPHERE_TERMS,
+}, match_plurals=True)
+
+
+def _vignette_mask(width: int, height: int):
     """
-    Apply horror color grading to match cinematics aesthetic (Expert-optimized).
-    
-    Processing:
-    - Darken image (reduce brightness 20%) - was 35%, now lighter for better mobile visibility
-    - Increase contrast (30%) - was 20%, now more dramatic
-    - Desaturate (40% less color) - was 30%, now more moody
-    - Add dark vignette (stronger)
-    - Add film grain (5-8% for realism and premium feel)
+    Horror vignette as an RGB multiply mask, drawn once per output size.
     
     Args:
-        img: PIL Image object
+        width: Image width
+        height: Image height
         
     Returns:
-        Processed PIL Image matching horror aesthetic
+        PIL RGB Image (255 = no darkening)
     """
-    from PIL import Image as PILImage, ImageEnhance, ImageDraw, ImageChops
-    import numpy as np
-    
-    # 1. Reduce brightness (20% darker - expert recommendation for mobile visibility)
-    enhancer = ImageEnhance.Brightness(img)
-    img = enhancer.enhance(0.80)  # 20% darker (was 0.65 = 35%)
+    from PIL import Image as PILImage, ImageDraw
     
-    # 2. Increase contrast (30% more - expert recommendation for dramatic horror look)
-    enhancer = ImageEnhance.Contrast(img)
-    img = enhancer.enhance(1.3)  # 30% more contrast (was 1.2 = 20%)
+    with _grading_lock:
+        mask = _vignette_cache.get((width, height))
+        if mask is not None:
+            return mask
     
-    # 3. Desaturate colors (40% less saturation - expert recommendation for moody horror)
-    enhancer = ImageEnhance.Color(img)
-    img = enhancer.enhance(0.6)  # 40% less saturation (was 0.7 = 30%)
-    
-    # 4. Add dark vignette effect (matches cinematic vignette)
-    width, height = img.size
     center_x, center_y = width // 2, height // 2
-    
-    # Create vignette overlay
     vignette = PILImage.new('L', (width, height), 255)  # White = no darkening
     draw = ImageDraw.Draw(vignette)
     
-    # Draw radial gradient (darker at edges) using ellipses
+    # Radial gradient from 15 nested ellipses
     for i in range(15):
         radius_factor = 1.0 - (i * 0.06)
-        darkness = int(60 * (i / 15.0))  # Increase darkness toward edges
+        darkness = int(60 * (i / 15.0))
         
         ellipse_w = int(width * radius_factor)
         ellipse_h = int(height * radius_factor)
@@ -76,34 +156,92 @@ def _apply_horror_color_grading(img):
         y1 = center_y - ellipse_h // 2
         x2 = center_x + ellipse_w // 2
         y2 = center_y + ellipse_h // 2
-        
-        # Draw darker ellipse
         draw.ellipse([x1, y1, x2, y2], fill=255 - darkness)
     
-    # Apply vignette to image
-    img = img.convert('RGB')
-    vignette_rgb = vignette.convert('RGB')
+    mask = vignette.convert('RGB')
+    with _grading_lock:
+        _vignette_cache[(width, height)] = mask
+    return mask
+
+
+def _grain_frame(width: int, height: int):
+    """
+    Film grain frame for an output size, picked from a small pre-generated bank.
+    
+    Grain is stored as uint8 centred on 128 (added with offset -128), tiled from
+    GRAIN_TILE-sized noise at 5-8% intensity.
     
-    # Use multiply blend mode to darken edges (stronger vignette)
-    img = ImageChops.multiply(img, vignette_rgb)
-    img = ImageEnhance.Brightness(img).enhance(1.05)  # Slight brighten back (was 1.1)
+    Args:
+        width: Image width
+        height: Image height
+        
+    Returns:
+        PIL RGB Image
+    """
+    from PIL import Image as PILImage
+    import numpy as np
     
-    # 5. Add film grain (5-8% for realism - expert recommendation)
-    # Convert to numpy array for grain
-    img_array = np.array(img).astype(np.float32)
+    with _grading_lock:
+        bank = _grain_cache.setdefault((width, height), [])
+        if len(bank) >= GRAIN_BANK_SIZE:
+            return random.choice(bank)
     
-    # Generate random grain (5-7% intensity)
     grain_intensity = np.random.uniform(0.05, 0.08)  # 5-8% grain
-    noise = np.random.normal(0, grain_intensity * 255, img_array.shape).astype(np.float32)
+    tile = np.random.normal(128, grain_intensity * 255, (GRAIN_TILE, GRAIN_TILE, 3))
+    tile = np.clip(tile, 0, 255).astype(np.uint8)
+    reps = (-(-height // GRAIN_TILE), -(-width // GRAIN_TILE), 1)
+    frame = PILImage.fromarray(np.ascontiguousarray(np.tile(tile, reps)[:height, :width]))
+    
+    with _grading_lock:
+        bank.append(frame)
+    return frame
+
+
+def _apply_horror_color_grading(img):
+    """
+    Apply horror color grading to match cinematics aesthetic (Expert-optimized).
     
-    # Apply grain (additive, then clamp)
-    img_array = img_array + noise
-    img_array = np.clip(img_array, 0, 255).astype(np.uint8)
+    Processing:
+    - Darken image (reduce brightness 20%) - was 35%, now lighter for better mobile visibility
+    - Increase contrast (30%) - was 20%, now more dramatic
+    - Desaturate (40% less color) - was 30%, now more moody
+    - Add dark vignette (stronger)
+    - Add film grain (5-8% for realism and premium feel)
     
-    # Convert back to PIL Image
-    img = PILImage.fromarray(img_array)
+    Brightness, contrast, desaturation and the final 5% lift are all affine in RGB,
+    so they run as one colour-matrix pass; the vignette mask and grain frames are
+    cached per output size. Three C-level passes over uint8 data in total.
     
-    return img
+    Args:
+        img: PIL Image object
+        
+    Returns:
+        Processed PIL Image matching horror aesthetic
+    """
+    from PIL import ImageChops, ImageStat
+    
+    img = img.convert('RGB')
+    width, height = img.size
+    
+    # Contrast pivots on mean luminance of the darkened image (as ImageEnhance.Contrast does)
+    means = ImageStat.Stat(img.reduce(8) if min(width, height) >= 64 else img).mean
+    pivot = GRADE_BRIGHTNESS * sum(w * m for w, m in zip(_LUMA, means))
+    
+    # 1-3 + lift: out_c = lift * (sat * y_c + (1 - sat) * luma(y)), y = contrast * (brightness * x - pivot) + pivot
+    gain = GRADE_LIFT * GRADE_CONTRAST * GRADE_BRIGHTNESS
+    offset = GRADE_LIFT * (1 - GRADE_CONTRAST) * pivot
+    matrix = []
+    for channel in range(3):
+        row = [gain * (1 - GRADE_SATURATION) * _LUMA[j] for j in range(3)]
+        row[channel] += gain * GRADE_SATURATION
+        matrix += row + [offset]
+    img = img.convert('RGB', tuple(matrix))
+    
+    # 4. Dark vignette (multiply blend)
+    img = ImageChops.multiply(img, _vignette_mask(width, height))
+    
+    # 5. Film grain (additive, clamped)
+    return ImageChops.add(img, _grain_frame(width, height), 1.0, -128)
 
 
 def _extract_keywords_from_story(story_text: str, story_title: str) -> List[str]:
@@ -121,82 +259,23 @@ def _extract_keywords_from_story(story_text: str, story_title: str) -> List[str]
     Returns:
         List of keywords for image search (prioritized by narrative relevance)
     """
-    import re
-    
-    # Combine title and story for analysis
-    combined_text = (story_title + " " + story_text).lower()
-    sentences = re.split(r'[.!?]+', story_text)
-    
-    # STEP 1: Identify the MAIN VISUAL SUBJECT (what the story is about)
-    # Extract key nouns that represent the core subject
-    main_subjects = []
+    # One pass over title + story for every category (see STORY_LEXICON)
+    hits = hits_by_category(story_title + " " + story_text, STORY_LEXICON)
     
-    # Historical events/places (often in titles)
-    historical_terms = ["colony", "murder", "disappearance", "mystery", "case", "incident", 
-                       "event", "tragedy", "disaster", "vanishing", "missing"]
-    for term in historical_terms:
-        if term in combined_text:
-            main_subjects.append(term)
-    
-    # STEP 2: Extract the PRIMARY LOCATION (where the action happens)
-    location_keywords = [
-        "hotel", "house", "room", "building", "cottage", "cabin", "mansion", "castle",
-        "forest", "woods", "road", "street", "alley", "path", "trail",
-        "cemetery", "graveyard", "church", "hospital", "school", "library",
-        "basement", "attic", "hallway", "corridor", "staircase", "stairs",
-        "beach", "island", "mountain", "valley", "field", "meadow",
-        "bridge", "tunnel", "cave", "warehouse", "factory", "farm",
-        "colony", "settlement", "village", "town", "city"
-    ]
+    # STEP 1: MAIN VISUAL SUBJECT (what the story is about)
+    main_subjects = hits.get("subject", [])
     
-    found_locations = []
-    for location in location_keywords:
-        if location in combined_text:
-            found_locations.append(location)
-    
-    # STEP 3: Extract ACTION/EVENT keywords (what's happening visually)
-    # These create psychological connection - viewer visualizes the action
-    action_patterns = {
-        "disappearance": ["disappeared", "vanished", "missing", "gone", "lost"],
-        "murder": ["killed", "murdered", "death", "died", "slain"],
-        "mystery": ["mysterious", "unknown", "unexplained", "strange", "puzzling"],
-        "encounter": ["saw", "met", "found", "encountered", "discovered", "witnessed"],
-        "haunting": ["haunted", "ghost", "spirit", "apparition", "phantom"],
-        "isolation": ["alone", "isolated", "abandoned", "deserted", "empty"],
-        "danger": ["dangerous", "threat", "fear", "terrified", "scared"]
-    }
-    
-    found_actions = []
-    for action_type, patterns in action_patterns.items():
-        if any(pattern in combined_text for pattern in patterns):
-            found_actions.append(action_type)
-    
-    # STEP 4: Extract KEY OBJECTS/FEATURES (visual anchors)
-    object_keywords = [
-        "door", "window", "mirror", "picture", "photo", "frame",
-        "bed", "chair", "table", "desk", "dresser", "wardrobe",
-        "car", "vehicle", "truck", "boat", "ship", "plane",
-        "tree", "fence", "gate", "wall", "roof", "chimney",
-        "cross", "statue", "monument", "grave", "tombstone",
-        "letter", "note", "message", "diary", "journal"
-    ]
+    # STEP 2: PRIMARY LOCATION (where the action happens)
+    found_locations = hits.get("location", [])
     
-    found_objects = []
-    for obj in object_keywords:
-        if obj in combined_text:
-            found_objects.append(obj)
+    # STEP 3: ACTION/EVENT (what's happening visually - viewer visualizes the action)
+    found_actions = [action_type for action_type in STORY_ACTION_PATTERNS if f"action:{action_type}" in hits]
     
-    # STEP 5: Extract ATMOSPHERE (mood/feeling - critical for horror)
-    atmosphere_keywords = [
-        "night", "dark", "foggy", "misty", "stormy", "rainy", "snowy",
-        "cold", "winter", "autumn", "fall", "evening", "dawn", "dusk",
-        "abandoned", "empty", "deserted", "isolated", "remote", "lonely"
-    ]
+    # STEP 4: KEY OBJECTS/FEATURES (visual anchors)
+    found_objects = hits.get("object", [])
     
-    found_atmosphere = []
-    for atmos in atmosphere_keywords:
-        if atmos in combined_text:
-            found_atmosphere.append(atmos)
+    # STEP 5: ATMOSPHERE (mood/feeling - critical for horror)
+    found_atmosphere = hits.get("atmosphere", [])
     
     # STEP 6: Build PSYCHOLOGICALLY-OPTIMIZED keyword list
     keywords = []
@@ -331,7 +410,8 @@ def download_multiple_horror_images(
     output_dir: str,
     num_images: int = 6,
     width: int = 1080,
-    height: int = 1920
+    height: int = 1920,
+    deadline: float = IMAGE_BATCH_DEADLINE
 ) -> List[str]:
     """
     Download multiple horror-related images for different story moments.
@@ -339,6 +419,9 @@ def download_multiple_horror_images(
     Creates visual variety throughout the video - viewer sees different images
     as the story progresses, enhancing psychological engagement.
     
+    All slots are fetched concurrently (per-provider concurrency limits apply).
+    Slots still unfinished when the deadline passes get a dark placeholder.
+    
     Args:
         story_text: Full horror story text
         story_title: Story title
@@ -346,13 +429,11 @@ def download_multiple_horror_images(
         num_images: Number of images to download (5-7 recommended)
         width: Image width (default: 1080 for Shorts)
         height: Image height (default: 1920 for Shorts)
+        deadline: Seconds allowed for the whole batch (default: 45s)
         
     Returns:
-        List of paths to downloaded images
+        List of paths to downloaded images (horror_image_1.jpg, horror_image_2.jpg, ... in story order)
     """
-    import os
-    import random
-    
     os.makedirs(output_dir, exist_ok=True)
     
     print(f"   🖼️ Downloading {num_images} images for story moments...")
@@ -360,8 +441,7 @@ def download_multiple_horror_images(
     # Extract story segments
     segments = _extract_story_segments(story_text, story_title, num_images)
     
-    downloaded_images = []
-    
+    slots = []
     for i, segment in enumerate(segments):
         segment_keywords = segment['keywords']
         moment_type = segment['moment_type']
@@ -386,14 +466,39 @@ def download_multiple_horror_images(
         output_path = os.path.join(output_dir, image_filename)
         
         print(f"      📸 Image {i+1}/{num_images} ({moment_type}): {search_query[:50]}...")
+        slots.append((search_query, output_path))
+    
+    # Fetch every slot concurrently; workers return graded images in the cache, files are copied here
+    cancel = threading.Event()
+    placed = set()
+    seen_hashes = []
+    executor = ThreadPoolExecutor(max_workers=max(1, min(len(slots), IMAGE_BATCH_WORKERS)))
+    futures = [
+        executor.submit(_acquire_image, search_query, width, height, cancel, placed, seen_hashes)
+        for search_query, _ in slots
+    ]
+    done, not_done = wait(futures, timeout=deadline)
+    cancel.set()
+    executor.shutdown(wait=False, cancel_futures=True)
+    
+    if not_done:
+        print(f"      ⚠️ Image deadline ({deadline:.0f}s) reached with {len(not_done)} slot(s) unfinished")
+    
+    downloaded_images = []
+    for i, ((search_query, output_path), future) in enumerate(zip(slots, futures)):
+        image_path = None
+        if future in done:
+            try:
+                image_path = future.result()
+            except Exception:
+                image_path = None
         
-        # Download image using existing function logic
-        image_path = _download_single_image(search_query, output_path, width, height)
-        
-        if image_path:
-            downloaded_images.append(image_path)
+        if image_path is not None:
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+            shutil.copyfile(image_path, output_path)
+            downloaded_images.append(output_path)
         else:
-            # If download failed, use placeholder
+            # If download failed or timed out, use placeholder
             print(f"      ⚠️ Image {i+1} download failed, using placeholder...")
             placeholder_path = _create_placeholder_image(output_path, width, height)
             if placeholder_path:
@@ -403,127 +508,505 @@ def download_multiple_horror_images(
     return downloaded_images
 
 
-def _download_single_image(search_query: str, output_path: str, width: int, height: int) -> Optional[str]:
+def _process_image_bytes(content: bytes, width: int, height: int):
     """
-    Download a single image using the search query.
-    Internal helper function for multi-image downloads.
+    Decode downloaded bytes, resize to the target size and apply horror grading.
+    
+    JPEGs are decoded straight from the response bytes at the smallest DCT scale
+    (1/2, 1/4, 1/8) that still covers the target size, so a 4000px Unsplash photo
+    never gets fully decoded just to be shrunk.
+    
+    Args:
+        content: Raw image bytes
+        width: Target width
+        height: Target height
+        
+    Returns:
+        Processed PIL Image
     """
-    # Priority 1: Try Unsplash API
-    if UNSPLASH_ACCESS_KEY:
-        try:
-            api_url = "https://api.unsplash.com/photos/random"
-            headers = {"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
-            params = {
-                "query": search_query,
-                "orientation": "portrait",
-                "w": width,
-                "h": height
-            }
+    from PIL import Image
+    import io
+    
+    img = Image.open(io.BytesIO(content))
+    img.draft('RGB', (width, height))
+    img = img.convert('RGB')
+    img = img.resize((width, height), Image.Resampling.LANCZOS)
+    return _apply_horror_color_grading(img)
+
+
+def _fetch_unsplash(search_query: str, width: int, height: int, page: int = 1) -> Optional[bytes]:
+    """
+    Fetch image bytes from the Unsplash API (random photo for query, so page is not needed).
+    
+    Returns:
+        Raw image bytes, or None if unavailable
+    """
+    if not UNSPLASH_ACCESS_KEY:
+        return None
+    
+    with _PROVIDER_LIMITS["unsplash"]:
+        api_url = "https://api.unsplash.com/photos/random"
+        headers = {"Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"}
+        params = {
+            "query": search_query,
+            "orientation": "portrait",
+            "w": width,
+            "h": height
+        }
+        
+        response = http_get(api_url, headers=headers, params=params, timeout=10, retries=1)
+        if response.status_code == 200:
+            data = response.json()
+            image_url = data.get("urls", {}).get("regular") or data.get("urls", {}).get("full")
             
-            response = requests.get(api_url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                image_url = data.get("urls", {}).get("regular") or data.get("urls", {}).get("full")
+            if image_url:
+                img_response = http_get(image_url, timeout=15, retries=1)
+                if img_response.status_code == 200:
+                    return img_response.content
+    return None
+
+
+def _fetch_pexels(search_query: str, width: int, height: int, page: int = 1) -> Optional[bytes]:
+    """
+    Fetch image bytes from the Pexels search API (portrait result number `page`).
+    
+    Returns:
+        Raw image bytes, or None if unavailable
+    """
+    if not PEXELS_API_KEY:
+        return None
+    
+    with _PROVIDER_LIMITS["pexels"]:
+        pexels_url = "https://api.pexels.com/v1/search"
+        headers = {"Authorization": PEXELS_API_KEY}
+        params = {
+            "query": search_query,
+            "per_page": 1,
+            "page": page,
+            "orientation": "portrait"
+        }
+        
+        response = http_get(pexels_url, headers=headers, params=params, timeout=10, retries=1)
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('photos') and len(data['photos']) > 0:
+                photo = data['photos'][0]
+                image_url = photo.get('src', {}).get('large') or photo.get('src', {}).get('original')
                 
                 if image_url:
-                    img_response = requests.get(image_url, timeout=15)
+                    img_response = http_get(image_url, timeout=15, retries=1)
                     if img_response.status_code == 200:
-                        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-                        with open(output_path, 'wb') as f:
-                            f.write(img_response.content)
-                        
-                        from PIL import Image
-                        img = Image.open(output_path)
-                        img = img.convert('RGB')
-                        img = img.resize((width, height), Image.Resampling.LANCZOS)
-                        img = _apply_horror_color_grading(img)
-                        img.save(output_path, 'JPEG', quality=95)
-                        return output_path
+                        return img_response.content
+    return None
+
+
+def _fetch_unsplash_source(search_query: str, width: int, height: int, page: int = 1) -> Optional[bytes]:
+    """
+    Fetch image bytes from Unsplash Source (no key, less reliable, random so page is not needed).
+    
+    Returns:
+        Raw image bytes, or None if unavailable
+    """
+    with _PROVIDER_LIMITS["unsplash_source"]:
+        fallback_url = f"https://source.unsplash.com/{width}x{height}/?{search_query.replace(' ', ',')}"
+        img_response = http_get(fallback_url, timeout=15, allow_redirects=True, retries=1)
+        if img_response.status_code == 200 and len(img_response.content) > 10000:
+            return img_response.content
+    return None
+
+
+# Provider cascade (priority order)
+IMAGE_PROVIDERS = [
+    ("unsplash", _fetch_unsplash),
+    ("pexels", _fetch_pexels),
+    ("unsplash_source", _fetch_unsplash_source),
+]
+
+
+def _provider_enabled(provider_name: str) -> bool:
+    """Whether a provider can be called at all (API key present)."""
+    if provider_name == "unsplash":
+        return bool(UNSPLASH_ACCESS_KEY)
+    if provider_name == "pexels":
+        return bool(PEXELS_API_KEY)
+    return True
+
+
+def _passes_quality_check(content: Optional[bytes], width: int, height: int) -> bool:
+    """
+    Size/quality gate for a downloaded image (header decode only).
+    
+    Args:
+        content: Raw image bytes
+        width: Target width
+        height: Target height
+        
+    Returns:
+        True if the bytes are a real image large enough to upscale cleanly
+    """
+    if not content or len(content) < 10000:
+        return False
+    try:
+        from PIL import Image
+        import io
+        
+        img_width, img_height = Image.open(io.BytesIO(content)).size
+        return min(img_width, img_height) >= min(width, height) // 3
+    except Exception:
+        return False
+
+
+def _record_provider_result(provider_name: str, latency: float, success: bool) -> None:
+    """Record latency and outcome of one provider call."""
+    with _provider_stats_lock:
+        stats = _provider_stats.setdefault(provider_name, {
+            "attempts": 0, "successes": 0, "latencies": deque(maxlen=50)
+        })
+        stats["attempts"] += 1
+        if success:
+            stats["successes"] += 1
+            stats["latencies"].append(latency)
+
+
+def get_provider_stats() -> dict:
+    """
+    Snapshot of per-provider latency and success statistics.
+    
+    Returns:
+        Dict mapping provider -> {'attempts', 'successes', 'success_rate', 'p50', 'p90'}
+    """
+    import numpy as np
+    
+    snapshot = {}
+    with _provider_stats_lock:
+        for provider_name, stats in _provider_stats.items():
+            latencies = list(stats["latencies"])
+            snapshot[provider_name] = {
+                "attempts": stats["attempts"],
+                "successes": stats["successes"],
+                "success_rate": stats["successes"] / stats["attempts"] if stats["attempts"] else 0.0,
+                "p50": float(np.percentile(latencies, 50)) if latencies else None,
+                "p90": float(np.percentile(latencies, 90)) if latencies else None,
+            }
+    return snapshot
+
+
+def _hedge_delay(provider_name: str) -> float:
+    """
+    How long to wait on a provider before hedging to the next one.
+    
+    Uses the provider's p90 success latency once there are enough samples,
+    so a fast provider is hedged early and a slow-but-reliable one is given time.
+    """
+    stats = get_provider_stats().get(provider_name)
+    if not stats or stats["successes"] < 5:
+        return IMAGE_HEDGE_DELAY
+    return min(IMAGE_HEDGE_DELAY_MAX, max(IMAGE_HEDGE_DELAY_MIN, stats["p90"]))
+
+
+def _hedged_fetch(search_query: str, width: int, height: int, cancel: threading.Event = None, page: int = 1):
+    """
+    Hedged provider race: first response that passes the quality check wins.
+    
+    The first provider starts immediately; the next one starts when the current
+    leader fails or exceeds its hedge delay. Once a winner is found, attempts that
+    have not started yet are skipped and late results are discarded.
+    
+    Args:
+        search_query: Image search query
+        width: Target width
+        height: Target height
+        cancel: Batch-level cancellation (deadline)
+        page: Result page to ask for (later candidates of the same query)
+        
+    Returns:
+        Tuple of (provider_name, image_bytes), or (None, None) if every provider failed
+    """
+    providers = [(name, fetch) for name, fetch in IMAGE_PROVIDERS if _provider_enabled(name)]
+    
+    # Providers that keep failing (rate-limited key, dead endpoint) drop to the back
+    stats = get_provider_stats()
+    providers.sort(key=lambda p: stats.get(p[0], {}).get("attempts", 0) >= 5 and stats[p[0]]["success_rate"] == 0)
+    results = queue.Queue()
+    won = threading.Event()
+    
+    def attempt(provider_name, fetch):
+        if won.is_set() or (cancel is not None and cancel.is_set()):
+            results.put((provider_name, None))
+            return
+        started = time.monotonic()
+        try:
+            content = fetch(search_query, width, height, page)
         except Exception:
-            pass
+            content = None
+        ok = _passes_quality_check(content, width, height)
+        _record_provider_result(provider_name, time.monotonic() - started, ok)
+        results.put((provider_name, content if ok else None))
+    
+    launched = 0
+    finished = 0
+    while finished < len(providers):
+        if launched == finished and launched < len(providers):
+            # Nothing in flight: start the next provider now
+            _HEDGE_POOL.submit(attempt, *providers[launched])
+            launched += 1
+        
+        timeout = _hedge_delay(providers[launched - 1][0]) if launched < len(providers) else None
+        try:
+            provider_name, content = results.get(timeout=timeout)
+        except queue.Empty:
+            # Leader is slow: hedge with the next provider
+            if cancel is not None and cancel.is_set():
+                break
+            _HEDGE_POOL.submit(attempt, *providers[launched])
+            launched += 1
+            continue
+        
+        finished += 1
+        if content is not None:
+            won.set()
+            return provider_name, content
+        if cancel is not None and cancel.is_set():
+            break
+        if launched < len(providers) and launched > finished:
+            # A hedge failed while the leader is still running: start the next one now
+            _HEDGE_POOL.submit(attempt, *providers[launched])
+            launched += 1
+    
+    won.set()
+    return None, None
+
+
+def _fetch_image_content(search_query: str, width: int, height: int, cancel: threading.Event = None,
+                         page: int = 1):
+    """
+    Fetch raw image bytes for a query from the providers.
     
-    # Priority 2: Try Pexels API
-    if PEXELS_API_KEY:
+    Hedged mode (default) races providers; otherwise the cascade runs in
+    priority order.
+    
+    Args:
+        search_query: Image search query
+        width: Target width
+        height: Target height
+        cancel: Stops the cascade between providers once set (batch deadline)
+        page: Result page to ask for (later candidates of the same query)
+        
+    Returns:
+        Tuple of (provider_name, image_bytes), or (None, None) if every provider failed
+    """
+    if IMAGE_HEDGING:
+        return _hedged_fetch(search_query, width, height, cancel, page)
+    
+    for provider_name, fetch in IMAGE_PROVIDERS:
+        if cancel is not None and cancel.is_set():
+            break
         try:
-            pexels_url = "https://api.pexels.com/v1/search"
-            headers = {"Authorization": PEXELS_API_KEY}
-            params = {
-                "query": search_query,
-                "per_page": 1,
-                "orientation": "portrait"
-            }
-            
-            response = requests.get(pexels_url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('photos') and len(data['photos']) > 0:
-                    photo = data['photos'][0]
-                    image_url = photo.get('src', {}).get('large') or photo.get('src', {}).get('original')
-                    
-                    if image_url:
-                        img_response = requests.get(image_url, timeout=15)
-                        if img_response.status_code == 200:
-                            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-                            with open(output_path, 'wb') as f:
-                                f.write(img_response.content)
-                            
-                            from PIL import Image
-                            img = Image.open(output_path)
-                            img = img.convert('RGB')
-                            img = img.resize((width, height), Image.Resampling.LANCZOS)
-                            img = _apply_horror_color_grading(img)
-                            img.save(output_path, 'JPEG', quality=95)
-                            return output_path
+            content = fetch(search_query, width, height, page)
+            if content:
+                return provider_name, content
         except Exception:
             pass
+    return None, None
+
+
+def _graded_from_cache(entry: dict, width: int, height: int) -> Optional[str]:
+    """
+    Graded JPEG for a cache entry, grading the raw download only on first use at this size.
     
-    # Priority 3: Unsplash Source
+    Args:
+        entry: Cache entry from image_cache_engine
+        width: Target width
+        height: Target height
+        
+    Returns:
+        Path to the graded JPEG in the cache, or None if the raw image cannot be decoded
+    """
+    path = image_cache_engine.graded_path(entry["id"], width, height)
+    if os.path.exists(path):
+        return path
     try:
-        fallback_url = f"https://source.unsplash.com/{width}x{height}/?{search_query.replace(' ', ',')}"
-        img_response = requests.get(fallback_url, timeout=15, allow_redirects=True)
-        if img_response.status_code == 200 and len(img_response.content) > 10000:
-            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-            with open(output_path, 'wb') as f:
-                f.write(img_response.content)
-            
-            from PIL import Image
-            img = Image.open(output_path)
-            img = img.convert('RGB')
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
-            img = _apply_horror_color_grading(img)
-            img.save(output_path, 'JPEG', quality=95)
-            return output_path
+        with open(entry["raw_path"], 'rb') as f:
+            img = _process_image_bytes(f.read(), width, height)
+        return image_cache_engine.add_graded(entry["id"], img, width, height)
     except Exception:
-        pass
+        return None
+
+
+def _is_fresh_photo(image_path: str, seen_hashes: list = None, check_history: bool = True) -> bool:
+    """
+    Perceptual-hash gate: reject photos used in a recent video or already in this batch.
+    
+    Args:
+        image_path: Graded candidate image
+        seen_hashes: dHashes accepted so far in the current video (appended on success)
+        check_history: Apply the IMAGE_REUSE_COOLDOWN_DAYS check against recent videos
+            (off for cache claims, whose reuse is budgeted by IMAGE_CACHE_MAX_REUSE)
+        
+    Returns:
+        True if the photo may be used
+    """
+    if not IMAGE_HASH_CHECK:
+        return True
+    value = image_hash_engine.compute_dhash(image_path)
+    if value is None:
+        return True
+    if check_history and image_hash_engine.is_recently_used(value):
+        return False
+    if seen_hashes is not None:
+        with _seen_hashes_lock:
+            if any(image_hash_engine.hamming_distance(value, seen) <= image_hash_engine.IMAGE_HASH_DISTANCE
+                   for seen in seen_hashes):
+                return False
+            seen_hashes.append(value)
+    return True
+
+
+def _mark_seen(image_path: Optional[str], seen_hashes: list = None) -> Optional[str]:
+    """Record a photo placed without passing the gate, so later slots of the video skip it."""
+    if image_path and IMAGE_HASH_CHECK and seen_hashes is not None:
+        value = image_hash_engine.compute_dhash(image_path)
+        if value is not None:
+            with _seen_hashes_lock:
+                seen_hashes.append(value)
+    return image_path
+
+
+def _acquire_image(search_query: str, width: int, height: int, cancel: threading.Event = None,
+                   placed: set = None, seen_hashes: list = None) -> Optional[str]:
+    """
+    Get one graded image for a query: image cache first, then the providers.
+    
+    A cached photo is reused until it has appeared in IMAGE_CACHE_MAX_REUSE videos
+    (that budget replaces the recent-video cooldown for cache hits); after that a
+    fresh one is fetched. Fresh candidates that match a photo from a recent video
+    (perceptual hash) are skipped, and no photo appears twice in one video. If every
+    provider fails, an overused cached photo still beats a placeholder.
     
+    Args:
+        search_query: Image search query
+        width: Target width
+        height: Target height
+        cancel: Stops the cascade between providers once set (batch deadline)
+        placed: Cache entry ids already used in the current video (shared by the batch)
+        seen_hashes: dHashes already used in the current video (shared by the batch)
+        
+    Returns:
+        Path to a graded JPEG in the image cache, or None if nothing was found
+    """
+    if placed is None:
+        placed = set()
+    
+    for _ in range(IMAGE_CANDIDATE_ATTEMPTS if IMAGE_CACHE_ENABLED else 0):
+        entry = image_cache_engine.claim(search_query, exclude=placed)
+        if entry is None:
+            break
+        path = _graded_from_cache(entry, width, height)
+        if path and _is_fresh_photo(path, seen_hashes, check_history=False):
+            return path
+        # Not placed: give the reuse slot back
+        image_cache_engine.release(entry["id"])
+    
+    fallback = None
+    fetched = set()
+    for candidate in range(IMAGE_CANDIDATE_ATTEMPTS):
+        if cancel is not None and cancel.is_set():
+            break
+        provider_name, content = _fetch_image_content(search_query, width, height, cancel, page=candidate + 1)
+        if content is None:
+            break
+        entry = image_cache_engine.store(provider_name, search_query, content, exclude=placed)
+        if entry["id"] in fetched:
+            # The provider has nothing new for this query - more attempts would only burn quota
+            break
+        fetched.add(entry["id"])
+        path = _graded_from_cache(entry, width, height)
+        if path and _is_fresh_photo(path, seen_hashes):
+            return path
+        fallback = fallback or path
+    
+    if fallback:
+        # Only recently used photos came back - still better than a placeholder
+        return _mark_seen(fallback, seen_hashes)
+    
+    if IMAGE_CACHE_ENABLED and (cancel is None or not cancel.is_set()):
+        entry = image_cache_engine.claim(search_query, allow_overused=True, exclude=placed)
+        if entry is not None:
+            return _mark_seen(_graded_from_cache(entry, width, height), seen_hashes)
     return None
 
 
+def _download_single_image(search_query: str, output_path: str, width: int, height: int) -> Optional[str]:
+    """
+    Download a single image using the search query.
+    Internal helper function for multi-image downloads.
+    """
+    image_path = _acquire_image(search_query, width, height)
+    if image_path is None:
+        return None
+    
+    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+    shutil.copyfile(image_path, output_path)
+    return output_path
+
+
+def _placeholder_variant(width: int, height: int, seed: int) -> str:
+    """
+    Path of a pre-graded placeholder variant, rendered once and memoized on disk.
+    
+    Each seed shifts the glow centre and tint slightly so consecutive
+    placeholders don't look identical.
+    
+    Args:
+        width: Image width
+        height: Image height
+        seed: Variant number (0 .. PLACEHOLDER_VARIANTS-1)
+        
+    Returns:
+        Path to the placeholder JPEG in the image cache directory
+    """
+    path = os.path.join(IMAGE_CACHE_DIR, f"placeholder_{width}x{height}_{seed}.jpg")
+    if os.path.exists(path):
+        return path
+    
+    from PIL import Image as PILImage
+    import numpy as np
+    
+    rng = np.random.default_rng(seed)
+    base = np.array([10, 10, 15], dtype=np.float32) + rng.integers(-3, 4, 3)  # Very dark blue-gray
+    center_x = width * rng.uniform(0.4, 0.6)
+    center_y = height * rng.uniform(0.35, 0.55)
+    
+    # Lighter in the centre, darker at the edges
+    y_coords, x_coords = np.ogrid[:height, :width]
+    distances = np.hypot(x_coords - center_x, y_coords - center_y)
+    brightness_factor = np.clip(1.0 - (distances / np.hypot(width / 2, height / 2)) * 0.3, 0.7, 1.0)
+    img_array = (brightness_factor[:, :, None] * base).astype(np.uint8)
+    
+    # Apply horror color grading even to placeholder
+    img = _apply_horror_color_grading(PILImage.fromarray(img_array))
+    
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    img.save(temp_path, 'JPEG', quality=95)
+    os.replace(temp_path, path)
+    return path
+
+
 def _create_placeholder_image(output_path: str, width: int, height: int) -> Optional[str]:
-    """Create a dark placeholder image."""
+    """
+    Create a dark placeholder image (a file copy of a memoized variant).
+    
+    Variants rotate so consecutive fallbacks differ.
+    """
+    global _placeholder_counter
     try:
-        from PIL import Image as PILImage
-        import numpy as np
-        
-        img = PILImage.new('RGB', (width, height), color=(10, 10, 15))
-        img_array = np.array(img)
-        center_x, center_y = width // 2, height // 2
-        
-        y_coords, x_coords = np.ogrid[:height, :width]
-        distances = np.sqrt((x_coords - center_x)**2 + (y_coords - center_y)**2)
-        max_dist = np.sqrt(center_x**2 + center_y**2)
-        
-        brightness_factor = 1.0 - (distances / max_dist) * 0.3
-        brightness_factor = np.clip(brightness_factor, 0.7, 1.0)
-        
-        for c in range(3):
-            img_array[:, :, c] = (img_array[:, :, c] * brightness_factor).astype(np.uint8)
-        
-        img = PILImage.fromarray(img_array)
-        img = _apply_horror_color_grading(img)
+        with _grading_lock:
+            seed = _placeholder_counter % PLACEHOLDER_VARIANTS
+            _placeholder_counter += 1
+        variant_path = _placeholder_variant(width, height, seed)
         
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-        img.save(output_path, 'JPEG', quality=95)
+        shutil.copyfile(variant_path, output_path)
         return output_path
     except Exception:
         return None
@@ -563,158 +1046,24 @@ def download_horror_image(
     print(f"      🎯 Narrative-matched search query: {search_query}")
     print(f"      📍 Story elements: {', '.join(keywords[:4])}")
     
-    # Priority 1: Try Unsplash API (if key provided)
-    if UNSPLASH_ACCESS_KEY:
-        # Use official API
-        api_url = "https://api.unsplash.com/photos/random"
-        headers = {
-            "Authorization": f"Client-ID {UNSPLASH_ACCESS_KEY}"
-        }
-        params = {
-            "query": search_query,
-            "orientation": "portrait",
-            "w": width,
-            "h": height
-        }
-        
-        try:
-            response = requests.get(api_url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                image_url = data.get("urls", {}).get("regular") or data.get("urls", {}).get("full")
-                
-                if image_url:
-                    # Download image
-                    img_response = requests.get(image_url, timeout=15)
-                    if img_response.status_code == 200:
-                        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-                        with open(output_path, 'wb') as f:
-                            f.write(img_response.content)
-                        
-                        # Resize and process image for horror aesthetic
-                        from PIL import Image, ImageEnhance
-                        img = Image.open(output_path)
-                        img = img.convert('RGB')
-                        img = img.resize((width, height), Image.Resampling.LANCZOS)
-                        
-                        # Apply horror color grading to match cinematics
-                        img = _apply_horror_color_grading(img)
-                        
-                        img.save(output_path, 'JPEG', quality=95)
-                        
-                        print(f"      ✓ Image downloaded and processed: {output_path}")
-                        return output_path
-        except Exception as e:
-            print(f"      ⚠️ Unsplash API failed: {e}, trying Pexels...")
-    
-    # Priority 2: Try Pexels API (if key provided - more reliable than Unsplash Source)
-    if PEXELS_API_KEY:
-        print(f"      🔄 Trying Pexels API...")
-        try:
-            pexels_url = "https://api.pexels.com/v1/search"
-            headers = {
-                "Authorization": PEXELS_API_KEY  # Pexels uses API key directly as Authorization header
-            }
-            params = {
-                "query": search_query,
-                "per_page": 1,
-                "orientation": "portrait"
-            }
-            
-            response = requests.get(pexels_url, headers=headers, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('photos') and len(data['photos']) > 0:
-                    photo = data['photos'][0]
-                    image_url = photo.get('src', {}).get('large') or photo.get('src', {}).get('original')
-                    
-                    if image_url:
-                        img_response = requests.get(image_url, timeout=15)
-                        if img_response.status_code == 200:
-                            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-                            with open(output_path, 'wb') as f:
-                                f.write(img_response.content)
-                            
-                            # Process image
-                            from PIL import Image
-                            img = Image.open(output_path)
-                            img = img.convert('RGB')
-                            img = img.resize((width, height), Image.Resampling.LANCZOS)
-                            img = _apply_horror_color_grading(img)
-                            img.save(output_path, 'JPEG', quality=95)
-                            
-                            print(f"      ✓ Image downloaded from Pexels: {output_path}")
-                            return output_path
-        except Exception as e:
-            print(f"      ⚠️ Pexels API failed: {e}, trying Unsplash Source...")
-    
-    # Priority 3: Fallback to Unsplash Source (free, no API key needed but less reliable)
-    try:
-        fallback_url = f"https://source.unsplash.com/{width}x{height}/?{search_query.replace(' ', ',')}"
-        print(f"      Using Unsplash Source (fallback)...")
+    # Image cache, then Unsplash / Pexels / Unsplash Source (hedged race, or cascade if IMAGE_HEDGING=0)
+    image_path = _acquire_image(search_query, width, height)
+    if image_path is not None:
+        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
+        shutil.copyfile(image_path, output_path)
         
-        img_response = requests.get(fallback_url, timeout=15, allow_redirects=True)
-        if img_response.status_code == 200 and len(img_response.content) > 10000:  # Ensure valid image
-            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-            with open(output_path, 'wb') as f:
-                f.write(img_response.content)
-            
-            # Resize and process image for horror aesthetic
-            from PIL import Image, ImageEnhance
-            img = Image.open(output_path)
-            img = img.convert('RGB')
-            img = img.resize((width, height), Image.Resampling.LANCZOS)
-            
-            # Apply horror color grading to match cinematics
-            img = _apply_horror_color_grading(img)
-            
-            img.save(output_path, 'JPEG', quality=95)
-            
-            print(f"      ✓ Image downloaded and processed (Unsplash Source): {output_path}")
-            return output_path
-    except Exception as e:
-        print(f"      ⚠️ Unsplash Source failed: {e}")
+        print(f"      ✓ Image downloaded and processed: {output_path}")
+        return output_path
     
     # Last resort: Use a dark horror-themed placeholder (NO TEXT - just dark gradient)
     print(f"      ⚠️ All image sources failed, using dark placeholder...")
-    try:
-        from PIL import Image as PILImage, ImageDraw
-        import numpy as np
-        
-        # Create dark gradient background (more interesting than solid color)
-        img = PILImage.new('RGB', (width, height), color=(10, 10, 15))  # Very dark blue-gray
-        
-        # Add subtle gradient from center using numpy for efficiency
-        img_array = np.array(img)
-        center_x, center_y = width // 2, height // 2
-        
-        y_coords, x_coords = np.ogrid[:height, :width]
-        distances = np.sqrt((x_coords - center_x)**2 + (y_coords - center_y)**2)
-        max_dist = np.sqrt(center_x**2 + center_y**2)
-        
-        # Create gradient (lighter in center, darker at edges)
-        brightness_factor = 1.0 - (distances / max_dist) * 0.3
-        brightness_factor = np.clip(brightness_factor, 0.7, 1.0)
-        
-        # Apply gradient to all channels
-        for c in range(3):
-            img_array[:, :, c] = (img_array[:, :, c] * brightness_factor).astype(np.uint8)
-        
-        img = PILImage.fromarray(img_array)
-        
-        # Apply horror color grading even to placeholder
-        img = _apply_horror_color_grading(img)
-        
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
-        img.save(output_path, 'JPEG', quality=95)
-        
+    placeholder_path = _create_placeholder_image(output_path, width, height)
+    if placeholder_path:
         print(f"      ⚠️ Dark placeholder created (no actual image): {output_path}")
-        return output_path
-    except Exception as e:
-        print(f"      ❌ Failed to create placeholder: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+        return placeholder_path
+    
+    print(f"      ❌ Failed to create placeholder")
+    return None
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ import json
 from datetime import datetime
 from typing import List, Optional
 from moviepy import VideoFileClip, concatenate_videoclips, CompositeVideoClip, ColorClip
+from departments.production.probe_engine import probe_many
 
 
 def _get_compiled_videos() -> set:
@@ -126,6 +127,13 @@ def create_marathon_compilation(
         if os.path.basename(v) not in compiled
     ]
     
+    # Probe headers (cached) so broken or audio-only files never reach the decoder
+    probed = probe_many(available_videos)
+    available_videos = [
+        v for v in available_videos
+        if v in probed and probed[v].get('video_codec') and (probed[v].get('duration') or 0) > 0
+    ]
+    
     if len(available_videos) < num_videos:
         print(f"   ⚠️ Only {len(available_videos)} unused videos available, using all of them")
         selected_videos = available_videos
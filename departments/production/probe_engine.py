@@ -0,0 +1,342 @@
+"""
+THE PROBE ENGINE
+Module: Lightweight media metadata (duration, resolution, fps, codecs, sample rate).
+
+Reads container headers only - never opens a decoder:
+- WAV: RIFF header via the wave module
+- MP3: ID3 skip + first frame header (+ Xing/Info/VBRI frame count for VBR)
+- Everything else: ffprobe JSON (format + stream headers)
+
+Results are cached by (path, size, mtime) in memory and in a small JSON file,
+so re-probing a library of hundreds of Shorts costs a stat() per file.
+"""
+
+import os
+import json
+import wave
+import struct
+import subprocess
+import threading
+from typing import Dict, List, Optional
+
+from config.paths import TEMP_DIR
+
+
+PROBE_CACHE_FILE = os.path.join(TEMP_DIR, "probe_cache.json")
+
+_cache: Dict[str, Dict] = {}
+_cache_loaded = False
+_cache_lock = threading.Lock()
+
+# MPEG audio header tables
+_MP3_BITRATES = {
+    # (version_is_mpeg1, layer) -> kbps table indexed by bitrate index
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+
+def _empty_info() -> Dict:
+    """
+    Metadata dict with every field present.
+
+    Returns:
+        Dict with None for unknown fields
+    """
+    return {
+        "duration": None,
+        "width": None,
+        "height": None,
+        "fps": None,
+        "video_codec": None,
+        "audio_codec": None,
+        "sample_rate": None,
+        "channels": None,
+    }
+
+
+def _probe_wav(path: str) -> Dict:
+    """
+    Read duration and format from a WAV header.
+
+    Args:
+        path: Path to .wav file
+
+    Returns:
+        Metadata dict
+    """
+    with wave.open(path, 'rb') as wav_file:
+        info = _empty_info()
+        info["sample_rate"] = wav_file.getframerate()
+        info["channels"] = wav_file.getnchannels()
+        info["audio_codec"] = "pcm_s%dle" % (8 * wav_file.getsampwidth())
+        info["duration"] = wav_file.getnframes() / float(wav_file.getframerate())
+        return info
+
+
+def _probe_mp3(path: str) -> Dict:
+    """
+    Read duration and format from MP3 frame headers (Layer III only).
+
+    Uses the Xing/Info or VBRI frame count when present, otherwise assumes CBR.
+
+    Args:
+        path: Path to .mp3 file
+
+    Returns:
+        Metadata dict
+
+    Raises:
+        Exception: If no valid frame header is found
+    """
+    file_size = os.path.getsize(path)
+
+    with open(path, 'rb') as f:
+        head = f.read(10)
+        offset = 0
+        # Skip ID3v2 tag (syncsafe size)
+        if head[:3] == b'ID3' and len(head) == 10:
+            size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            offset = 10 + size + (10 if head[5] & 0x10 else 0)
+
+        f.seek(offset)
+        data = f.read(64 * 1024)
+
+    # Find the first frame sync
+    for i in range(len(data) - 4):
+        if data[i] != 0xFF or (data[i + 1] & 0xE0) != 0xE0:
+            continue
+
+        header = struct.unpack('>I', data[i:i + 4])[0]
+        version = (header >> 19) & 0x3
+        layer_bits = (header >> 17) & 0x3
+        bitrate_index = (header >> 12) & 0xF
+        rate_index = (header >> 10) & 0x3
+        padding = (header >> 9) & 0x1
+        channel_mode = (header >> 6) & 0x3
+
+        if version == 1 or layer_bits != 1 or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+
+        mpeg1 = version == 3
+        bitrate = _MP3_BITRATES[(mpeg1, 3)][bitrate_index] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+        samples_per_frame = 1152 if mpeg1 else 576
+        frame_length = int(samples_per_frame / 8 * bitrate / sample_rate) + padding
+        channels = 1 if channel_mode == 3 else 2
+        if frame_length <= 0:
+            continue
+
+        # Xing/Info header sits after the side information in the first frame
+        side_info = (17 if channels == 1 else 32) if mpeg1 else (9 if channels == 1 else 17)
+        xing_at = i + 4 + side_info
+        frames = None
+        tag = data[xing_at:xing_at + 4]
+        if tag in (b'Xing', b'Info'):
+            flags = struct.unpack('>I', data[xing_at + 4:xing_at + 8])[0]
+            if flags & 0x1:
+                frames = struct.unpack('>I', data[xing_at + 8:xing_at + 12])[0]
+        elif data[i + 36:i + 40] == b'VBRI':
+            frames = struct.unpack('>I', data[i + 50:i + 54])[0]
+
+        info = _empty_info()
+        info["audio_codec"] = "mp3"
+        info["sample_rate"] = sample_rate
+        info["channels"] = channels
+        if frames:
+            info["duration"] = frames * samples_per_frame / float(sample_rate)
+        else:
+            audio_bytes = file_size - offset - i
+            info["duration"] = audio_bytes * 8 / float(bitrate)
+        return info
+
+    raise Exception(f"No MP3 frame header found in {path}")
+
+
+def _probe_ffprobe(path: str) -> Dict:
+    """
+    Read container and stream headers with ffprobe (no decoding).
+
+    Args:
+        path: Path to any media file
+
+    Returns:
+        Metadata dict
+
+    Raises:
+        Exception: If ffprobe is missing or fails
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-print_format', 'json',
+        '-show_format', '-show_streams',
+        path
+    ]
+    result = subprocess.run(cmd, capture_output=True, timeout=30)
+    if result.returncode != 0:
+        raise Exception(f"ffprobe failed: {result.stderr.decode(errors='ignore')[:200]}")
+
+    data = json.loads(result.stdout or b'{}')
+    info = _empty_info()
+
+    duration = data.get('format', {}).get('duration')
+    for stream in data.get('streams', []):
+        codec_type = stream.get('codec_type')
+        if codec_type == 'video' and info["video_codec"] is None:
+            # Cover art in audio files is an attached picture, not a video track
+            if stream.get('disposition', {}).get('attached_pic'):
+                continue
+            info["video_codec"] = stream.get('codec_name')
+            info["width"] = stream.get('width')
+            info["height"] = stream.get('height')
+            rate = stream.get('avg_frame_rate') or stream.get('r_frame_rate') or '0/0'
+            num, _, den = rate.partition('/')
+            if den and float(den) > 0:
+                info["fps"] = float(num) / float(den)
+            duration = duration or stream.get('duration')
+        elif codec_type == 'audio' and info["audio_codec"] is None:
+            info["audio_codec"] = stream.get('codec_name')
+            info["sample_rate"] = int(stream.get('sample_rate') or 0) or None
+            info["channels"] = stream.get('channels')
+            duration = duration or stream.get('duration')
+
+    info["duration"] = float(duration) if duration not in (None, 'N/A') else None
+    return info
+
+
+def _load_cache() -> None:
+    """Load the on-disk probe cache once per process."""
+    global _cache_loaded
+    if _cache_loaded:
+        return
+    _cache_loaded = True
+    if not os.path.exists(PROBE_CACHE_FILE):
+        return
+    try:
+        with open(PROBE_CACHE_FILE, 'r') as f:
+            data = json.load(f)
+            if isinstance(data, dict):
+                _cache.update(data)
+    except Exception:
+        pass
+
+
+def _save_cache() -> None:
+    """Persist the probe cache (atomic replace)."""
+    try:
+        temp_path = PROBE_CACHE_FILE + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(_cache, f)
+        os.replace(temp_path, PROBE_CACHE_FILE)
+    except Exception as e:
+        print(f"   ⚠️ Could not save probe cache: {e}")
+
+
+def probe_media(path: str, persist: bool = True) -> Dict:
+    """
+    Probe a media file's metadata from its headers (cached by path, size, mtime).
+
+    Args:
+        path: Path to an audio or video file
+        persist: Write new results to the on-disk cache immediately
+
+    Returns:
+        Dict with 'duration' (seconds), 'width', 'height', 'fps', 'video_codec',
+        'audio_codec', 'sample_rate', 'channels' (None when not applicable)
+
+    Raises:
+        Exception: If the file is missing or no prober can read it
+    """
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+
+    with _cache_lock:
+        _load_cache()
+        cached = _cache.get(key)
+        if cached and cached.get("size") == stat.st_size and cached.get("mtime") == stat.st_mtime:
+            return dict(cached["info"])
+
+    extension = os.path.splitext(path)[1].lower()
+    info = None
+    try:
+        if extension == '.wav':
+            info = _probe_wav(path)
+        elif extension == '.mp3':
+            info = _probe_mp3(path)
+    except Exception:
+        info = None
+
+    if info is None:
+        info = _probe_ffprobe(path)
+
+    with _cache_lock:
+        _cache[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "info": info}
+        if persist:
+            _save_cache()
+
+    return dict(info)
+
+
+def probe_many(paths: List[str]) -> Dict[str, Dict]:
+    """
+    Probe a batch of files, writing the on-disk cache once at the end.
+
+    Files that cannot be probed are left out of the result.
+
+    Args:
+        paths: Media file paths
+
+    Returns:
+        Dict mapping path -> metadata dict
+    """
+    results = {}
+    for path in paths:
+        try:
+            results[path] = probe_media(path, persist=False)
+        except Exception as e:
+            print(f"   ⚠️ Could not probe {os.path.basename(path)}: {e}")
+
+    with _cache_lock:
+        _save_cache()
+    return results
+
+
+def get_media_duration(path: str, default: Optional[float] = None) -> Optional[float]:
+    """
+    Duration of a media file in seconds, from headers only.
+
+    Args:
+        path: Path to an audio or video file
+        default: Value returned if probing fails (re-raises when None)
+
+    Returns:
+        Duration in seconds
+    """
+    try:
+        duration = probe_media(path)["duration"]
+        if duration is None:
+            raise Exception(f"No duration in {path}")
+        return duration
+    except Exception:
+        if default is None:
+            raise
+        return default
+
+
+if __name__ == "__main__":
+    # Test the probe engine
+    import sys
+    import time
+
+    print("=" * 60)
+    print("🧪 TESTING PROBE ENGINE")
+    print("=" * 60)
+
+    for media_path in sys.argv[1:]:
+        started = time.perf_counter()
+        print(f"{media_path}: {probe_media(media_path)} ({(time.perf_counter() - started) * 1000:.1f}ms)")
@@ -10,6 +10,14 @@ import urllib.request
 import gc
 from moviepy import VideoFileClip, AudioFileClip, CompositeVideoClip, TextClip, ColorClip, ImageClip, ImageClip
 import numpy as np
+from departments.intelligence.lexicon_engine import compile_lexicon, hits_by_category
+
+
+# KEYWORD COLORS (Retention Hack): whole phrase block turns red (scary) or yellow (mystery)
+SUBTITLE_KEYWORDS = compile_lexicon({
+    "scary": ['scary', 'terrifying', 'disturbing', 'dead', 'death', 'blood', 'ghost', 'demon', 'killer', 'murder', 'horror', 'scream', 'shocking'],
+    "mystery": ['unsolved', 'mystery', 'secret', 'hidden', 'vanishing', 'disappeared', 'lost', 'unknown', 'never'],
+}, match_plurals=True)
 
 
 def _ensure_font_exists():
@@ -249,6 +257,28 @@ def animate_scene(image_path: str, audio_duration: float, output_path: str) -> s
             raise Exception(f"Animation and fallback both failed: {e}, {fallback_error}")
 
 
+def _scene_still_clip(image_path: str, duration: float):
+    """
+    Still 1080x1920 clip standing in for a scene whose visual failed.
+    
+    Args:
+        image_path: Image to hold (e.g. the image hook), or None for plain black
+        duration: Clip duration in seconds
+        
+    Returns:
+        MoviePy clip
+    """
+    if image_path and os.path.exists(image_path):
+        try:
+            still = ImageClip(image_path, duration=duration)
+            if still.size != (1080, 1920):
+                still = still.resized((1080, 1920))
+            return still
+        except Exception as e:
+            print(f"      ⚠️ Could not load still {image_path}: {e}")
+    return ColorClip(size=(1080, 1920), color=(0, 0, 0), duration=duration)
+
+
 def assemble_scene_video(scene_video_paths: list, scene_audio_paths: list, all_subtitles: list, scenes: list, output_path: str, image_hook_path: str = None) -> str:
     """
     Assemble final video from scene-based assets (Editor Agent).
@@ -257,7 +287,8 @@ def assemble_scene_video(scene_video_paths: list, scene_audio_paths: list, all_s
     Applies Red Progress Bar and Background Music on top of the whole sequence.
     
     Args:
-        scene_video_paths: List of paths to scene video files (scene_1.mp4, scene_2.mp4, etc.)
+        scene_video_paths: List of paths to scene video files (scene_1.mp4, scene_2.mp4, etc.);
+            None for scenes whose visual failed (a still is held instead)
         scene_audio_paths: List of paths to scene audio files (audio_1.mp3, audio_2.mp3, etc.)
         all_subtitles: List of subtitle lists (one per scene)
         scenes: List of scene dicts with 'id', 'text', 'duration'
@@ -289,8 +320,13 @@ def assemble_scene_video(scene_video_paths: list, scene_audio_paths: list, all_s
             print(f"   Scene {scene_id}: Combining video + audio...")
             
             # Load video and audio for this scene
-            scene_video = VideoFileClip(video_path)
             scene_audio = AudioFileClip(audio_path)
+            if video_path and os.path.exists(video_path):
+                scene_video = VideoFileClip(video_path)
+            else:
+                # Visual sourcing failed for this scene: hold a still instead of dropping the video
+                print(f"      ⚠️ No visual for scene {scene_id}, substituting a still")
+                scene_video = _scene_still_clip(image_hook_path, scene_audio.duration)
             
             # Get actual durations
             actual_audio_duration = scene_audio.duration
@@ -423,10 +459,6 @@ def assemble_scene_video(scene_video_paths: list, scene_audio_paths: list, all_s
         
         text_clips = []
         
-        # KEYWORD COLORS (Retention Hack)
-        SCARY_WORDS = ['scary', 'terrifying', 'disturbing', 'dead', 'death', 'blood', 'ghost', 'demon', 'killer', 'murder', 'horror', 'scream', 'shocking']
-        MYSTERY_WORDS = ['unsolved', 'mystery', 'secret', 'hidden', 'vanishing', 'disappeared', 'lost', 'unknown', 'never']
-        
         for phrase in phrase_blocks:
             text = phrase.get('text', '').strip()
             start = phrase.get('start', 0)
@@ -448,10 +480,10 @@ def assemble_scene_video(scene_video_paths: list, scene_audio_paths: list, all_s
                 }
                 
                 # Check if phrase contains keywords to change entire block color (higher impact)
-                text_lower = text.lower()
-                if any(w in text_lower for w in SCARY_WORDS):
+                keyword_hits = hits_by_category(text, SUBTITLE_KEYWORDS)
+                if 'scary' in keyword_hits:
                     clip_kwargs['color'] = '#FF0000' # Blood Red
-                elif any(w in text_lower for w in MYSTERY_WORDS):
+                elif 'mystery' in keyword_hits:
                     clip_kwargs['color'] = '#FFE500' # Golden Yellow
                 
                 arial_fonts = [
@@ -769,10 +801,6 @@ def assemble_video(video_path: str, audio_path: str, subtitles: list, output_pat
         
         text_clips = []
         
-        # KEYWORD COLORS (Retention Hack)
-        SCARY_WORDS = ['scary', 'terrifying', 'disturbing', 'dead', 'death', 'blood', 'ghost', 'demon', 'killer', 'murder', 'horror', 'scream', 'shocking']
-        MYSTERY_WORDS = ['unsolved', 'mystery', 'secret', 'hidden', 'vanishing', 'disappeared', 'lost', 'unknown', 'never']
-        
         # Create TextClip for each phrase block
         for phrase in phrase_blocks:
             text = phrase.get('text', '').strip()
@@ -799,10 +827,10 @@ def assemble_video(video_path: str, audio_path: str, subtitles: list, output_pat
                 }
                 
                 # Check for keywords and colorize
-                text_lower = text.lower()
-                if any(w in text_lower for w in SCARY_WORDS):
+                keyword_hits = hits_by_category(text, SUBTITLE_KEYWORDS)
+                if 'scary' in keyword_hits:
                     clip_kwargs['color'] = '#FF0000' # Red
-                elif any(w in text_lower for w in MYSTERY_WORDS):
+                elif 'mystery' in keyword_hits:
                     clip_kwargs['color'] = '#FFE500' # Yellow
                 
                 # Try preferred fonts
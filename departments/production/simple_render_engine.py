@@ -11,6 +11,18 @@ import math
 from moviepy import AudioFileClip, ImageClip, CompositeVideoClip, ColorClip, TextClip
 from typing import List, Optional
 import numpy as np
+from departments.intelligence.lexicon_engine import compile_lexicon, find_hits
+
+
+# High-Emotion Highlighting: phrases with these words go red + uppercase
+SCARY_KEYWORDS = compile_lexicon({
+    "scary": [
+        'blood', 'ghost', 'kill', 'killer', 'murder', 'dead', 'death', 'horror',
+        'scary', 'terrifying', 'fear', 'dark', 'night', 'demon', 'scream',
+        'shadow', 'evil', 'curse', 'unsolved', 'mystery', 'missing', 'alone',
+        'paranormal', 'haunting', 'hell', 'grave', 'buried'
+    ]
+})
 
 
 def _ensure_font_exists():
@@ -213,29 +225,16 @@ def render_horror_video(
             
             print(f"   Loading image {i+1}/{num_images}: {os.path.basename(img_path)}")
             
-            # Convert image to RGB if needed
+            # Load and prepare image (decoded once; JPEGs larger than needed decode at reduced scale)
             from PIL import Image as PILImage
-            temp_image_path = None
-            try:
-                pil_img = PILImage.open(img_path)
-                if pil_img.mode != 'RGB':
-                    pil_img = pil_img.convert('RGB')
-                temp_image_path = img_path.replace('.jpg', f'_temp_rgb_{i}.jpg').replace('.png', f'_temp_rgb_{i}.jpg')
-                if temp_image_path == img_path:
-                    temp_image_path = img_path + f'_temp_rgb_{i}.jpg'
-                pil_img.save(temp_image_path, 'JPEG', quality=95)
-                image_path_to_use = temp_image_path
-            except Exception as e:
-                print(f"   ⚠️ PIL conversion failed: {e}, using original image")
-                image_path_to_use = img_path
-            
-            # Load and prepare image
-            pil_original = PILImage.open(image_path_to_use)
+            pil_original = PILImage.open(img_path)
+            pil_original.draft('RGB', target_size)
             if pil_original.mode != 'RGB':
                 pil_original = pil_original.convert('RGB')
             
-            # Resize to target size
-            pil_original = pil_original.resize(target_size, PILImage.Resampling.LANCZOS)
+            # Resize to target size (ingested images already match the full-screen size)
+            if pil_original.size != target_size:
+                pil_original = pil_original.resize(target_size, PILImage.Resampling.LANCZOS)
             
             # Create zoomed version for Ken Burns
             zoom_factor = 1.08
@@ -475,13 +474,6 @@ def render_horror_video(
             # - Larger font (120px) - mobile-first
             # - High-Emotion Highlighting: Scary words in Red/Uppercase
             
-            SCARY_KEYWORDS = [
-                'blood', 'ghost', 'kill', 'killer', 'murder', 'dead', 'death', 'horror', 
-                'scary', 'terrifying', 'fear', 'dark', 'night', 'demon', 'scream', 
-                'shadow', 'evil', 'curse', 'unsolved', 'mystery', 'missing', 'alone',
-                'paranormal', 'haunting', 'hell', 'grave', 'buried'
-            ]
-            
             def group_subtitles_smart(subtitles, max_chars=35):
                 """Group words into readable phrase blocks with smart timing."""
                 if not subtitles:
@@ -550,7 +542,7 @@ def render_horror_video(
                 
                 # SMART HIGHLIGHTING (Market Logic)
                 # Check if phrase contains scary words
-                contains_scary = any(word.lower().strip(',.?!') in SCARY_KEYWORDS for word in text.split())
+                contains_scary = bool(find_hits(text, SCARY_KEYWORDS))
                 
                 # If scary, make uppercase and change color to RED for impact
                 display_text = text.upper() if contains_scary else text
@@ -711,8 +703,6 @@ def render_horror_video(
         try:
             if os.path.exists(temp_audio_path):
                 os.remove(temp_audio_path)
-            if temp_image_path and os.path.exists(temp_image_path) and temp_image_path != image_path:
-                os.remove(temp_image_path)
         except:
             pass
         
@@ -0,0 +1,255 @@
+"""
+THE TIMELINE ENGINE
+Module: Edit Decision List (EDL) for the audio timeline.
+
+Every timing change to the voiceover (silence cuts, dramatic pauses, time-stretch)
+is described as an edit in SOURCE time. The EDL is compiled once into a segment
+table, then applied once to the PCM buffer and once to the subtitle array, so
+edits compose without repeated buffer copies or subtitle drift.
+"""
+
+from typing import List, Dict, Tuple
+import numpy as np
+
+
+# Segment table: (src_start, src_end, out_start, out_end) arrays in seconds.
+# Only source-backed audio appears; cuts are missing ranges and inserts are output gaps.
+SegmentTable = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def cut(start: float, end: float) -> Dict:
+    """
+    Edit: remove source audio between start and end.
+
+    Args:
+        start: Source start time in seconds
+        end: Source end time in seconds
+
+    Returns:
+        Edit dict
+    """
+    return {"type": "cut", "start": float(start), "end": float(end)}
+
+
+def insert_silence(at: float, duration: float) -> Dict:
+    """
+    Edit: insert silence before the source audio at a given time.
+
+    Args:
+        at: Source time in seconds (audio at this time plays after the pause)
+        duration: Pause length in seconds
+
+    Returns:
+        Edit dict
+    """
+    return {"type": "insert", "at": float(at), "duration": float(duration)}
+
+
+def stretch(start: float, end: float, factor: float) -> Dict:
+    """
+    Edit: time-stretch source audio between start and end.
+
+    Resamples like the 0.96x pacing trick (pitch follows speed).
+
+    Args:
+        start: Source start time in seconds
+        end: Source end time in seconds
+        factor: Output/source duration ratio (>1.0 is slower, <1.0 is faster)
+
+    Returns:
+        Edit dict
+    """
+    return {"type": "stretch", "start": float(start), "end": float(end), "factor": float(factor)}
+
+
+def compile_edl(edl: List[Dict], duration: float) -> Tuple[SegmentTable, List[Tuple[float, float]]]:
+    """
+    Compile an EDL into a segment table plus the output windows of inserted silence.
+
+    Overlapping cuts merge, overlapping stretches multiply, and an insert that lands
+    inside a cut is emitted at the cut point.
+
+    Args:
+        edl: List of edit dicts (cut / insert / stretch)
+        duration: Source duration in seconds
+
+    Returns:
+        Tuple of (segment_table, insert_windows)
+        insert_windows: List of (out_start, out_end) silence ranges in output time
+    """
+    cuts = [(e["start"], e["end"]) for e in edl if e["type"] == "cut"]
+    stretches = [(e["start"], e["end"], e["factor"]) for e in edl if e["type"] == "stretch"]
+    inserts = [(e["at"], e["duration"]) for e in edl if e["type"] == "insert" and e["duration"] > 0]
+
+    # Elementary intervals between every edit boundary
+    points = [0.0, duration]
+    points += [t for c in cuts for t in c] + [t for s in stretches for t in s[:2]] + [i[0] for i in inserts]
+    bounds = np.unique(np.clip(points, 0.0, duration))
+
+    src_start, src_end, out_start, out_end = [], [], [], []
+    insert_windows = []
+    insert_at = np.clip(np.array([i[0] for i in inserts], dtype=np.float64), 0.0, duration)
+    insert_len = np.array([i[1] for i in inserts], dtype=np.float64)
+
+    cursor = 0.0
+    pending = 0.0
+    for i, left in enumerate(bounds):
+        # Inserts anchored at this boundary play before the audio that follows it
+        pending += float(insert_len[insert_at == left].sum())
+        if i == len(bounds) - 1:
+            break
+        right = bounds[i + 1]
+        mid = (left + right) / 2
+
+        if any(start <= mid < end for start, end in cuts):
+            continue
+
+        if pending:
+            insert_windows.append((float(cursor), float(cursor + pending)))
+            cursor += pending
+            pending = 0.0
+
+        factor = 1.0
+        for start, end, f in stretches:
+            if start <= mid < end:
+                factor *= f
+
+        length = (right - left) * factor
+        src_start.append(left)
+        src_end.append(right)
+        out_start.append(cursor)
+        out_end.append(cursor + length)
+        cursor += length
+
+    # Inserts at the very end (or after a trailing cut)
+    if pending:
+        insert_windows.append((float(cursor), float(cursor + pending)))
+
+    table = (np.array(src_start), np.array(src_end), np.array(out_start), np.array(out_end))
+    return table, insert_windows
+
+
+def map_times(times, table: SegmentTable) -> np.ndarray:
+    """
+    Map source timestamps to output timestamps (vectorized).
+
+    Times inside a cut collapse onto the cut point.
+
+    Args:
+        times: Sequence or array of source timestamps in seconds
+        table: Segment table from compile_edl()
+
+    Returns:
+        Array of output timestamps in seconds
+    """
+    times = np.asarray(times, dtype=np.float64)
+    src_start, src_end, out_start, out_end = table
+    if len(src_start) == 0:
+        return np.zeros_like(times)
+
+    idx = np.clip(np.searchsorted(src_start, times, side="right") - 1, 0, len(src_start) - 1)
+    src_len = src_end[idx] - src_start[idx]
+    local = np.clip(times - src_start[idx], 0.0, src_len)
+    rate = (out_end[idx] - out_start[idx]) / np.where(src_len > 0, src_len, 1.0)
+    return out_start[idx] + local * rate
+
+
+def apply_edl_to_subtitles(subtitles: List[Dict], edl: List[Dict], duration: float) -> List[Dict]:
+    """
+    Apply an EDL to subtitle timestamps in one vectorized pass.
+
+    Args:
+        subtitles: List of subtitle dicts with 'word', 'start', 'end' keys (source time)
+        edl: List of edit dicts
+        duration: Source duration in seconds
+
+    Returns:
+        New list of subtitle dicts in output time
+    """
+    if not subtitles or not edl:
+        return [dict(sub) for sub in subtitles or []]
+
+    table, _ = compile_edl(edl, duration)
+    starts = map_times([sub['start'] for sub in subtitles], table)
+    ends = map_times([sub['end'] for sub in subtitles], table)
+
+    remapped = []
+    for sub, start, end in zip(subtitles, starts, ends):
+        new_sub = dict(sub)
+        new_sub['start'] = float(start)
+        new_sub['end'] = float(end)
+        remapped.append(new_sub)
+    return remapped
+
+
+def _resample(samples: np.ndarray, num_out: int) -> np.ndarray:
+    """
+    Linear-interpolation resample of a (num_samples, channels) block.
+
+    Args:
+        samples: Source block
+        num_out: Number of output samples
+
+    Returns:
+        Float block shaped (num_out, channels)
+    """
+    if num_out <= 0 or len(samples) == 0:
+        return np.zeros((max(num_out, 0), samples.shape[1]), dtype=np.float32)
+    positions = np.linspace(0, len(samples) - 1, num_out)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, len(samples) - 1)
+    frac = (positions - lower)[:, None].astype(np.float32)
+    return samples[lower] * (1 - frac) + samples[upper] * frac
+
+
+def apply_edl_to_samples(samples: np.ndarray, frame_rate: int, edl: List[Dict]) -> np.ndarray:
+    """
+    Apply an EDL to a PCM buffer with a single concatenate.
+
+    Untouched segments are slices (views) of the source; only stretched
+    segments and inserted silence allocate new memory.
+
+    Args:
+        samples: Sample array shaped (num_samples, channels)
+        frame_rate: Sample rate in Hz
+        edl: List of edit dicts
+
+    Returns:
+        Edited sample array (same dtype as input)
+    """
+    if not edl:
+        return samples
+
+    duration = len(samples) / frame_rate
+    table, insert_windows = compile_edl(edl, duration)
+    src_start, src_end, out_start, out_end = table
+
+    # Merge source segments and silence windows in output order
+    blocks = [("audio", out_start[i], i) for i in range(len(src_start))]
+    blocks += [("silence", start, (start, end)) for start, end in insert_windows]
+    blocks.sort(key=lambda block: block[1])
+
+    channels = samples.shape[1]
+    info = np.iinfo(samples.dtype) if np.issubdtype(samples.dtype, np.integer) else None
+    pieces = []
+    for kind, _, ref in blocks:
+        if kind == "silence":
+            num = int(round((ref[1] - ref[0]) * frame_rate))
+            pieces.append(np.zeros((num, channels), dtype=samples.dtype))
+            continue
+
+        first = int(round(src_start[ref] * frame_rate))
+        last = int(round(src_end[ref] * frame_rate))
+        block = samples[first:last]
+        src_len = src_end[ref] - src_start[ref]
+        out_len = out_end[ref] - out_start[ref]
+        if src_len > 0 and abs(out_len - src_len) > 1e-9:
+            block = _resample(block.astype(np.float32), int(round(len(block) * out_len / src_len)))
+            if info is not None:
+                block = np.clip(np.rint(block), info.min, info.max)
+            block = block.astype(samples.dtype)
+        pieces.append(block)
+
+    if not pieces:
+        return samples[:0]
+    return np.concatenate(pieces)
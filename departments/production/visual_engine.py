@@ -3,6 +3,7 @@ THE VISUAL ENGINE - SUPER-CASCADE ARCHITECTURE
 Module 3: Sources and processes background video clips.
 
 SUPER-CASCADE ARCHITECTURE (Try-Catch Block Chain):
+- Priority 0: Local B-roll library (offline, indexed)
 - Priority 1: Vidu API (Video AI)
 - Priority 2: Luma API (Video AI)
 - Priority 3: Runway API (Video AI)
@@ -17,10 +18,17 @@ import os
 import random
 import tempfile
 import shutil
-import requests
 import time
+import threading
 import yt_dlp
 from moviepy import VideoFileClip, CompositeVideoClip
+from departments.production.probe_engine import probe_media
+from departments.logistics.http_engine import http_get
+from departments.logistics.footage_engine import pick_free_window, record_used, used_seconds
+from departments.production.broll_engine import get_broll_clip
+from departments.logistics.provider_health_engine import (
+    register_provider, provider_allowed, record_provider_result, rank_providers
+)
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -162,6 +170,44 @@ def _get_heygen_video(prompt: str, duration: float, output_path: str) -> str:
     raise Exception("HeyGen API not implemented")
 
 
+def _still_to_clip(image_path: str, duration: float, output_path: str) -> str:
+    """
+    Turn a still image into a constant-frame 1080x1920 clip.
+    
+    The still is encoded exactly once, as a single 1 fps keyframe; the full
+    duration is that unit looped with stream copy, so the cost does not grow
+    with the scene length. The assembler re-times it to 30 fps in the final
+    render, which is the only pass that encodes real frames.
+    
+    Args:
+        image_path: Path to the still image
+        duration: Clip duration in seconds
+        output_path: Path to save the clip (.mp4)
+        
+    Returns:
+        Path to the clip
+    """
+    unit_path = f"{os.path.splitext(output_path)[0]}_still_unit.mp4"
+    try:
+        _run_ffmpeg([
+            '-framerate', '1', '-i', image_path,
+            '-frames:v', '1',
+            '-vf', 'scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2,format=yuv420p',
+            '-c:v', 'libx264', '-preset', 'veryfast', '-tune', 'stillimage', '-crf', '20',
+            unit_path,
+        ])
+        _run_ffmpeg([
+            '-stream_loop', '-1', '-i', unit_path,
+            '-t', f"{duration:.3f}",
+            '-c', 'copy', '-movflags', '+faststart',
+            output_path,
+        ])
+    finally:
+        if os.path.exists(unit_path):
+            os.remove(unit_path)
+    return output_path
+
+
 def _get_pollinations_video(prompt: str, duration: float, output_path: str) -> str:
     """
     Generate video using Pollinations.ai (Priority 6 - Free/Unlimited).
@@ -193,7 +239,7 @@ def _get_pollinations_video(prompt: str, duration: float, output_path: str) -> s
         print(f"   Generating abstract dark visuals: {prompt[:50]}...")
         
         # Download image
-        response = requests.get(image_url, timeout=30)
+        response = http_get(image_url, timeout=30)
         if response.status_code != 200:
             raise Exception(f"Pollinations API returned status {response.status_code}")
         
@@ -202,28 +248,13 @@ def _get_pollinations_video(prompt: str, duration: float, output_path: str) -> s
         temp_image.write(response.content)
         temp_image.close()
         
-        # Convert image to video by looping it
-        from moviepy import ImageClip, concatenate_videoclips
-        
-        image_clip = ImageClip(temp_image.name, duration=duration)
-        image_clip = image_clip.resize((1080, 1920))
-        
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
         
-        # Write video
-        image_clip.write_videofile(
-            output_path,
-            codec='libx264',
-            audio_codec='aac',
-            fps=30,
-            preset='medium',
-            bitrate='3000k',
-            logger=None
-        )
+        # Convert image to video: encode the still once, then loop it with stream copy
+        _still_to_clip(temp_image.name, duration, output_path)
         
         # Cleanup
-        image_clip.close()
         os.remove(temp_image.name)
         
         print(f"   ✓ Pollinations video generated: {output_path}")
@@ -233,71 +264,168 @@ def _get_pollinations_video(prompt: str, duration: float, output_path: str) -> s
         raise Exception(f"Pollinations failed: {e}")
 
 
-def _load_used_timestamps() -> dict:
+# SUPER-CASCADE providers: (name, function, integration implemented, required API key env)
+VIDEO_PROVIDERS = [
+    ("Vidu", _get_vidu_video, False, "VIDU_API_KEY"),
+    ("Luma", _get_luma_video, False, "LUMA_API_KEY"),
+    ("Runway", _get_runway_video, False, "RUNWAY_API_KEY"),
+    ("Pika", _get_pika_video, False, "PIKA_API_KEY"),
+    ("HeyGen", _get_heygen_video, False, "HEYGEN_API_KEY"),
+    ("Pollinations", _get_pollinations_video, True, None),
+]
+_video_providers_registered = False
+_video_providers_lock = threading.Lock()  # get_best_video runs on several scene workers at once
+
+# Scene visuals are sourced in parallel; each provider gets its own concurrency cap
+VISUAL_MAX_WORKERS = int(os.getenv("VISUAL_MAX_WORKERS", "4"))
+VISUAL_PROVIDER_CONCURRENCY = int(os.getenv("VISUAL_PROVIDER_CONCURRENCY", "2"))
+VISUAL_PROVIDER_OVERRIDES = os.getenv("VISUAL_PROVIDER_OVERRIDES", "Pollinations=4,YouTube=2")  # "name=cap,..."
+_provider_slots = {}
+_provider_slots_lock = threading.Lock()
+
+
+def _provider_slot(api_name: str) -> threading.Semaphore:
     """
-    Load used timestamps from JSON file to avoid duplicates.
+    Semaphore capping concurrent calls to one video provider.
     
+    Args:
+        api_name: Provider name (e.g. 'Pollinations', 'YouTube')
+        
     Returns:
-        Dict mapping video_id -> list of used (start, end) tuples
+        Shared semaphore for the provider
     """
-    timestamp_file = "visual_engine_timestamps.json"
-    if not os.path.exists(timestamp_file):
-        return {}
+    with _provider_slots_lock:
+        slot = _provider_slots.get(api_name)
+        if slot is None:
+            cap = VISUAL_PROVIDER_CONCURRENCY
+            for entry in VISUAL_PROVIDER_OVERRIDES.split(','):
+                name, _, size = entry.strip().partition('=')
+                if name == api_name and size.strip().isdigit():
+                    cap = max(1, int(size))
+            slot = threading.Semaphore(cap)
+            _provider_slots[api_name] = slot
+        return slot
+
+
+def _pick_segment_start(video_id: str, video_duration: float, segment_duration: float) -> float:
+    """
+    Choose where to cut a segment, avoiding ranges already used from this video.
     
-    try:
-        import json
-        with open(timestamp_file, 'r') as f:
-            return json.load(f)
-    except:
-        return {}
+    Args:
+        video_id: YouTube video ID
+        video_duration: Full video duration in seconds (from the search metadata)
+        segment_duration: Duration of segment in seconds
+        
+    Returns:
+        Segment start in seconds
+    """
+    if not video_duration or video_duration <= segment_duration:
+        return 0.0
+    
+    segment_start = pick_free_window(video_id, video_duration, segment_duration)
+    if segment_start is None:
+        # No unused window is long enough - use random anyway (but log it)
+        print(f"   ⚠️ Could not find unused timestamp for {video_id}, using random segment")
+        segment_start = random.uniform(0, video_duration - segment_duration)
+    return segment_start
 
 
-def _save_used_timestamps(timestamps: dict):
+def _run_ffmpeg(args: list) -> None:
     """
-    Save used timestamps to JSON file.
+    Run ffmpeg quietly.
     
     Args:
-        timestamps: Dict mapping video_id -> list of used (start, end) tuples
+        args: Arguments after 'ffmpeg -y'
+        
+    Raises:
+        Exception: If ffmpeg exits with an error
     """
-    timestamp_file = "visual_engine_timestamps.json"
-    try:
-        import json
-        with open(timestamp_file, 'w') as f:
-            json.dump(timestamps, f, indent=2)
-    except Exception as e:
-        print(f"   ⚠️ Could not save timestamps: {e}")
+    import subprocess
+    result = subprocess.run(['ffmpeg', '-y', '-loglevel', 'error'] + args, capture_output=True, timeout=300)
+    if result.returncode != 0:
+        raise Exception(f"ffmpeg failed: {result.stderr.decode(errors='ignore')[-200:]}")
 
 
-def _is_timestamp_used(video_id: str, start: float, end: float, used_timestamps: dict, tolerance: float = 2.0) -> bool:
+def _stream_url(entry: dict) -> tuple:
     """
-    Check if a timestamp range has been used before.
+    Direct video stream URL (and request headers) of a resolved yt-dlp entry.
     
     Args:
-        video_id: YouTube video ID
-        start: Start time in seconds
-        end: End time in seconds
-        used_timestamps: Dict of used timestamps
-        tolerance: Time tolerance in seconds (default: 2.0s)
+        entry: Info dict from extract_info() with a format selected
         
     Returns:
-        True if timestamp is too close to a used one, False otherwise
+        Tuple (url, headers dict); url is None if no format was resolved
+    """
+    for fmt in entry.get('requested_formats') or [entry]:
+        if fmt.get('url') and fmt.get('vcodec') != 'none':
+            return fmt['url'], fmt.get('http_headers') or entry.get('http_headers') or {}
+    return None, {}
+
+
+def _download_segment_range(ydl_opts: dict, entry: dict, start: float, end: float, download_path: str) -> str:
     """
-    if video_id not in used_timestamps:
-        return False
+    Download only [start, end] of a video, video-only, without re-encoding.
+    
+    Uses yt-dlp's range download; falls back to ffmpeg input seeking on the
+    stream URL. Both stream-copy, so the cut snaps to the keyframe before start.
     
-    for used_start, used_end in used_timestamps[video_id]:
-        # Check if ranges overlap or are too close
-        if (start < used_end + tolerance and end > used_start - tolerance):
-            return True
+    Args:
+        ydl_opts: yt-dlp options used for the search (format, outtmpl, ...)
+        entry: Resolved yt-dlp entry of the chosen video
+        start: Segment start in seconds
+        end: Segment end in seconds
+        download_path: Target file path
+        
+    Returns:
+        Path to the downloaded segment
+        
+    Raises:
+        Exception: If neither method produces a file
+    """
+    stem = os.path.splitext(os.path.basename(download_path))[0]
+    temp_dir = os.path.dirname(download_path)
     
-    return False
+    def _find_download():
+        for file in os.listdir(temp_dir):
+            if file.startswith(stem) and file.endswith(('.mp4', '.webm', '.mkv')):
+                return os.path.join(temp_dir, file)
+        return None
+    
+    try:
+        range_opts = dict(ydl_opts)
+        range_opts['download_ranges'] = yt_dlp.utils.download_range_func(None, [(start, end)])
+        range_opts['force_keyframes_at_cuts'] = False
+        with yt_dlp.YoutubeDL(range_opts) as range_ydl:
+            range_ydl.process_ie_result(dict(entry), download=True)
+        downloaded_file = _find_download()
+        if downloaded_file and os.path.getsize(downloaded_file) > 0:
+            return downloaded_file
+    except Exception as e:
+        print(f"      ⚠️ Range download failed ({e}), seeking the stream with ffmpeg...")
+    
+    url, headers = _stream_url(entry)
+    if not url:
+        raise Exception("No stream URL for range download")
+    
+    header_args = []
+    if headers:
+        header_args = ['-headers', ''.join(f"{key}: {value}\r\n" for key, value in headers.items())]
+    _run_ffmpeg(header_args + [
+        '-ss', f"{start:.2f}", '-t', f"{end - start:.2f}", '-i', url,
+        '-map', '0:v:0', '-an', '-c', 'copy', download_path,
+    ])
+    if not os.path.exists(download_path) or os.path.getsize(download_path) == 0:
+        raise Exception("Downloaded file not found")
+    return download_path
 
 
 def _download_and_process_single_clip(search_query: str, segment_duration: float, temp_dir: str) -> str:
     """
     Download and process a single video clip segment from YouTube.
     
-    Tracks used timestamps to avoid duplicate segments.
+    Tracks used timestamps to avoid duplicate segments. The timestamp is picked
+    from the search metadata first, then only that range is downloaded
+    (video-only). The segment is only re-encoded when it has to be scaled.
     
     Args:
         search_query: YouTube search query
@@ -309,9 +437,6 @@ def _download_and_process_single_clip(search_query: str, segment_duration: float
     """
     download_path = os.path.join(temp_dir, f"segment_{random.randint(1000, 9999)}.mp4")
     
-    # Load used timestamps
-    used_timestamps = _load_used_timestamps()
-    
     # Configure yt-dlp for 1080p HD with duration filter
     def match_filter(info_dict):
         """Filter out videos longer than 10 minutes"""
@@ -320,19 +445,18 @@ def _download_and_process_single_clip(search_query: str, segment_duration: float
             return "Video is longer than 10 minutes, skipping"
         return None
     
-    # ENSURE 1080p: Strict format selection for high quality
+    # ENSURE 1080p: Strict format selection for high quality (video-only, audio is muted anyway)
     ydl_opts = {
-        'format': 'bestvideo[height=1080][ext=mp4]+bestaudio[ext=m4a]/bestvideo[height>=1080][ext=mp4]/best[height>=1080][ext=mp4]',
+        'format': 'bestvideo[height=1080][ext=mp4]/bestvideo[height>=1080][ext=mp4]/best[height>=1080][ext=mp4]',
         'outtmpl': download_path,
         'quiet': False,
         'no_warnings': False,
         'match_filter': match_filter,
     }
     
-    # Search and download
+    # Search (metadata only)
     max_attempts = 5
-    downloaded = False
-    selected_video_id = None  # Store video ID for timestamp tracking
+    selected_entry = None
     
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         for attempt in range(1, max_attempts + 1):
@@ -360,24 +484,16 @@ def _download_and_process_single_clip(search_query: str, segment_duration: float
                         continue
                     
                     # Check if we've used too much of this video already
-                    used_timestamps = _load_used_timestamps()
-                    if video_id in used_timestamps:
-                        used_ranges = used_timestamps[video_id]
-                        total_used = sum(end - start for start, end in used_ranges)
-                        # If we've used more than 50% of the video, skip it
-                        if video_duration and total_used > video_duration * 0.5:
-                            print(f"      Skipping {video_id}: already used {total_used:.1f}s of {video_duration:.1f}s")
-                            continue
-                    
-                    selected_video_id = video_id
-                    video_title = entry.get('title', 'Unknown')
-                    print(f"   Downloading segment: {video_title} (ID: {video_id})")
+                    total_used = used_seconds(video_id)
+                    # If we've used more than 50% of the video, skip it
+                    if video_duration and total_used > video_duration * 0.5:
+                        print(f"      Skipping {video_id}: already used {total_used:.1f}s of {video_duration:.1f}s")
+                        continue
                     
-                    ydl.download([f"https://www.youtube.com/watch?v={video_id}"])
-                    downloaded = True
+                    selected_entry = entry
                     break
                 
-                if downloaded:
+                if selected_entry:
                     break
                     
             except Exception as e:
@@ -385,112 +501,60 @@ def _download_and_process_single_clip(search_query: str, segment_duration: float
                     continue
                 raise
     
-    if not downloaded:
+    if not selected_entry:
         raise Exception("No suitable videos found")
     
-    # Find the downloaded file
-    downloaded_file = None
-    for file in os.listdir(temp_dir):
-        if file.startswith("segment_") and file.endswith(('.mp4', '.webm', '.mkv')):
-            downloaded_file = os.path.join(temp_dir, file)
-            break
-    
-    if not downloaded_file or not os.path.exists(downloaded_file):
-        raise Exception(f"Downloaded file not found")
-    
-    # Load and process video (CRITICAL: strip ALL original audio)
-    video_clip = VideoFileClip(downloaded_file)
-    video_duration = video_clip.duration
-    
-    # Get video ID for timestamp tracking
-    video_id = selected_video_id
-    if not video_id:
-        # Fallback: use filename hash as identifier
-        import hashlib
-        video_id = hashlib.md5(os.path.basename(downloaded_file).encode()).hexdigest()[:12]
-        print(f"   ⚠️ Could not get video ID, using hash: {video_id}")
-    
-    # Cut segment - avoid used timestamps
-    if video_duration <= segment_duration:
-        segment_start = 0
-        segment_end = video_duration
-    else:
-        max_start = video_duration - segment_duration
-        max_attempts = 20  # Try up to 20 times to find unused timestamp
-        segment_start = None
-        segment_end = None
-        
-        for attempt in range(max_attempts):
-            candidate_start = random.uniform(0, max_start)
-            candidate_end = candidate_start + segment_duration
-            
-            # Check if this timestamp has been used
-            if not _is_timestamp_used(video_id, candidate_start, candidate_end, used_timestamps):
-                segment_start = candidate_start
-                segment_end = candidate_end
-                break
-        
-        # If all attempts failed, use random anyway (but log it)
-        if segment_start is None:
-            print(f"   ⚠️ Could not find unused timestamp for {video_id}, using random segment")
-            segment_start = random.uniform(0, max_start)
-            segment_end = segment_start + segment_duration
-    
-    # Record this timestamp as used
-    if video_id not in used_timestamps:
-        used_timestamps[video_id] = []
-    used_timestamps[video_id].append([round(segment_start, 2), round(segment_end, 2)])
-    _save_used_timestamps(used_timestamps)
-    
-    try:
-        segment = video_clip.subclipped(segment_start, segment_end)
-    except AttributeError:
-        segment = video_clip.subclip(segment_start, segment_end)
+    # Pick the cut before downloading anything
+    video_id = selected_entry['id']
+    video_duration = selected_entry.get('duration') or 0
+    segment_start = _pick_segment_start(video_id, video_duration, segment_duration)
+    segment_end = min(segment_start + segment_duration, video_duration) if video_duration else segment_duration
     
-    # HARD MUTE: remove all original audio so actors never bleed through
-    segment = segment.without_audio()
+    print(f"   Downloading segment: {selected_entry.get('title', 'Unknown')} (ID: {video_id}) "
+          f"[{segment_start:.1f}s-{segment_end:.1f}s]")
+    downloaded_file = _download_segment_range(ydl_opts, selected_entry, segment_start, segment_end, download_path)
+    clip_duration = segment_end - segment_start
     
     # Resize to 1080x1920
     target_width = 1080
     target_height = 1920
-    current_width, current_height = segment.size
+    try:
+        info = probe_media(downloaded_file, persist=False)
+        current_size = (info.get('width'), info.get('height'))
+        has_audio = info.get('audio_codec') is not None
+        downloaded_duration = info.get('duration') or clip_duration
+    except Exception:
+        current_size = None
+        has_audio = True
+        downloaded_duration = clip_duration
+    
+    # Stream copy starts at the keyframe before segment_start: record the footage actually downloaded
+    downloaded_start = max(0.0, min(segment_start, segment_end - downloaded_duration))
+    record_used(video_id, downloaded_start, segment_end)
     
     # Save processed segment
     segment_path = os.path.join(temp_dir, f"processed_segment_{random.randint(1000, 9999)}.mp4")
-    os.makedirs(os.path.dirname(segment_path) if os.path.dirname(segment_path) else ".", exist_ok=True)
     
-    # IMPORTANT: ensure ffmpeg is called with audio disabled (-an)
-    if segment.size != (target_width, target_height):
-        segment.write_videofile(
-            segment_path,
-            codec='libx264',
-            audio=False,  # remove audio track completely
-            fps=30,
-            preset='medium',
-            bitrate='3000k',
-            ffmpeg_params=[
-                '-an',
-                '-vf',
-                f'scale={target_width}:{target_height}:flags=lanczos:force_original_aspect_ratio=decrease,pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2',
-            ],
-            logger=None,
-        )
+    # IMPORTANT: strip ALL original audio (-an) so actors never bleed through
+    if current_size == (target_width, target_height):
+        if has_audio or downloaded_duration > clip_duration:
+            _run_ffmpeg([
+                '-i', downloaded_file, '-t', f"{clip_duration:.2f}",
+                '-map', '0:v:0', '-an', '-c', 'copy', segment_path,
+            ])
+            os.remove(downloaded_file)
+        else:
+            os.replace(downloaded_file, segment_path)
     else:
-        segment.write_videofile(
+        _run_ffmpeg([
+            '-i', downloaded_file,
+            '-t', f"{clip_duration:.2f}",
+            '-an',
+            '-vf', f'scale={target_width}:{target_height}:flags=lanczos:force_original_aspect_ratio=decrease,pad={target_width}:{target_height}:(ow-iw)/2:(oh-ih)/2',
+            '-r', '30',
+            '-c:v', 'libx264', '-preset', 'medium', '-b:v', '3000k', '-pix_fmt', 'yuv420p',
             segment_path,
-            codec='libx264',
-            audio=False,  # remove audio track completely
-            fps=30,
-            preset='medium',
-            bitrate='3000k',
-            ffmpeg_params=['-an'],
-            logger=None,
-        )
-    
-    video_clip.close()
-    segment.close()
-    
-    if os.path.exists(downloaded_file):
+        ])
         os.remove(downloaded_file)
     
     return segment_path
@@ -562,11 +626,13 @@ def get_gameplay_clip(duration: float, output_path: str, search_query: str = Non
             
             try:
                 segment_path = _download_and_process_single_clip(query, actual_segment_duration, temp_dir)
-                segment_clip = VideoFileClip(segment_path)
                 
-                # Verify 1080p quality
-                if segment_clip.h < 1080:
-                    print(f"      ⚠️ Warning: Segment is {segment_clip.h}p, not 1080p. Quality may be lower.")
+                # Verify 1080p quality (header probe)
+                segment_height = probe_media(segment_path).get('height') or 0
+                if segment_height < 1080:
+                    print(f"      ⚠️ Warning: Segment is {segment_height}p, not 1080p. Quality may be lower.")
+                
+                segment_clip = VideoFileClip(segment_path)
                 
                 segment_clips.append(segment_clip)
             except Exception as e:
@@ -651,7 +717,9 @@ def get_best_video(prompt: str, duration: float, output_path: str) -> str:
     """
     Get best video using SUPER-CASCADE architecture (Try-Catch Block Chain).
     
-    Tries each video AI API in order until one succeeds.
+    Tries each video AI API until one succeeds, most reliable first (see
+    provider_health_engine). Providers without an integration or API key, or
+    whose circuit is open, are skipped without a call.
     
     Args:
         prompt: Visual engineering prompt from script
@@ -664,84 +732,155 @@ def get_best_video(prompt: str, duration: float, output_path: str) -> str:
     print(f"📹 SUPER-CASCADE: Sourcing video (duration: {duration:.2f}s)...")
     print(f"   Visual Prompt: {prompt[:80]}...")
     
-    # SUPER-CASCADE: Try each API in order
-    cascade_chain = [
-        ("Vidu", _get_vidu_video),
-        ("Luma", _get_luma_video),
-        ("Runway", _get_runway_video),
-        ("Pika", _get_pika_video),
-        ("HeyGen", _get_heygen_video),
-        ("Pollinations", _get_pollinations_video),
-    ]
-    
-    for api_name, api_func in cascade_chain:
+    # Priority 0: Local B-roll library (index lookup + stream copy, no network)
+    try:
+        video_path = get_broll_clip(prompt, duration, output_path)
+        if video_path:
+            print("   ✓ Local B-roll succeeded!")
+            return video_path
+    except Exception as e:
+        print(f"   ⚠️ Local B-roll failed: {str(e)[:60]}...")
+    
+    # SUPER-CASCADE: reorder by observed health, skip providers that are known to be down
+    global _video_providers_registered
+    providers = {f"video:{name}": (name, func) for name, func, _, _ in VIDEO_PROVIDERS}
+    with _video_providers_lock:
+        if not _video_providers_registered:
+            for name, _, implemented, key_env in VIDEO_PROVIDERS:
+                register_provider(f"video:{name}", implemented=implemented, key_env=key_env)
+            _video_providers_registered = True
+    
+    skipped = []
+    for provider in rank_providers(list(providers)):
+        api_name, api_func = providers[provider]
+        allowed, reason = provider_allowed(provider)
+        if not allowed:
+            skipped.append(f"{api_name} ({reason})")
+            continue
+        
+        started = time.monotonic()
         try:
             print(f"   → Trying {api_name}...")
-            video_path = api_func(prompt, duration, output_path)
+            with _provider_slot(api_name):
+                started = time.monotonic()
+                video_path = api_func(prompt, duration, output_path)
+            record_provider_result(provider, True, time.monotonic() - started)
             print(f"   ✓ {api_name} succeeded!")
             return video_path
         except Exception as e:
             error_msg = str(e)
             if "not found in .env" in error_msg or "Key Missing" in error_msg:
                 print(f"   ⚠️ {api_name}: Key Missing. Continuing...")
-            elif "not yet implemented" in error_msg:
+            elif "not implemented" in error_msg:
+                # Capability, not health: stop calling it for the rest of this process
+                register_provider(provider, implemented=False)
                 print(f"   ⚠️ {api_name}: Not yet implemented. Continuing...")
+                continue
             else:
                 print(f"   ⚠️ {api_name} failed: {error_msg[:60]}...")
+            record_provider_result(provider, False, time.monotonic() - started, error_msg)
             continue
     
-    # Priority 7: YouTube Gameplay (unstoppable fallback)
+    if skipped:
+        print(f"   ⏭️ Skipped: {', '.join(skipped)}")
+    
+    # Priority 7: YouTube Gameplay (unstoppable fallback - never circuit-broken, but tracked)
     print("   → Trying YouTube Gameplay (Priority 7 - Unstoppable Fallback)...")
+    started = time.monotonic()
     try:
-        video_path = get_gameplay_clip(duration, output_path)
+        with _provider_slot("YouTube"):
+            started = time.monotonic()
+            video_path = get_gameplay_clip(duration, output_path)
+        record_provider_result("video:YouTube", True, time.monotonic() - started)
         print("   ✓ YouTube Gameplay succeeded!")
         return video_path
     except Exception as e:
+        record_provider_result("video:YouTube", False, time.monotonic() - started, str(e))
         print(f"   ⚠️ YouTube Gameplay failed: {e}")
         raise Exception("All video sources failed (Vidu, Luma, Runway, Pika, HeyGen, Pollinations, YouTube)")
 
 
-def generate_scene_visuals(scenes: list, output_dir: str = ".") -> list:
+def generate_scene_visuals(scenes: list, output_dir: str = ".", return_status: bool = False) -> list:
     """
     Generate individual visual assets for each scene (Visual Agent).
     
-    Iterates through scenes and generates a unique video for each scene using Pollinations.ai
-    or the SUPER-CASCADE architecture.
+    Scenes are sourced in parallel through the SUPER-CASCADE (each provider
+    capped by _provider_slot()). Scenes sharing the same visual_prompt are
+    generated once, at the longest of their durations, and copied. A failed
+    scene does not abort the others: its slot is None (or 'failed' status)
+    so the assembler can hold a still instead.
     
     Args:
         scenes: List of scene dicts with 'id', 'text', 'visual_prompt', 'duration'
         output_dir: Directory to save scene videos (default: current directory)
+        return_status: Return per-scene status dicts instead of paths
         
     Returns:
-        List of paths to generated scene video files (scene_1.mp4, scene_2.mp4, etc.)
+        List in scene order: paths to scene videos (scene_1.mp4, ...; None if failed),
+        or dicts with 'id', 'path', 'status' ('ok', 'duplicate', 'failed'), 'error'
+        
+    Raises:
+        Exception: If every scene failed
     """
-    print(f"🎬 Visual Agent: Generating visuals for {len(scenes)} scenes...")
+    from concurrent.futures import ThreadPoolExecutor
     
-    scene_video_paths = []
+    print(f"🎬 Visual Agent: Generating visuals for {len(scenes)} scenes...")
     
-    for scene in scenes:
-        scene_id = scene.get('id', len(scene_video_paths) + 1)
+    # Group scenes by prompt: one generation per distinct visual_prompt
+    jobs = {}
+    results = []
+    for index, scene in enumerate(scenes):
+        scene_id = scene.get('id', index + 1)
         visual_prompt = scene.get('visual_prompt', 'Cinematic dark noir, moody lighting, psychological thriller vibe')
         duration = float(scene.get('duration', 3.0))
-        
         output_path = os.path.join(output_dir, f"scene_{scene_id}.mp4")
         
-        print(f"   Scene {scene_id}: Generating visual ({duration:.1f}s)...")
-        print(f"      Prompt: {visual_prompt[:60]}...")
-        
-        try:
-            # Use SUPER-CASCADE to generate video for this specific scene
-            video_path = get_best_video(visual_prompt, duration, output_path)
-            scene_video_paths.append(video_path)
-            print(f"   ✓ Scene {scene_id} visual generated: {video_path}")
-        except Exception as e:
-            print(f"   ⚠️ Scene {scene_id} visual generation failed: {e}")
-            # Continue with other scenes even if one fails
-            # Could add fallback logic here if needed
-            raise
-    
-    print(f"✓ Visual Agent: Generated {len(scene_video_paths)} scene visuals")
-    return scene_video_paths
+        results.append({"id": scene_id, "path": None, "status": "pending", "error": None})
+        job = jobs.setdefault(" ".join(visual_prompt.lower().split()), {
+            "prompt": visual_prompt, "duration": 0.0, "output_path": output_path, "scenes": []
+        })
+        job["duration"] = max(job["duration"], duration)
+        job["scenes"].append((index, output_path))
+    
+    duplicates = len(scenes) - len(jobs)
+    if duplicates:
+        print(f"   ♻️ {duplicates} scene(s) share a visual prompt - generating {len(jobs)} visuals")
+    
+    def _generate(job):
+        print(f"   Scene {results[job['scenes'][0][0]]['id']}: Generating visual ({job['duration']:.1f}s)...")
+        print(f"      Prompt: {job['prompt'][:60]}...")
+        return get_best_video(job['prompt'], job['duration'], job['output_path'])
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(VISUAL_MAX_WORKERS, len(jobs)))) as pool:
+        futures = [(job, pool.submit(_generate, job)) for job in jobs.values()]
+        for job, future in futures:
+            try:
+                video_path = future.result()
+            except Exception as e:
+                for index, _ in job["scenes"]:
+                    results[index].update(status="failed", error=str(e))
+                    print(f"   ⚠️ Scene {results[index]['id']} visual generation failed: {e}")
+                continue
+            
+            for position, (index, output_path) in enumerate(job["scenes"]):
+                if position == 0:
+                    results[index].update(path=video_path, status="ok")
+                    continue
+                try:
+                    shutil.copyfile(video_path, output_path)
+                    results[index].update(path=output_path, status="duplicate")
+                except Exception as e:
+                    results[index].update(status="failed", error=str(e))
+            print(f"   ✓ Scene {results[job['scenes'][0][0]]['id']} visual generated: {video_path}")
+    
+    generated = sum(1 for result in results if result["path"])
+    if scenes and not generated:
+        raise Exception(f"All {len(scenes)} scene visuals failed: {results[0]['error']}")
+    
+    print(f"✓ Visual Agent: Generated {generated}/{len(scenes)} scene visuals")
+    if return_status:
+        return results
+    return [result["path"] for result in results]
 
 
 def get_visual_content(duration: float, output_path: str, script_data: dict = None, pacing: str = "Normal") -> str:
@@ -6,28 +6,216 @@ Implements Lean Manufacturing Principles (Jidoka) for automatic defect detection
 """
 
 import os
-from typing import Optional
+from typing import Optional, List, Dict, Tuple
+import numpy as np
 from pydub import AudioSegment
-from pydub.silence import split_on_silence
+from departments.production.timeline_engine import cut, compile_edl, apply_edl_to_samples
 
 
-def remove_silence(audio_path: str, output_path: str = None, min_silence_len: int = 500) -> str:
+# Time map: (source_times, output_times) breakpoints in seconds.
+# A timestamp t in the original audio lands at np.interp(t, source_times, output_times).
+TimeMap = Tuple[List[float], List[float]]
+
+# NumPy dtypes for pydub sample widths (bytes per sample)
+_SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+def audio_to_array(audio: AudioSegment) -> np.ndarray:
+    """
+    Convert an AudioSegment to a (num_samples, channels) NumPy array (no copy of sample data).
+    
+    Args:
+        audio: Pydub AudioSegment
+        
+    Returns:
+        Integer sample array shaped (num_samples, channels)
+    """
+    dtype = _SAMPLE_DTYPES[audio.sample_width]
+    samples = np.frombuffer(audio.raw_data, dtype=dtype)
+    return samples.reshape(-1, audio.channels)
+
+
+def array_to_audio(samples: np.ndarray, template: AudioSegment) -> AudioSegment:
+    """
+    Convert a (num_samples, channels) array back to an AudioSegment.
+    
+    Args:
+        samples: Sample array (clipped to the template's sample width)
+        template: AudioSegment providing frame rate, width and channel count
+        
+    Returns:
+        New AudioSegment with the template's format
+    """
+    dtype = _SAMPLE_DTYPES[template.sample_width]
+    info = np.iinfo(dtype)
+    if samples.dtype != dtype:
+        samples = np.clip(np.rint(samples), info.min, info.max).astype(dtype)
+    return template._spawn(np.ascontiguousarray(samples).tobytes())
+
+
+def detect_silence_runs(samples: np.ndarray, frame_rate: int, sample_width: int,
+                        min_silence_len: int = 500, silence_thresh: float = -40,
+                        frame_ms: int = 10) -> List[Tuple[int, int]]:
+    """
+    Find silent runs using frame RMS computed in one vectorized pass.
+    
+    Args:
+        samples: Sample array shaped (num_samples, channels)
+        frame_rate: Sample rate in Hz
+        sample_width: Bytes per sample (for dBFS reference level)
+        min_silence_len: Minimum silence length in milliseconds
+        silence_thresh: dBFS threshold below which a frame counts as silence
+        frame_ms: Analysis frame length in milliseconds
+        
+    Returns:
+        List of (start_sample, end_sample) silent runs, sorted
+    """
+    frame_len = max(1, frame_rate * frame_ms // 1000)
+    num_frames = len(samples) // frame_len
+    if num_frames == 0:
+        return []
+    
+    # View the buffer as (frames, frame_len * channels) and take RMS per row
+    frames = samples[:num_frames * frame_len].reshape(num_frames, -1).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    
+    # Compare amplitudes instead of taking a log per frame
+    max_amplitude = float(2 ** (8 * sample_width - 1))
+    silent = rms <= max_amplitude * (10 ** (silence_thresh / 20))
+    
+    # Run boundaries from the edges of the boolean mask
+    edges = np.diff(np.concatenate(([0], silent.view(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    
+    min_frames = int(np.ceil(min_silence_len / frame_ms))
+    long_runs = (run_ends - run_starts) >= min_frames
+    
+    runs = []
+    for start, end in zip(run_starts[long_runs], run_ends[long_runs]):
+        # The final partial frame belongs to the trailing run
+        end_sample = len(samples) if end == num_frames else int(end) * frame_len
+        runs.append((int(start) * frame_len, end_sample))
+    return runs
+
+
+def silence_cut_edits(samples: np.ndarray, frame_rate: int, sample_width: int,
+                      min_silence_len: int = 500, silence_thresh: float = -40,
+                      keep_silence: int = 100) -> List[Dict]:
+    """
+    Build timeline cut edits for long silences (see timeline_engine).
+    
+    Each silent run is shrunk by keep_silence on its speech-facing sides so
+    words keep a natural breath around them.
+    
+    Args:
+        samples: Sample array shaped (num_samples, channels)
+        frame_rate: Sample rate in Hz
+        sample_width: Bytes per sample
+        min_silence_len: Minimum silence length in milliseconds to remove
+        silence_thresh: dBFS threshold for silence detection
+        keep_silence: Milliseconds of silence kept on each side of a cut
+        
+    Returns:
+        List of cut edit dicts in seconds
+    """
+    runs = detect_silence_runs(
+        samples,
+        frame_rate,
+        sample_width,
+        min_silence_len=min_silence_len,
+        silence_thresh=silence_thresh
+    )
+    
+    keep = frame_rate * keep_silence // 1000
+    edits = []
+    for start, end in runs:
+        cut_start = start if start == 0 else start + keep
+        cut_end = end if end == len(samples) else end - keep
+        if cut_end > cut_start:
+            edits.append(cut(cut_start / frame_rate, cut_end / frame_rate))
+    return edits
+
+
+def identity_time_map() -> TimeMap:
+    """
+    Time map that leaves every timestamp unchanged.
+    
+    Returns:
+        TimeMap with a single breakpoint at 0.0
+    """
+    return [0.0], [0.0]
+
+
+def apply_time_map(times, time_map: TimeMap) -> np.ndarray:
+    """
+    Map source timestamps through a time map (vectorized).
+    
+    Times past the last breakpoint keep the final offset, so an identity map
+    needs only one point.
+    
+    Args:
+        times: Sequence or array of timestamps in seconds
+        time_map: (source_times, output_times) breakpoints
+        
+    Returns:
+        Array of output timestamps in seconds
+    """
+    times = np.asarray(times, dtype=np.float64)
+    source_times, output_times = time_map
+    mapped = np.interp(times, source_times, output_times)
+    beyond = times > source_times[-1]
+    mapped[beyond] = times[beyond] + (output_times[-1] - source_times[-1])
+    return mapped
+
+
+def remap_subtitles(subtitles: List[Dict], time_map: TimeMap) -> List[Dict]:
+    """
+    Apply a time map to subtitle timestamps (vectorized).
+    
+    Words that fell inside removed silence collapse onto the cut point.
+    
+    Args:
+        subtitles: List of subtitle dicts with 'word', 'start', 'end' keys
+        time_map: (source_times, output_times) breakpoints
+        
+    Returns:
+        New list of subtitle dicts with remapped 'start' and 'end'
+    """
+    if not subtitles:
+        return []
+    
+    starts = apply_time_map([sub['start'] for sub in subtitles], time_map)
+    ends = apply_time_map([sub['end'] for sub in subtitles], time_map)
+    
+    remapped = []
+    for sub, start, end in zip(subtitles, starts, ends):
+        new_sub = dict(sub)
+        new_sub['start'] = float(start)
+        new_sub['end'] = float(end)
+        remapped.append(new_sub)
+    return remapped
+
+
+def remove_silence(audio_path: str, output_path: str = None, min_silence_len: int = 500,
+                   silence_thresh: float = -40, keep_silence: int = 100) -> Tuple[str, TimeMap]:
     """
     Remove silence from audio (Silence Killer).
     
     Detects silence > 500ms and cuts it out (allows professor to breathe).
+    Frame RMS is computed in a single NumPy pass and the output is built with one
+    concatenate, so this is cheap enough to run on every engine.
     
     Args:
         audio_path: Path to input audio file
         output_path: Path to save processed audio (if None, overwrites input)
         min_silence_len: Minimum silence length in milliseconds to remove (default: 500ms)
+        silence_thresh: dBFS threshold for silence detection (default: -40dB)
+        keep_silence: Milliseconds of silence kept on each side of a cut (default: 100ms)
         
     Returns:
-        Path to processed audio file
-        
-    Note:
-        For Piper TTS: Apply before calculating subtitle timestamps
-        For Edge-TTS: Skip to avoid breaking word-boundary metadata
+        Tuple of (path to processed audio file, time map)
+        Apply the time map to word timestamps with remap_subtitles().
     """
     if output_path is None:
         output_path = audio_path
@@ -36,55 +224,229 @@ def remove_silence(audio_path: str, output_path: str = None, min_silence_len: in
     
     try:
         # Load audio
-        audio = AudioSegment.from_mp3(audio_path)
-        original_duration = len(audio)
+        audio = AudioSegment.from_file(audio_path)
+        samples = audio_to_array(audio)
+        frame_rate = audio.frame_rate
+        original_duration = len(samples) / frame_rate
         
-        # Split on silence
-        # min_silence_len: minimum length of silence to split on (in ms)
-        # silence_thresh: threshold in dB below which audio is considered silence
-        chunks = split_on_silence(
-            audio,
+        edl = silence_cut_edits(
+            samples,
+            frame_rate,
+            audio.sample_width,
             min_silence_len=min_silence_len,
-            silence_thresh=-40  # dB threshold for silence detection
+            silence_thresh=silence_thresh,
+            keep_silence=keep_silence
         )
         
-        if not chunks:
+        if not edl:
             print("   ⚠️ No silence detected, audio unchanged")
-            return audio_path
+            return audio_path, identity_time_map()
+        
+        table, _ = compile_edl(edl, original_duration)
+        src_start, src_end, out_start, out_end = table
+        
+        if len(src_start) == 0:
+            print("   ⚠️ Audio is entirely silent, audio unchanged")
+            return audio_path, identity_time_map()
         
-        # Combine non-silent chunks
-        processed_audio = AudioSegment.empty()
-        for chunk in chunks:
-            processed_audio += chunk
+        # Piecewise-linear map: each kept segment slides left by the silence removed before it
+        source_times = np.column_stack((src_start, src_end)).ravel().tolist()
+        output_times = np.column_stack((out_start, out_end)).ravel().tolist()
+        
+        # Trailing silence collapses onto the new end of the track
+        if source_times[-1] < original_duration:
+            source_times.append(original_duration)
+            output_times.append(output_times[-1])
+        
+        processed_audio = array_to_audio(apply_edl_to_samples(samples, frame_rate, edl), audio)
         
         # Add small fade in/out to prevent clicks
         processed_audio = processed_audio.fade_in(10).fade_out(10)
         
-        new_duration = len(processed_audio)
+        new_duration = processed_audio.duration_seconds
         time_saved = original_duration - new_duration
         
         # Export processed audio
         processed_audio.export(output_path, format="mp3", bitrate="192k")
         
-        print(f"   ✓ Silence removed: {time_saved/1000:.2f}s saved ({original_duration/1000:.2f}s → {new_duration/1000:.2f}s)")
+        print(f"   ✓ Silence removed: {time_saved:.2f}s saved ({original_duration:.2f}s → {new_duration:.2f}s)")
         
-        return output_path
+        return output_path, (source_times, output_times)
         
     except Exception as e:
         print(f"   ⚠️ Failed to remove silence: {e}")
-        return audio_path
+        return audio_path, identity_time_map()
+
 
+# Loudness targets (EBU R128 / YouTube reference: -14 LUFS integrated)
+VOICE_TARGET_LUFS = -14.0
+MUSIC_TARGET_LUFS = -36.0  # 22 LU under the voice (was a random -22..-26dB gain)
+AMBIENCE_TARGET_LUFS = -42.0
+PEAK_CEILING_DBFS = -1.0
 
-def normalize_audio_mix(voice_path: str, music_path: Optional[str] = None, output_path: str = None) -> str:
+
+def _biquad_response(b: Tuple[float, float, float], a: Tuple[float, float, float], omega: np.ndarray) -> np.ndarray:
+    """
+    Complex frequency response of a biquad at normalized angular frequencies.
+    
+    Args:
+        b: Numerator coefficients (b0, b1, b2)
+        a: Denominator coefficients (1, a1, a2)
+        omega: Angular frequencies in radians/sample
+        
+    Returns:
+        Complex response H(e^jw)
+    """
+    z1 = np.exp(-1j * omega)
+    z2 = z1 * z1
+    return (b[0] + b[1] * z1 + b[2] * z2) / (a[0] + a[1] * z1 + a[2] * z2)
+
+
+def k_weighting_response(frame_rate: int, omega: np.ndarray) -> np.ndarray:
+    """
+    ITU-R BS.1770 K-weighting (shelf + RLB high-pass) response at any sample rate.
+    
+    Coefficients are derived for frame_rate with the libebur128 formulas, which
+    reproduce the published 48kHz table exactly.
+    
+    Args:
+        frame_rate: Sample rate in Hz
+        omega: Angular frequencies in radians/sample
+        
+    Returns:
+        Complex response of the two cascaded stages
+    """
+    # Stage 1: high shelf (+4dB above ~1.5kHz, head diffraction)
+    f0, gain_db, q = 1681.974450955533, 3.999843853973347, 0.7071752369554196
+    k = np.tan(np.pi * f0 / frame_rate)
+    vh = 10 ** (gain_db / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf_b = ((vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0)
+    shelf_a = (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+    
+    # Stage 2: RLB high-pass (~38Hz)
+    f0, q = 38.13547087602444, 0.5003270373238773
+    k = np.tan(np.pi * f0 / frame_rate)
+    a0 = 1 + k / q + k * k
+    highpass_b = (1.0, -2.0, 1.0)
+    highpass_a = (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+    
+    return _biquad_response(shelf_b, shelf_a, omega) * _biquad_response(highpass_b, highpass_a, omega)
+
+
+def integrated_loudness(samples: np.ndarray, frame_rate: int) -> float:
+    """
+    Measure EBU R128 integrated loudness (LUFS) of a sample array.
+    
+    K-weighting is applied in the frequency domain (one rFFT per channel), then
+    400ms blocks with 75% overlap are gated at -70 LUFS absolute and -10 LU relative.
+    Block energies come from a cumulative sum, so the whole measurement is vectorized.
+    
+    Args:
+        samples: Sample array shaped (num_samples, channels), integer or float
+        frame_rate: Sample rate in Hz
+        
+    Returns:
+        Integrated loudness in LUFS (-inf for silence or audio shorter than one block)
+    """
+    if np.issubdtype(samples.dtype, np.integer):
+        scale = float(np.iinfo(samples.dtype).max) + 1
+        x = samples.astype(np.float64) / scale
+    else:
+        x = samples.astype(np.float64)
+    
+    block = int(round(0.4 * frame_rate))
+    hop = int(round(0.1 * frame_rate))
+    if len(x) < block:
+        return float('-inf')
+    
+    # K-weight via FFT; zero padding keeps the decaying IIR tail from wrapping
+    n_fft = 1 << int(np.ceil(np.log2(len(x) + frame_rate // 2)))
+    omega = np.linspace(0, np.pi, n_fft // 2 + 1)
+    spectrum = np.fft.rfft(x, n=n_fft, axis=0) * k_weighting_response(frame_rate, omega)[:, None]
+    weighted = np.fft.irfft(spectrum, n=n_fft, axis=0)[:len(x)]
+    
+    # Mean square per block per channel (channel weights are 1.0 for mono/stereo), summed over channels
+    energy = np.concatenate(([0.0], np.cumsum(np.sum(weighted * weighted, axis=1))))
+    starts = np.arange(0, len(x) - block + 1, hop)
+    block_power = (energy[starts + block] - energy[starts]) / block
+    
+    with np.errstate(divide='ignore'):
+        block_loudness = -0.691 + 10 * np.log10(block_power)
+    
+    gated = block_power[block_loudness > -70.0]
+    if len(gated) == 0:
+        return float('-inf')
+    
+    relative_gate = -0.691 + 10 * np.log10(np.mean(gated)) - 10.0
+    gated = block_power[(block_loudness > -70.0) & (block_loudness > relative_gate)]
+    if len(gated) == 0:
+        return float('-inf')
+    
+    return float(-0.691 + 10 * np.log10(np.mean(gated)))
+
+
+def gain_stage(layers: List[Tuple[np.ndarray, float]], frame_rate: int,
+               peak_ceiling_dbfs: float = PEAK_CEILING_DBFS) -> Tuple[np.ndarray, List[float]]:
+    """
+    Bring each layer to its target loudness and sum them in one multiply-accumulate.
+    
+    Layers must share channel count; shorter layers are zero-padded to the first
+    (voice) layer's length and longer ones are trimmed. If the sum would clip, the
+    whole mix is pulled down to the peak ceiling rather than hard-clipped.
+    
+    Args:
+        layers: List of (samples, target_lufs); the first layer sets the length
+        frame_rate: Sample rate in Hz
+        peak_ceiling_dbfs: Maximum sample peak of the mix
+        
+    Returns:
+        Tuple of (float32 mix shaped (num_samples, channels) with full scale = 1.0,
+        measured LUFS per layer)
+    """
+    length = len(layers[0][0])
+    channels = layers[0][0].shape[1]
+    
+    stack = np.zeros((len(layers), length, channels), dtype=np.float32)
+    gains = np.zeros(len(layers), dtype=np.float32)
+    measured = []
+    for i, (samples, target_lufs) in enumerate(layers):
+        if np.issubdtype(samples.dtype, np.integer):
+            layer = samples.astype(np.float32) / (float(np.iinfo(samples.dtype).max) + 1)
+        else:
+            layer = samples.astype(np.float32)
+        layer = layer[:length]
+        stack[i, :len(layer)] = layer
+        
+        loudness = integrated_loudness(layer, frame_rate)
+        measured.append(loudness)
+        gains[i] = 0.0 if not np.isfinite(loudness) else 10 ** ((target_lufs - loudness) / 20)
+    
+    # One multiply-accumulate across all layers
+    mix = np.tensordot(gains, stack, axes=1)
+    
+    peak = float(np.max(np.abs(mix))) if mix.size else 0.0
+    ceiling = 10 ** (peak_ceiling_dbfs / 20)
+    if peak > ceiling:
+        mix *= ceiling / peak
+    return mix, measured
+
+
+def normalize_audio_mix(voice_path: str, music_path: Optional[str] = None, output_path: str = None,
+                        voice_lufs: float = VOICE_TARGET_LUFS, music_lufs: float = MUSIC_TARGET_LUFS) -> str:
     """
     Normalize audio mix (Broadcast Standard).
     
-    Calculates RMS (Loudness) of voice and adjusts background music to be exactly -18dB (broadcast standard).
+    Measures integrated loudness (EBU R128) of voice and music, then gain-stages
+    both to their LUFS targets in a single pass (voice -14 LUFS, music 22 LU under).
     
     Args:
         voice_path: Path to voiceover audio file
         music_path: Path to background music file (optional)
         output_path: Path to save mixed audio (if None, overwrites voice_path)
+        voice_lufs: Target loudness for the voice
+        music_lufs: Target loudness for the music bed
         
     Returns:
         Path to normalized/mixed audio file
@@ -98,9 +460,8 @@ def normalize_audio_mix(voice_path: str, music_path: Optional[str] = None, outpu
         # Load voiceover
         voice_audio = AudioSegment.from_mp3(voice_path)
         voice_duration = len(voice_audio)
-        
-        # Calculate RMS (Root Mean Square) - loudness measure
-        voice_rms = voice_audio.rms
+        layers = [voice_audio]
+        targets = [voice_lufs]
         
         if music_path and os.path.exists(music_path):
             # Load background music
@@ -112,35 +473,13 @@ def normalize_audio_mix(voice_path: str, music_path: Optional[str] = None, outpu
                 num_loops = (voice_duration // music_duration) + 1
                 music_audio = music_audio * num_loops
             
-            music_audio = music_audio[:voice_duration]
-            
-            # Calculate music RMS
-            music_rms = music_audio.rms
-            
-            # Calculate target music volume (-18dB quieter than voice - broadcast standard)
-            # RMS ratio to dB: dB = 20 * log10(rms1 / rms2)
-            # We want music to be -18dB quieter: music_rms_target = voice_rms / 10^(18/20)
-            target_ratio = 10 ** (18 / 20)  # ~7.94
-            target_music_rms = voice_rms / target_ratio
-            
-            # Calculate adjustment needed
-            if music_rms > 0:
-                adjustment_ratio = target_music_rms / music_rms
-                adjustment_db = 20 * (adjustment_ratio).bit_length() if adjustment_ratio > 0 else -18
-                # More direct approach: just reduce by 18dB (broadcast standard)
-                music_audio = music_audio - 18
-            else:
-                music_audio = music_audio - 18  # Default: reduce by 18dB (broadcast standard)
-            
-            print(f"   ✓ Music adjusted: -18dB (broadcast standard) (voice RMS: {voice_rms:.0f}, music RMS: {music_audio.rms:.0f})")
-            
-            # Mix voice and music
-            mixed_audio = music_audio.overlay(voice_audio)
+            layers.append(music_audio[:voice_duration])
+            targets.append(music_lufs)
         else:
-            # No music, just return voice
-            mixed_audio = voice_audio
             print("   ✓ No background music, using voice only")
         
+        mixed_audio = stage_segments(layers, targets)
+        
         # Export mixed audio
         mixed_audio.export(output_path, format="mp3", bitrate="192k")
         
@@ -153,6 +492,36 @@ def normalize_audio_mix(voice_path: str, music_path: Optional[str] = None, outpu
         return voice_path
 
 
+def stage_segments(segments: List[AudioSegment], targets: List[float]) -> AudioSegment:
+    """
+    Gain-stage AudioSegments to LUFS targets and mix them (see gain_stage).
+    
+    Formats are synced to the first segment's frame rate and width and the
+    widest channel count, like pydub's overlay().
+    
+    Args:
+        segments: Layers to mix; the first one sets the length
+        targets: Target LUFS per layer
+        
+    Returns:
+        Mixed AudioSegment
+    """
+    base = segments[0]
+    channels = max(segment.channels for segment in segments)
+    synced = [
+        segment.set_frame_rate(base.frame_rate).set_sample_width(base.sample_width).set_channels(channels)
+        for segment in segments
+    ]
+    
+    layers = [(audio_to_array(segment), target) for segment, target in zip(synced, targets)]
+    mix, measured = gain_stage(layers, base.frame_rate)
+    for loudness, target in zip(measured, targets):
+        print(f"   ✓ Loudness: {loudness:.1f} LUFS → {target:.1f} LUFS")
+    
+    scale = float(np.iinfo(_SAMPLE_DTYPES[base.sample_width]).max)
+    return array_to_audio(mix * scale, synced[0])
+
+
 def apply_speedup(audio_path: str, speed_factor: float = 1.0, output_path: str = None) -> str:
     """
     Apply speedup to audio (DISABLED for Dark Psychology - normal speed required).
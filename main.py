@@ -46,11 +46,33 @@ from departments.intelligence.research_engine import get_viral_topics
 from departments.intelligence.script_engine import generate_script
 from departments.production.audio_engine import generate_audio
 from departments.production.visual_engine import get_visual_content
-from departments.production.image_engine import generate_image_hook
+from departments.production.image_engine import prefetch_image_hook, wait_for_image_hook
 from departments.production.render_engine import assemble_video
 from departments.logistics.upload_engine import upload_video
 
 
+def _collect_image_hook(image_hook_future, image_hook_path: str, temp_files: list):
+    """
+    Pick up the background image hook right before assembly (never blocks long).
+    
+    Args:
+        image_hook_future: Future from prefetch_image_hook()
+        image_hook_path: Path the hook was requested at
+        temp_files: Temp file list (the generic fallback copy is added for cleanup)
+        
+    Returns:
+        Path to the hook image, or None to continue without one
+    """
+    hook_path = wait_for_image_hook(image_hook_future, image_hook_path)
+    if hook_path:
+        if hook_path not in temp_files:
+            temp_files.append(hook_path)
+        print(f"✓ Image hook ready: {hook_path}")
+    else:
+        print("   ⚠️ No image hook available, continuing without image hook...")
+    return hook_path
+
+
 def generate_monetization_comment(title: str, script_text: str, tags: list) -> str:
     """
     Generate an engagement-driven pinned comment based on video topic.
@@ -118,6 +140,7 @@ def run_horror_factory(video_number: int = 1, total_videos: int = 1, schedule_ti
     print("👻 HORROR STORY FACTORY - Starting Production")
     print("=" * 60)
     
+    pooled_story = None
     try:
         # Step 1: Generate Horror Story
         print("\n[📖 HORROR STORY] Generating real horror story...")
@@ -152,11 +175,24 @@ def run_horror_factory(video_number: int = 1, total_videos: int = 1, schedule_ti
                     "keywords": ["Stadium", "Athlete", "Mystery", "Unexplained"]
                 }
                 
-        story_data = generate_horror_story(
-            force=getattr(args, 'force', False),
-            trend_guidance=trend_guidance,
-            niche_override=niche_override
-        )
+        # Vetted story from the pool when no special story is requested, else generate one now
+        story_data = None
+        use_story_pool = not (getattr(args, 'force', False) or trend_guidance or niche_override)
+        if use_story_pool:
+            from departments.intelligence.story_pool_engine import pop_story
+            story_data = pooled_story = pop_story()
+            if story_data:
+                print("✓ Story taken from the story pool")
+        if not story_data:
+            story_data = generate_horror_story(
+                force=getattr(args, 'force', False),
+                trend_guidance=trend_guidance,
+                niche_override=niche_override
+            )
+        if use_story_pool:
+            # Story in hand: top the pool up for the next video while this one renders
+            from departments.intelligence.story_pool_engine import ensure_story_pool
+            ensure_story_pool()
         title = story_data.get('title', 'Horror Story')
         # Support both 'story' and 'script' fields
         story_text = story_data.get('story') or story_data.get('script', '')
@@ -173,11 +209,9 @@ def run_horror_factory(video_number: int = 1, total_videos: int = 1, schedule_ti
         audio_output = os.path.join(TEMP_DIR, f"temp_horror_audio_{video_number}.mp3")
         audio_path, subtitles = generate_audio(story_text, audio_output, script_text=story_text)
         
-        # Get actual audio duration
-        from moviepy import AudioFileClip
-        audio_clip = AudioFileClip(audio_path)
-        audio_duration = audio_clip.duration
-        audio_clip.close()
+        # Get actual audio duration (header probe, no decode)
+        from departments.production.probe_engine import get_media_duration
+        audio_duration = get_media_duration(audio_path)
         
         print(f"✓ Narration generated: {audio_path}")
         print(f"   Duration: {audio_duration:.2f}s")
@@ -250,6 +284,10 @@ def run_horror_factory(video_number: int = 1, total_videos: int = 1, schedule_ti
         
         print(f"✓ Downloaded {len(image_paths)} images for visual variety")
         
+        # Fingerprint the photos now (temp dir may be gone by the time the video is logged)
+        from departments.logistics.image_hash_engine import hash_images
+        image_hashes = hash_images(image_paths)
+        
         # Step 5: Render Horror Video (Image + Audio + Background Music, NO subtitles)
         print("\n[🎬 RENDERING] Creating horror video with images...")
         from departments.production.simple_render_engine import render_horror_video
@@ -324,7 +362,8 @@ def run_horror_factory(video_number: int = 1, total_videos: int = 1, schedule_ti
                         topic=story_text[:200],
                         title=title,
                         video_id=video_id,
-                        filename=output_path
+                        filename=output_path,
+                        image_hashes=image_hashes
                     )
                 
             except Exception as e:
@@ -356,6 +395,10 @@ Have you heard similar stories? Tell me in the comments! 👻
         print(f"❌ ERROR: Horror factory failed: {e}")
         import traceback
         traceback.print_exc()
+        # The pooled story was not produced, keep it for the next run
+        if pooled_story:
+            from departments.intelligence.story_pool_engine import return_story
+            return_story(pooled_story)
         return 1
 
 
@@ -434,20 +477,13 @@ def run_factory(video_number: int = 1, total_videos: int = 1):
             print(f"❌ ERROR: Failed to generate script: {e}")
             return 1
         
-        # Step 1.5: Generate Image Hook
-        print("\n[🏭 PRODUCTION DEPT] Generating AI image hook...")
-        image_hook_path = None
-        try:
-            # Extract topic from title or script
-            topic = title if title else script_text[:50]
-            image_hook_path = f"temp_hook_{video_number}.jpg"
-            generate_image_hook(topic, image_hook_path)
-            temp_files.append(image_hook_path)
-            print(f"✓ Image hook generated: {image_hook_path}")
-        except Exception as e:
-            print(f"⚠️ WARNING: Failed to generate image hook: {e}")
-            print("   Continuing without image hook...")
-            image_hook_path = None
+        # Step 1.5: Generate Image Hook (in the background - collected right before assembly)
+        print("\n[🏭 PRODUCTION DEPT] Generating AI image hook (background)...")
+        # Extract topic from title or script
+        topic = title if title else script_text[:50]
+        image_hook_path = f"temp_hook_{video_number}.jpg"
+        image_hook_future = prefetch_image_hook(topic)
+        temp_files.append(image_hook_path)
         
         # Step 2: Check if scene-based or old format
         if 'scenes' in script_data:
@@ -483,23 +519,15 @@ def run_factory(video_number: int = 1, total_videos: int = 1):
             # Step 3: The Artist - Generate Flux Image for each scene
             print("\n[🎨 THE ARTIST] Generating Flux images for each scene...")
             try:
-                from departments.production.flux_engine import generate_scene_image
+                from departments.production.flux_engine import generate_scene_images
                 
                 temp_image_dir = f"temp_images_{video_number}"
                 os.makedirs(temp_image_dir, exist_ok=True)
                 temp_dirs.append(temp_image_dir)
                 
-                scene_image_paths = []
-                for i, scene in enumerate(scenes):
-                    scene_id = scene.get('id', i + 1)
-                    visual_prompt = scene.get('visual_prompt', 'Cinematic dark noir, moody lighting, hyper-realistic, 8k')
-                    
-                    print(f"   Generating Scene {scene_id}...")
-                    image_path = os.path.join(temp_image_dir, f"scene_{scene_id}.jpg")
-                    
-                    scene_image = generate_scene_image(visual_prompt, image_path)
-                    scene_image_paths.append(scene_image)
-                    temp_files.append(scene_image)
+                # Scenes are generated concurrently (rate-limited); cached prompts are instant
+                scene_image_paths = generate_scene_images(scenes, temp_image_dir)
+                temp_files.extend(scene_image_paths)
                 
                 print(f"✓ Artist: Generated {len(scene_image_paths)} Flux images")
             except Exception as e:
@@ -543,6 +571,7 @@ def run_factory(video_number: int = 1, total_videos: int = 1):
                 else:
                     output_path = "final_short.mp4"
                 
+                image_hook_path = _collect_image_hook(image_hook_future, image_hook_path, temp_files)
                 assemble_scene_video(
                     scene_video_paths, 
                     scene_audio_paths, 
@@ -632,6 +661,7 @@ def run_factory(video_number: int = 1, total_videos: int = 1):
                     output_path = f"final_short_{video_number}.mp4"
                 else:
                     output_path = "final_short.mp4"
+                image_hook_path = _collect_image_hook(image_hook_future, image_hook_path, temp_files)
                 assemble_video(video_path, audio_path, subtitles, output_path, image_hook_path)
                 print(f"✓ Final video assembled: {output_path}")
                 
@@ -1088,6 +1118,10 @@ if __name__ == "__main__":
                 print("=" * 60)
                 time.sleep(sleep_seconds)
         
+        # The story pool refill runs on a daemon thread: let it finish before exiting
+        from departments.intelligence.story_pool_engine import wait_for_story_pool_refill
+        wait_for_story_pool_refill()
+        
         # Final summary
         print("\n" + "=" * 60)
         print("📊 HORROR BATCH COMPLETE")
@@ -82,6 +82,10 @@ def schedule_saturday_batch():
         else:
             print(f"   ❌ Batch {i+1} failed.")
 
+    # Let the background story pool refill finish before the script exits
+    from departments.intelligence.story_pool_engine import wait_for_story_pool_refill
+    wait_for_story_pool_refill()
+
     print(f"\n✅ Batch Schedule Complete: {success_count}/5 scheduled.")
 
 if __name__ == "__main__":